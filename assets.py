@@ -0,0 +1,142 @@
+import os
+import pygame
+from collections import OrderedDict
+from atlas import TextureAtlas
+
+class AssetCache:
+    """
+    Keeps loaded images so each one is only read from disk once.
+
+    Images are stored by (path, size, alpha) and colored shapes by their
+    size and color. Every sprite that asks for the same thing gets the same
+    surface back, so sprites must never draw on a surface from the cache.
+
+    Once the game window exists, every picture is baked into the texture
+    atlas (see atlas.py), so the surfaces handed out are windows onto a few
+    big pages in the screen's pixel format. Baked pictures stay for the
+    whole game (until clear()): the atlas can't give their room back, since
+    sprites may still be showing them, so forgetting them would only mean
+    loading them again. Only surfaces made before the window exists (and
+    failed loads) are limited to max_size - when there are too many, the
+    one used least recently is thrown away.
+    """
+
+    def __init__(self, max_size=256):
+        """
+        Create an empty asset cache
+
+        - max_size: How many surfaces outside the atlas to keep before old ones are dropped
+        """
+        self.max_size = max_size
+        self.surfaces = OrderedDict()  # Surfaces outside the atlas, least recently used first
+        self.baked = {}                # Surfaces in the atlas (kept until clear())
+        self.atlas = TextureAtlas()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key, create):
+        """Get a surface from the cache, or create and store it"""
+        surface = self.baked.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+        else:
+            self.misses += 1
+            surface = create()
+            if _has_screen() and not isinstance(surface, Exception):
+                self.baked[key] = surface  # In the atlas, which keeps it anyway
+                return surface
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_size:
+                self.surfaces.popitem(last=False)
+
+        # Failed loads are cached too, so a missing file isn't checked every spawn
+        if isinstance(surface, Exception):
+            raise surface
+        return surface
+
+    def get_image(self, path, size, alpha=True):
+        """
+        Get an image file scaled to size (width, height).
+        Raises an error if the file can't be loaded.
+        """
+        key = ("image", path, tuple(size), alpha)
+        return self._get(key, lambda: self._load_image(key, path, size, alpha))
+
+    def get_rect(self, size, color):
+        """Get a rectangle of size (width, height) filled with one color"""
+        key = ("rect", tuple(size), tuple(color))
+        return self._get(key, lambda: self._make_rect(size, color))
+
+    def get_circle(self, size, color, border_color=None, border_width=2):
+        """Get a see-through square with a filled circle (and optional border)"""
+        key = ("circle", size, tuple(color), border_color and tuple(border_color), border_width)
+        return self._get(key, lambda: self._make_circle(key, size, color, border_color, border_width))
+
+    def get_stats(self):
+        """Get cache hit/miss counters"""
+        return {
+            "size": len(self.surfaces),
+            "max_size": self.max_size,
+            "baked": len(self.baked),
+            "hits": self.hits,
+            "misses": self.misses,
+            "atlas": self.atlas.get_stats(),
+        }
+
+    def clear(self):
+        """Forget every cached surface and reset the counters"""
+        self.surfaces.clear()
+        self.baked.clear()
+        self.atlas.clear()
+        self.hits = 0
+        self.misses = 0
+
+    # Hidden helpers that actually build the surfaces
+    def _load_image(self, key, path, size, alpha):
+        """Load and scale an image, or return the error that stopped it"""
+        try:
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"File not found: {path}")
+            surface = pygame.image.load(path)
+            surface = pygame.transform.scale(surface, size)
+            return self._bake(key, surface, alpha)
+        except Exception as e:
+            return e
+
+    def _make_rect(self, size, color):
+        """Make a solid colored rectangle"""
+        if _has_screen():
+            return self.atlas.get_solid(tuple(size), tuple(color))
+        surface = pygame.Surface(size)
+        surface.fill(color)
+        return surface
+
+    def _make_circle(self, key, size, color, border_color, border_width):
+        """Make a circle on a see-through background"""
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        center = (size // 2, size // 2)
+        pygame.draw.circle(surface, color, center, size // 2)
+        if border_color:
+            pygame.draw.circle(surface, border_color, center, size // 2, border_width)
+        return self._bake(key, surface, alpha=True)
+
+    def _bake(self, key, surface, alpha):
+        """Copy a picture into the atlas (when there is a screen to match)"""
+        if not _has_screen():
+            return surface
+        return self.atlas.add(key, surface, alpha)
+
+
+def _has_screen():
+    """Check if the game window exists (pictures can only match its format then)"""
+    return pygame.display.get_surface() is not None
+
+
+# The one cache the whole game shares
+asset_cache = AssetCache()
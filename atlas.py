@@ -0,0 +1,133 @@
+import pygame
+from settings import *
+
+
+class AtlasPage:
+    """
+    One big surface that many small pictures are packed into.
+
+    Pictures are placed left to right in rows ("shelves"). A new shelf is
+    started below the last one when a picture doesn't fit in the current one.
+    """
+
+    def __init__(self, size, alpha):
+        """
+        Create an empty page in the screen's pixel format
+
+        - size: (width, height) of the page
+        - alpha: True for see-through pictures, False for solid ones
+        """
+        self.alpha = alpha
+        if alpha:
+            self.surface = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+            self.surface.fill((0, 0, 0, 0))
+        else:
+            self.surface = pygame.Surface(size).convert()
+        self.width, self.height = size
+        self.shelves = []  # [y, height, next free x] for every shelf
+        self.used_area = 0
+
+    def allocate(self, width, height):
+        """Find room for a width x height picture (returns a Rect, or None if full)"""
+        padding = ATLAS_PADDING
+        for shelf in self.shelves:
+            y, shelf_height, x = shelf
+            if height <= shelf_height and x + width <= self.width:
+                shelf[2] = x + width + padding
+                self.used_area += width * height
+                return pygame.Rect(x, y, width, height)
+
+        # Start a new shelf below the others
+        y = self.shelves[-1][0] + self.shelves[-1][1] + padding if self.shelves else 0
+        if y + height > self.height or width > self.width:
+            return None
+        self.shelves.append([y, height, width + padding])
+        self.used_area += width * height
+        return pygame.Rect(0, y, width, height)
+
+
+class TextureAtlas:
+    """
+    Bakes sprite pictures into a few big pages in the screen's pixel format.
+
+    Every picture the game draws is copied into a page once, and sprites
+    get a subsurface - a window onto their part of the page. Blitting from
+    a page never needs a pixel format conversion, and every sprite of the
+    same color or image shares the same page memory.
+
+    Solid colored rectangles don't each get their own picture: every color
+    gets one swatch as big as the biggest rectangle of that color, and a
+    rectangle is just the top-left corner of its color's swatch.
+    """
+
+    def __init__(self, page_size=ATLAS_PAGE_SIZE):
+        """
+        Create an empty atlas (pages are made when they are first needed)
+
+        - page_size: (width, height) of each page
+        """
+        self.page_size = page_size
+        self.pages = {False: [], True: []}  # Solid pages and see-through pages
+        self.regions = {}   # key -> (page, Rect) for every packed picture
+        self.swatches = {}  # color -> (page, Rect) for solid colors
+
+    def _allocate(self, width, height, alpha):
+        """Find room on a page (making a new page if every page is full)"""
+        pages = self.pages[alpha]
+        for page in pages:
+            rect = page.allocate(width, height)
+            if rect is not None:
+                return page, rect
+
+        # Pictures bigger than a page get a page of their own
+        size = (max(width, self.page_size[0]), max(height, self.page_size[1]))
+        page = AtlasPage(size, alpha)
+        pages.append(page)
+        return page, page.allocate(width, height)
+
+    def add(self, key, surface, alpha=True):
+        """Copy a picture into the atlas once and get its subsurface"""
+        region = self.regions.get(key)
+        if region is None:
+            page, rect = self._allocate(surface.get_width(), surface.get_height(), alpha)
+            if alpha:
+                # MAX blending copies the pixels exactly onto the empty page
+                page.surface.blit(surface, rect, special_flags=pygame.BLEND_RGBA_MAX)
+            else:
+                page.surface.blit(surface, rect)
+            region = self.regions[key] = (page, rect)
+        page, rect = region
+        return page.surface.subsurface(rect)
+
+    def get_solid(self, size, color):
+        """Get a subsurface showing a solid colored rectangle of size (width, height)"""
+        width, height = size
+        swatch = self.swatches.get(color)
+        if swatch is None or width > swatch[1].width or height > swatch[1].height:
+            # Make a new swatch big enough for this rectangle and every earlier one
+            if swatch is not None:
+                width = max(width, swatch[1].width)
+                height = max(height, swatch[1].height)
+            page, rect = self._allocate(width, height, alpha=False)
+            page.surface.fill(color, rect)
+            swatch = self.swatches[color] = (page, rect)
+        page, rect = swatch
+        return page.surface.subsurface((rect.x, rect.y, size[0], size[1]))
+
+    def get_stats(self):
+        """Get how many pages there are and how full they are"""
+        pages = self.pages[False] + self.pages[True]
+        total_area = sum(page.width * page.height for page in pages)
+        used_area = sum(page.used_area for page in pages)
+        return {
+            "pages": len(pages),
+            "regions": len(self.regions),
+            "swatches": len(self.swatches),
+            "fill": round(used_area / total_area, 3) if total_area else 0.0,
+        }
+
+    def clear(self):
+        """Throw every page away"""
+        self.pages = {False: [], True: []}
+        self.regions.clear()
+        self.swatches.clear()
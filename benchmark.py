@@ -0,0 +1,389 @@
+"""
+Frame-time benchmarks for the game.
+
+Runs the headless game through scripted scenarios and times every
+update_playing() and draw_playing() call, plus a few microbenchmarks for
+the hottest functions. Results are written as JSON (times in milliseconds)
+and compared against a stored baseline so slowdowns show up early.
+
+Usage:
+    python benchmark.py                      # run everything, compare to baseline
+    python benchmark.py --save-baseline      # store these results as the baseline
+    python benchmark.py --quick              # fewer frames (for a fast check)
+    python benchmark.py --replay run.pgr     # also time a recorded session
+    python benchmark.py --env-steps 100000   # time the bot environment for longer
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from contextlib import redirect_stdout
+
+import random
+import pygame
+import game_log
+from tester import Game
+from env import GameEnv
+from replay import Replay, ReplayPlayer
+from settings import *
+
+BASELINE_FILE = "benchmark_baseline.json"
+RESULTS_FILE = "benchmark_results.json"
+
+# Far enough in the future that benchmark power-ups never run out
+FOREVER = 10 ** 6
+
+# Bots are trained on millions of steps, so one core should manage at least this many
+ENV_TARGET_STEPS_PER_SECOND = 10000
+
+
+def percentile(sorted_times, fraction):
+    """Get a percentile (fraction between 0 and 1) from a sorted list"""
+    if not sorted_times:
+        return 0.0
+    index = min(len(sorted_times) - 1, int(round(fraction * (len(sorted_times) - 1))))
+    return sorted_times[index]
+
+
+def summarize(times):
+    """Turn a list of times in seconds into p50/p95/p99 stats in milliseconds"""
+    ordered = sorted(t * 1000.0 for t in times)
+    return {
+        "samples": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 4) if ordered else 0.0,
+        "p50": round(percentile(ordered, 0.50), 4),
+        "p95": round(percentile(ordered, 0.95), 4),
+        "p99": round(percentile(ordered, 0.99), 4),
+    }
+
+
+class HeldKeys:
+    """Pretend keyboard state: only the given keys are held down"""
+
+    def __init__(self, keys=()):
+        self.keys = set(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+def make_game(seed=0, keys=()):
+    """Create a headless game whose player can't die during a benchmark"""
+    game = Game(headless=True, seed=seed)
+    held = HeldKeys(keys)
+    game.get_keys_pressed = lambda: held
+    game.player.apply_powerup("fly", FOREVER)
+    game.player.apply_powerup("invincible", FOREVER)
+    return game
+
+
+def fill_enemies(game, count):
+    """Top the enemy group up to count enemies spread across the screen"""
+    manager = game.enemy_manager
+    while manager.get_enemy_count() < count:
+        enemy = manager.spawn_enemy()
+        enemy.set_position(game.rng.randint(0, SCREEN_WIDTH + 50), enemy.rect.y)
+
+
+# Scenario setup functions - each one gets a fresh game and returns a
+# function that runs (untimed) before every frame
+def scenario_empty(game):
+    game.enemy_manager.spawn_rate = FOREVER
+    game.powerup_manager.spawn_rate = FOREVER
+    return lambda: game.enemy_manager.clear_all_enemies()
+
+
+def scenario_enemies(count):
+    def setup(game):
+        game.enemy_manager.spawn_rate = FOREVER
+        return lambda: fill_enemies(game, count)
+    return setup
+
+
+def scenario_bullet_stream(game):
+    game.player.apply_powerup("double_shot", FOREVER)
+    game.player.apply_powerup("long_range", FOREVER)
+    return lambda: fill_enemies(game, 20)
+
+
+def scenario_hard_level5(game):
+    manager = game.platform_manager
+    manager.set_difficulty("hard")
+    # Pretend the game has been running long enough to reach level 5+
+    increases = 8
+    manager.set_time_elapsed(manager.get_time_elapsed() + increases * manager.difficulty_increase_time)
+    assert manager.get_difficulty_level() >= 5, "hard_level5 scenario did not reach level 5"
+    return lambda: None
+
+
+SCENARIOS = [
+    ("empty", scenario_empty, ()),
+    ("enemies_50", scenario_enemies(50), ()),
+    ("enemies_500", scenario_enemies(500), ()),
+    ("bullet_stream", scenario_bullet_stream, (pygame.K_k, pygame.K_d)),
+    ("hard_level5", scenario_hard_level5, (pygame.K_d,)),
+]
+
+
+def run_scenario(setup, keys, frames, warmup):
+    """Time update() and draw_playing() for one scenario"""
+    game = make_game(keys=keys)
+    before_frame = setup(game)
+    update_times = []
+    draw_times = []
+    timer = time.perf_counter
+
+    for frame in range(warmup + frames):
+        before_frame()
+
+        start = timer()
+        game.update()
+        middle = timer()
+        game.draw_playing()
+        end = timer()
+
+        if frame >= warmup:
+            update_times.append(middle - start)
+            draw_times.append(end - middle)
+
+    frame_times = [u + d for u, d in zip(update_times, draw_times)]
+    return {
+        "update": summarize(update_times),
+        "draw": summarize(draw_times),
+        "frame": summarize(frame_times),
+    }
+
+
+def run_replay(path):
+    """Time every step and draw of a recorded session (see replay.py)"""
+    player = ReplayPlayer(Replay(path))
+    update_times = []
+    draw_times = []
+    timer = time.perf_counter
+
+    while not player.is_finished():
+        start = timer()
+        player.step()
+        middle = timer()
+        player.game.draw_playing()
+        end = timer()
+
+        update_times.append(middle - start)
+        draw_times.append(end - middle)
+
+    player.game.close()
+    frame_times = [u + d for u, d in zip(update_times, draw_times)]
+    return {
+        "update": summarize(update_times),
+        "draw": summarize(draw_times),
+        "frame": summarize(frame_times),
+    }
+
+
+def run_env(steps, seed=0):
+    """
+    Time GameEnv.step() with random actions (see env.py).
+    Games that end are reset; resets are timed separately.
+    """
+    env = GameEnv()
+    rng = random.Random(seed)
+    step_times = []
+    reset_times = []
+    timer = time.perf_counter
+
+    start = timer()
+    env.reset(rng.randrange(2 ** 32))
+    reset_times.append(timer() - start)
+    for _ in range(steps):
+        action = rng.randrange(env.action_count)
+        start = timer()
+        done = env.step(action)[2]
+        step_times.append(timer() - start)
+        if done:
+            start = timer()
+            env.reset(rng.randrange(2 ** 32))
+            reset_times.append(timer() - start)
+    env.close()
+
+    total = sum(step_times)
+    return {
+        "steps_per_second": round(steps / total) if total else 0,
+        "steps_per_second_with_resets": round(steps / (total + sum(reset_times))) if total else 0,
+        "step": summarize(step_times),
+        "reset": summarize(reset_times),
+    }
+
+
+def time_calls(function, prepare, iterations):
+    """Time function() calls, running prepare() untimed before each one"""
+    times = []
+    timer = time.perf_counter
+    for _ in range(iterations):
+        prepare()
+        start = timer()
+        function()
+        times.append(timer() - start)
+    return summarize(times)
+
+
+def micro_generate_platforms(iterations):
+    """PlatformManager._generate_new_platforms refilling the right side"""
+    game = make_game()
+    manager = game.platform_manager
+
+    def prepare():
+        # Drop everything right of the screen so new platforms are needed
+        manager.remove_platforms_after(SCREEN_WIDTH)
+
+    return time_calls(manager._generate_new_platforms, prepare, iterations)
+
+
+def micro_bullet_enemy_collisions(iterations):
+    """Game.check_bullet_enemy_collisions with 50 bullets and 50 enemies"""
+    game = make_game()
+    game.enemy_manager.spawn_rate = FOREVER
+
+    def prepare():
+        # Bullets along the top, enemies lower down: every pair is checked
+        fill_enemies(game, 50)
+        for enemy in game.enemy_manager.enemies:
+            enemy.set_position(enemy.x, 400)
+        while len(game.player.bullets) < 50:
+            x = len(game.player.bullets) * 15
+            game.player.bullets.add(game.player.bullet_pool.acquire(x=x, y=50))
+        game.update_spatial_hash()
+
+    return time_calls(game.check_bullet_enemy_collisions, prepare, iterations)
+
+
+def micro_player_update(iterations):
+    """Player.update while running, jumping and shooting"""
+    game = make_game()
+    player = game.player
+    keys = HeldKeys((pygame.K_d, pygame.K_k, pygame.K_w))
+    return time_calls(lambda: player.update(keys, 1.6), lambda: None, iterations)
+
+
+MICROBENCHMARKS = [
+    ("platform_generate_new_platforms", micro_generate_platforms),
+    ("check_bullet_enemy_collisions", micro_bullet_enemy_collisions),
+    ("player_update", micro_player_update),
+]
+
+
+def run_all(frames=600, warmup=60, iterations=2000, replays=(), env_steps=20000):
+    """Run every scenario, recorded session, microbenchmark and the bot environment"""
+    results = {"scenarios": {}, "micro": {}}
+    for name, setup, keys in SCENARIOS:
+        results["scenarios"][name] = run_scenario(setup, keys, frames, warmup)
+    for path in replays:
+        results["scenarios"][f"replay:{os.path.basename(path)}"] = run_replay(path)
+    for name, benchmark in MICROBENCHMARKS:
+        results["micro"][name] = benchmark(iterations)
+    results["env"] = run_env(env_steps)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare p95 times against the baseline.
+    Returns a list of (name, baseline_ms, current_ms) for every regression.
+    """
+    regressions = []
+
+    def check(name, current, previous):
+        if previous is None:
+            return
+        limit = previous["p95"] * (1.0 + tolerance)
+        if current["p95"] > limit:
+            regressions.append((name, previous["p95"], current["p95"]))
+
+    for name, phases in results["scenarios"].items():
+        old_phases = baseline.get("scenarios", {}).get(name, {})
+        for phase, stats in phases.items():
+            check(f"{name}.{phase}", stats, old_phases.get(phase))
+    for name, stats in results["micro"].items():
+        check(name, stats, baseline.get("micro", {}).get(name))
+    if "env" in results:
+        check("env.step", results["env"]["step"], baseline.get("env", {}).get("step"))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame-time benchmarks")
+    parser.add_argument("--frames", type=int, default=600,
+                        help="timed frames per scenario (default: 600)")
+    parser.add_argument("--iterations", type=int, default=2000,
+                        help="calls per microbenchmark (default: 2000)")
+    parser.add_argument("--quick", action="store_true",
+                        help="run 120 frames / 300 calls per benchmark")
+    parser.add_argument("--output", default=RESULTS_FILE,
+                        help=f"where to write results (default: {RESULTS_FILE})")
+    parser.add_argument("--baseline", default=BASELINE_FILE,
+                        help=f"baseline to compare against (default: {BASELINE_FILE})")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p95 slowdown before failing (default: 0.25)")
+    parser.add_argument("--replay", action="append", default=[], metavar="FILE",
+                        help="also time a recorded session (can be given more than once)")
+    parser.add_argument("--env-steps", type=int, default=20000,
+                        help="bot environment steps to time (default: 20000)")
+    args = parser.parse_args()
+
+    frames, iterations, env_steps = args.frames, args.iterations, args.env_steps
+    if args.quick:
+        frames, iterations, env_steps = 120, 300, 5000
+
+    # Game messages go to stderr so they don't mix with the report
+    with redirect_stdout(sys.stderr):
+        results = run_all(frames=frames, iterations=iterations, replays=args.replay,
+                          env_steps=env_steps)
+        pygame.quit()
+        game_log.flush()
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    for name, phases in results["scenarios"].items():
+        frame = phases["frame"]
+        print(f"{name:32} p50 {frame['p50']:8.3f} ms  p95 {frame['p95']:8.3f} ms  p99 {frame['p99']:8.3f} ms")
+    for name, stats in results["micro"].items():
+        print(f"{name:32} p50 {stats['p50']:8.4f} ms  p95 {stats['p95']:8.4f} ms  p99 {stats['p99']:8.4f} ms")
+    env = results["env"]
+    step = env["step"]
+    print(f"{'env_step':32} p50 {step['p50']:8.4f} ms  p95 {step['p95']:8.4f} ms  p99 {step['p99']:8.4f} ms")
+    print(f"{'env_rate':32} {env['steps_per_second']} steps/s "
+          f"({env['steps_per_second_with_resets']} with resets), "
+          f"target {ENV_TARGET_STEPS_PER_SECOND}")
+    env_too_slow = env["steps_per_second"] < ENV_TARGET_STEPS_PER_SECOND
+    if env_too_slow:
+        print(f"Bot environment is below {ENV_TARGET_STEPS_PER_SECOND} steps/s!")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 1 if env_too_slow else 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline found at {args.baseline} (run with --save-baseline to create one)")
+        return 1 if env_too_slow else 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for name, old, new in regressions:
+            print(f"  {name}: p95 {old:.3f} ms -> {new:.3f} ms")
+        return 1
+    print("\nNo regressions against baseline.")
+    return 1 if env_too_slow else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import pygame
+from assets import asset_cache
 from settings import *
 
 class Bullet(pygame.sprite.Sprite):
@@ -21,22 +22,31 @@ class Bullet(pygame.sprite.Sprite):
         - color: Color of the bullet
         """
         super(Bullet, self).__init__()
-        
+        self.reset(x, y, speed, bullet_range, width, height, color)
+    
+    def reset(self, x, y, speed=DEFAULT_BULLET_SPEED, 
+              bullet_range=DEFAULT_BULLET_RANGE, 
+              width=8, height=4, color=YELLOW):
+        """Set the bullet up again so it can be reused (see SpritePool)"""
         # Store student-friendly settings
         self.speed = speed
         self.bullet_range = bullet_range
         self.start_x = x
         
-        # Create bullet appearance
-        self.surf = pygame.Surface((width, height))
-        self.surf.fill(color)
+        # Create bullet appearance (every bullet shares one cached surface)
+        self.surf = asset_cache.get_rect((width, height), color)
         self.rect = self.surf.get_rect()
         self.rect.x = x
         self.rect.y = y
+        
+        # Exact position (rect only holds whole pixels) and where it was last update
+        self.x = x
+        self.prev_x = x
     
-    def move(self):
-        """Move the bullet to the right"""
-        self.rect.x += self.speed
+    def move(self, step=1):
+        """Move the bullet to the right (step = how many frames' worth)"""
+        self.x += self.speed * step
+        self.rect.x = round(self.x)
     
     def is_off_screen(self):
         """Check if bullet has moved off screen or reached max range"""
@@ -51,10 +61,17 @@ class Bullet(pygame.sprite.Sprite):
         """Change bullet speed"""
         self.speed = speed
     
-    def update(self):
+    def update(self, step=1):
         """Update the bullet (move it)"""
-        self.move()
+        self.prev_x = self.x
+        self.move(step)
     
-    def draw(self, screen):
-        """Draw the bullet on screen"""
-        screen.blit(self.surf, self.rect)
\ No newline at end of file
+    def draw(self, screen, alpha=1.0):
+        """
+        Draw the bullet on screen (returns the area that was drawn)
+        alpha: how far between the last update and this one to draw it (0 to 1)
+        """
+        if alpha >= 1.0:
+            return screen.blit(self.surf, self.rect)
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        return screen.blit(self.surf, (round(x), self.rect.y))
\ No newline at end of file
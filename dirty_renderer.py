@@ -0,0 +1,62 @@
+import pygame
+from settings import *
+
+class DirtyRectRenderer:
+    """
+    Only repaints the parts of the screen that changed.
+
+    Every draw call tells the renderer which rectangle it covered. Next
+    frame, only those rectangles are wiped back to the background color,
+    and only the old and new rectangles are sent to the display with
+    pygame.display.update(rects) instead of flipping the whole screen.
+
+    Everything that isn't background was drawn last frame, so wiping last
+    frame's rectangles leaves the same picture as filling the whole screen.
+    """
+
+    def __init__(self, screen, background=BLACK):
+        """
+        Create a dirty rectangle renderer
+
+        - screen: The display surface to draw on
+        - background: Color of empty parts of the screen
+        """
+        self.screen = screen
+        self.background = background
+        self.previous_rects = []
+        self.current_rects = []
+        self.full_redraw = True  # The first frame always paints everything
+
+    def invalidate(self):
+        """Repaint the whole screen next frame (after a state change)"""
+        self.full_redraw = True
+
+    def begin(self):
+        """Wipe everything that was drawn last frame"""
+        if self.full_redraw:
+            self.screen.fill(self.background)
+        else:
+            fill = self.screen.fill
+            background = self.background
+            for rect in self.previous_rects:
+                fill(background, rect)
+        self.current_rects = []
+
+    def add(self, rects):
+        """Remember rectangles that were drawn this frame"""
+        for rect in rects:
+            if rect:  # Skip None and empty (off screen) rectangles
+                self.current_rects.append(rect)
+
+    def present(self):
+        """Send the changed parts of the screen to the display"""
+        if self.full_redraw:
+            pygame.display.flip()
+            self.full_redraw = False
+        else:
+            pygame.display.update(self.previous_rects + self.current_rects)
+        self.previous_rects = self.current_rects
+
+    def get_dirty_area(self):
+        """Get how many pixels were repainted this frame (for tuning)"""
+        return sum(rect.width * rect.height for rect in self.current_rects)
@@ -1,8 +1,11 @@
-import pygame
-import os
+from assets import asset_cache
+from entity_store import StoredSprite
+from game_log import get_logger
 from settings import *
 
-class Enemy(pygame.sprite.Sprite):
+log = get_logger("assets")
+
+class Enemy(StoredSprite):
     """
     A simple enemy class for the game!
     Students can customize enemy speed, size, color, and appearance.
@@ -21,7 +24,11 @@ class Enemy(pygame.sprite.Sprite):
         - image_path: Path to enemy image file (optional)
         """
         super(Enemy, self).__init__()
-        
+        self.reset(x, y, speed, width, height, color, image_path)
+    
+    def reset(self, x, y, speed=DEFAULT_ENEMY_SPEED, 
+              width=40, height=40, color=RED, image_path=None):
+        """Set the enemy up again so it can be reused (see SpritePool)"""
         # Store student-friendly settings
         self.speed = speed
         self.original_speed = speed
@@ -32,31 +39,28 @@ class Enemy(pygame.sprite.Sprite):
         # Set position after creating the surface
         self.rect.x = x
         self.rect.y = y
+        
+        # Exact position (rect only holds whole pixels) and where it was last update
+        self.x = x
+        self.prev_x = x
     
     def _create_appearance(self, width, height, color, image_path):
-        """Create the enemy's visual appearance"""
+        """Create the enemy's visual appearance (shared through the asset cache)"""
         if image_path:
             try:
-                if not os.path.isfile(image_path):
-                    raise FileNotFoundError(f"File not found: {image_path}")
-                self.surf = pygame.image.load(image_path).convert_alpha()
-                # Scale image to desired size
-                self.surf = pygame.transform.scale(self.surf, (width, height))
-                self.rect = self.surf.get_rect()
+                self.surf = asset_cache.get_image(image_path, (width, height))
             except Exception as e:
-                print(f"[Warning] Could not load enemy image: {e}")
-                print("Using colored rectangle instead.")
-                self.surf = pygame.Surface((width, height))
-                self.surf.fill(color)
-                self.rect = self.surf.get_rect()
+                log.warning("Could not load enemy image: %s", e)
+                log.info("Using colored rectangle instead.")
+                self.surf = asset_cache.get_rect((width, height), color)
         else:
-            self.surf = pygame.Surface((width, height))
-            self.surf.fill(color)
-            self.rect = self.surf.get_rect()
+            self.surf = asset_cache.get_rect((width, height), color)
+        self.rect = self.surf.get_rect()
     
-    def move_left(self):
-        """Move the enemy to the left"""
-        self.rect.x -= self.speed
+    def move_left(self, step=1):
+        """Move the enemy to the left (step = how many frames' worth)"""
+        self.x -= self.speed * step
+        self.rect.x = round(self.x)
     
     def set_speed(self, speed):
         """Change the enemy's movement speed"""
@@ -70,14 +74,27 @@ class Enemy(pygame.sprite.Sprite):
         """Get enemy position (x, y)"""
         return (self.rect.x, self.rect.y)
     
+    def set_position(self, x, y):
+        """Move the enemy straight to (x, y)"""
+        self.x = self.prev_x = x
+        self.rect.x = round(x)
+        self.rect.y = y
+    
     def get_size(self):
         """Get enemy size (width, height)"""
         return (self.rect.width, self.rect.height)
     
-    def update(self):
+    def update(self, step=1):
         """Update the enemy (move it left)"""
-        self.move_left()
+        self.prev_x = self.x
+        self.move_left(step)
     
-    def draw(self, screen):
-        """Draw the enemy on screen"""
-        screen.blit(self.surf, self.rect)
\ No newline at end of file
+    def draw(self, screen, alpha=1.0):
+        """
+        Draw the enemy on screen (returns the area that was drawn)
+        alpha: how far between the last update and this one to draw it (0 to 1)
+        """
+        if alpha >= 1.0:
+            return screen.blit(self.surf, self.rect)
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        return screen.blit(self.surf, (round(x), self.rect.y))
\ No newline at end of file
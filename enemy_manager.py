@@ -1,6 +1,10 @@
-import pygame
+import math
 import random
 from enemy import Enemy
+from game_clock import RealClock
+from pool import SpritePool
+from entity_store import EntityGroup
+from timer_wheel import TimerWheel, first_due_time
 from settings import *
 
 class EnemyManager:
@@ -13,7 +17,7 @@ class EnemyManager:
                  enemy_speed=DEFAULT_ENEMY_SPEED, 
                  spawn_rate=DEFAULT_ENEMY_SPAWN_RATE,
                  spawn_increase_time=ENEMY_SPAWN_INCREASE_TIME,
-                 enemy_image_path=None):
+                 enemy_image_path=None, clock=None, rng=None, scheduler=None):
         """
         Create an enemy manager!
         
@@ -22,20 +26,36 @@ class EnemyManager:
         - spawn_rate: Seconds between enemy spawns
         - spawn_increase_time: Seconds before spawn rate increases
         - enemy_image_path: Path to enemy image file
+        - clock: Where the manager gets the time from (optional)
+        - rng: Random number generator to use (optional, for repeatable games)
+        - scheduler: TimerWheel the game runs every step (optional - the manager runs its own)
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
+        
+        # Time source and random numbers (can be swapped for simulations)
+        self.clock = clock if clock else RealClock()
+        self.rng = rng if rng else random
+        
         self.enemy_speed = enemy_speed
-        self.spawn_rate = spawn_rate  # seconds
+        self._spawn_rate = spawn_rate  # seconds (see the spawn_rate property)
         self.spawn_increase_time = spawn_increase_time
         self.enemy_image_path = enemy_image_path
         
-        # Enemy group
-        self.enemies = pygame.sprite.Group()
+        # Enemy group (positions and speeds live in arrays, so moving every
+        # enemy is one step; removed enemies are recycled through the pool)
+        self.enemies = EntityGroup(capacity=ENEMY_POOL_SIZE)
+        self.enemy_pool = SpritePool(Enemy, ENEMY_POOL_SIZE)
         
-        # Spawning control
-        self.last_spawn_time = pygame.time.get_ticks()
-        self.start_time = pygame.time.get_ticks()
+        # Spawning control: a timer goes off when the next enemy is due, and
+        # the enemy is made during the next update()
+        self.last_spawn_time = self.clock.get_ticks()
+        self.start_time = self.clock.get_ticks()
+        self.runs_scheduler = scheduler is None
+        self.scheduler = scheduler if scheduler else TimerWheel(self.start_time)
+        self.spawn_timer = None
+        self.spawn_due = False
+        self._schedule_next_spawn()
         
         # Ground level for spawning (above base platforms)
         self.ground_level = screen_height - 80  # Just above ground platforms
@@ -44,9 +64,10 @@ class EnemyManager:
         # Enemy colors (if no image provided)
         self.enemy_colors = [RED, PURPLE, ORANGE, (150, 0, 0), (180, 0, 180)]
     
-    def should_spawn_enemy(self):
-        """Check if it's time to spawn a new enemy"""
-        current_time = pygame.time.get_ticks()
+    def should_spawn_enemy(self, current_time=None):
+        """Check if it's time to spawn a new enemy (now, or at game time current_time)"""
+        if current_time is None:
+            current_time = self.clock.get_ticks()
         time_since_last_spawn = (current_time - self.last_spawn_time) / 1000.0
         
         # Calculate current spawn rate (gets faster over time)
@@ -59,11 +80,32 @@ class EnemyManager:
         
         return time_since_last_spawn >= current_spawn_rate
     
+    def _schedule_next_spawn(self):
+        """Set the spawn timer for the first moment should_spawn_enemy() is true"""
+        # Spawns get closer together over time, so the wait w after the last
+        # spawn solves w * (1 + (last + w) / (2 * increase time)) = spawn rate
+        # (and is at least 1 second). Times here are seconds since the start.
+        last = (self.last_spawn_time - self.start_time) / 1000.0
+        a = 1 / (2 * self.spawn_increase_time)
+        b = 1 + last * a
+        wait = (-b + math.sqrt(b * b + 4 * a * self.spawn_rate)) / (2 * a)
+        estimate = self.last_spawn_time + max(wait, 1.0) * 1000
+        
+        # Rounding could make the answer a millisecond off, so check it exactly
+        due_time = first_due_time(self.should_spawn_enemy, estimate)
+        if self.spawn_timer is not None:
+            self.spawn_timer.cancel()
+        self.spawn_timer = self.scheduler.schedule(due_time, self._spawn_is_due)
+    
+    def _spawn_is_due(self):
+        """Spawn timer went off"""
+        self.spawn_due = True
+    
     def spawn_enemy(self):
-        """Spawn a new enemy"""
+        """Spawn a new enemy (and return it)"""
         # Spawn position (right side of screen, random height)
         spawn_x = self.screen_width + 50
-        spawn_y = random.randint(
+        spawn_y = self.rng.randint(
             self.ground_level - self.spawn_height_range,
             self.ground_level - 40
         )
@@ -72,10 +114,10 @@ class EnemyManager:
         spawn_y = max(spawn_y, 50)
         
         # Choose random color if no image
-        color = random.choice(self.enemy_colors)
+        color = self.rng.choice(self.enemy_colors)
         
         # Create enemy
-        enemy = Enemy(
+        enemy = self.enemy_pool.acquire(
             x=spawn_x,
             y=spawn_y,
             speed=self.enemy_speed,
@@ -84,13 +126,26 @@ class EnemyManager:
         )
         
         self.enemies.add(enemy)
-        self.last_spawn_time = pygame.time.get_ticks()
+        self.last_spawn_time = self.clock.get_ticks()
+        self.spawn_due = False
+        self._schedule_next_spawn()
+        return enemy
     
     def set_enemy_speed(self, speed):
         """Change speed for all enemies"""
         self.enemy_speed = speed
-        for enemy in self.enemies:
-            enemy.set_speed(speed)
+        self.enemies.set_speed(speed)
+    
+    @property
+    def spawn_rate(self):
+        """Seconds between enemy spawns (changing it moves the spawn timer)"""
+        return self._spawn_rate
+    
+    @spawn_rate.setter
+    def spawn_rate(self, spawn_rate):
+        self._spawn_rate = spawn_rate
+        self.spawn_due = False
+        self._schedule_next_spawn()
     
     def set_spawn_rate(self, spawn_rate):
         """Change how often enemies spawn"""
@@ -107,31 +162,37 @@ class EnemyManager:
     def remove_enemy(self, enemy):
         """Remove a specific enemy (when shot or off-screen)"""
         if enemy in self.enemies:
-            self.enemies.remove(enemy)
+            self.enemy_pool.release(enemy)
+    
+    def remove_enemies(self, enemies):
+        """Remove many enemies at once (for example everything shot this frame)"""
+        self.enemy_pool.release_all(enemies)
     
     def clear_all_enemies(self):
         """Remove all enemies (for game reset)"""
-        self.enemies.empty()
+        self.enemy_pool.release_all(self.enemies)
     
     def get_enemy_count(self):
         """Get number of active enemies"""
         return len(self.enemies)
     
-    def update(self):
-        """Update all enemies and spawn new ones"""
-        # Update all enemies
-        self.enemies.update()
+    def update(self, step=1):
+        """
+        Update all enemies and spawn new ones
+        step: how many frames' worth of movement to do (1 = one normal frame)
+        """
+        # Move all enemies
+        self.enemies.move(step)
         
-        # Remove off-screen enemies
-        for enemy in self.enemies.copy():
-            if enemy.is_off_screen():
-                self.enemies.remove(enemy)
+        # Recycle off-screen enemies
+        self.enemy_pool.release_all(self.enemies.get_off_screen())
         
-        # Spawn new enemies
-        if self.should_spawn_enemy():
+        # Spawn a new enemy if the spawn timer went off
+        if self.runs_scheduler:
+            self.scheduler.run(self.clock.get_ticks())
+        if self.spawn_due:
             self.spawn_enemy()
     
-    def draw(self, screen):
-        """Draw all enemies"""
-        for enemy in self.enemies:
-            enemy.draw(screen)
\ No newline at end of file
+    def draw(self, screen, alpha=1.0, doreturn=True):
+        """Draw all enemies in one batch (returns the areas drawn if doreturn is True)"""
+        return self.enemies.draw_interpolated(screen, alpha, doreturn)
\ No newline at end of file
@@ -0,0 +1,296 @@
+import pygame
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional - plain Python lists are used instead
+    numpy = None
+
+
+class EntityStore:
+    """
+    Keeps the position, width and speed of many moving sprites in arrays.
+
+    Moving every sprite, finding the ones that left the screen and changing
+    everybody's speed are each a single array operation instead of one
+    Python method call per sprite. The sprites themselves only keep what is
+    needed to draw them (their surface and rect).
+
+    With a WorldScroll, the sprites sit still in the world instead: the
+    store remembers their world position and works out the screen position
+    from the scroll offset, so their own speed is never used.
+
+    With NumPy installed the arrays are NumPy arrays. Without it plain
+    Python lists are used, which gives the same results, just slower.
+    """
+
+    ARRAYS = ("x", "prev_x", "width", "speed", "world_x")
+
+    def __init__(self, capacity=64, scroll=None):
+        """
+        Create an empty store
+
+        - capacity: How many sprites to make room for at first (it grows when needed)
+        - scroll: WorldScroll that moves the sprites (None means each moves at its own speed)
+        """
+        self.use_numpy = numpy is not None
+        self.scroll = scroll
+        self.count = 0
+        self.sprites = []  # sprites[slot] is the sprite whose numbers are in that slot
+        self.blit_items = []  # (surface, rect) for every slot, ready for Surface.blits()
+
+        # One array per value - slot i of every array belongs to sprites[i]
+        self.capacity = capacity if self.use_numpy else 0
+        self.x = self._new_array(self.capacity)
+        self.prev_x = self._new_array(self.capacity)
+        self.width = self._new_array(self.capacity)
+        self.speed = self._new_array(self.capacity)
+        self.world_x = self._new_array(self.capacity)  # Only used with a scroll
+
+    def _new_array(self, size):
+        """Make an array of zeros"""
+        if self.use_numpy:
+            return numpy.zeros(size, dtype=numpy.float64)
+        return []
+
+    def _grow(self):
+        """Double the room in every array (NumPy only - lists grow by themselves)"""
+        self.capacity *= 2
+        for name in self.ARRAYS:
+            old = getattr(self, name)
+            new = self._new_array(self.capacity)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add(self, sprite):
+        """Start keeping a sprite's numbers in the arrays"""
+        world_x = sprite.x + self.scroll.offset if self.scroll else 0.0
+        values = (sprite.x, sprite.prev_x, sprite.rect.width, sprite.speed, world_x)
+        slot = self.count
+        if self.use_numpy:
+            if slot == self.capacity:
+                self._grow()
+            for name, value in zip(self.ARRAYS, values):
+                getattr(self, name)[slot] = value
+        else:
+            for name, value in zip(self.ARRAYS, values):
+                getattr(self, name).append(float(value))
+
+        self.sprites.append(sprite)
+        # reset() gives a sprite a new surf and rect, so pools must only reset sprites outside a group
+        self.blit_items.append((sprite.surf, sprite.rect))
+        self.count += 1
+        sprite.store = self
+        sprite.slot = slot
+
+    def remove(self, sprite):
+        """Stop keeping a sprite's numbers (the sprite keeps its last values)"""
+        slot = sprite.slot
+
+        # Hand the numbers back to the sprite
+        sprite._x = float(self.x[slot])
+        sprite._prev_x = float(self.prev_x[slot])
+        sprite._speed = self.get_speed(slot)
+        sprite.store = None
+        sprite.slot = -1
+
+        # Fill the hole with the last sprite so the arrays stay packed
+        last = self.count - 1
+        arrays = [getattr(self, name) for name in self.ARRAYS]
+        if slot != last:
+            for array in arrays:
+                array[slot] = array[last]
+            moved = self.sprites[last]
+            self.sprites[slot] = moved
+            self.blit_items[slot] = self.blit_items[last]
+            moved.slot = slot
+        self.sprites.pop()
+        self.blit_items.pop()
+        if not self.use_numpy:
+            for array in arrays:
+                array.pop()
+        self.count = last
+
+    def get_speed(self, slot):
+        """Get how fast the sprite in slot moves"""
+        if self.scroll:
+            return self.scroll.speed
+        return float(self.speed[slot])
+
+    def set_x(self, slot, x):
+        """Put the sprite in slot at screen position x"""
+        self.x[slot] = x
+        if self.scroll:
+            self.world_x[slot] = x + self.scroll.offset
+
+    def move(self, step=1):
+        """
+        Move every sprite left (step = how many frames' worth)
+        With a scroll the sprites are simply placed where the scroll puts them.
+        """
+        n = self.count
+        if n == 0:
+            return  # Nothing to move (and array calls cost time even on empty arrays)
+        scroll = self.scroll
+        if self.use_numpy:
+            if scroll:
+                self.prev_x[:n] = self.world_x[:n] - scroll.prev_offset
+                self.x[:n] = self.world_x[:n] - scroll.offset
+            else:
+                self.prev_x[:n] = self.x[:n]
+                self.x[:n] -= self.speed[:n] * step
+            pixels = numpy.rint(self.x[:n]).astype(numpy.int64).tolist()
+        else:
+            if scroll:
+                self.prev_x[:] = [world_x - scroll.prev_offset for world_x in self.world_x]
+                self.x[:] = [world_x - scroll.offset for world_x in self.world_x]
+            else:
+                self.prev_x[:] = self.x
+                self.x[:] = [x - speed * step for x, speed in zip(self.x, self.speed)]
+            pixels = [round(x) for x in self.x]
+
+        # Collisions still use rects, so copy the whole-pixel positions over
+        for sprite, x in zip(self.sprites, pixels):
+            sprite.rect.x = x
+
+    def get_off_screen(self):
+        """Get every sprite that has moved off the left side of the screen"""
+        n = self.count
+        if n == 0:
+            return []
+        if self.use_numpy:
+            right = numpy.rint(self.x[:n]) + self.width[:n]
+            return [self.sprites[slot] for slot in numpy.flatnonzero(right < 0).tolist()]
+        return [sprite for sprite, x, width in zip(self.sprites, self.x, self.width)
+                if round(x) + width < 0]
+
+    def set_speed(self, speed):
+        """Give every sprite the same speed (not used with a scroll)"""
+        if self.use_numpy:
+            self.speed[:self.count] = speed
+        else:
+            self.speed[:] = [float(speed)] * self.count
+
+    def get_draw_positions(self, alpha=1.0):
+        """Get every sprite's x position part way between its last two updates"""
+        n = self.count
+        if self.use_numpy:
+            x = self.prev_x[:n] + (self.x[:n] - self.prev_x[:n]) * alpha
+            return numpy.rint(x).astype(numpy.int64).tolist()
+        return [round(prev_x + (x - prev_x) * alpha) for x, prev_x in zip(self.x, self.prev_x)]
+
+
+class StoredSprite(pygame.sprite.Sprite):
+    """
+    A sprite whose x, prev_x and speed can live in an EntityStore.
+
+    While the sprite is in an EntityGroup these values are read from and
+    written to the group's arrays; otherwise they are ordinary attributes.
+    Either way, code can keep using sprite.x, sprite.prev_x and sprite.speed.
+    """
+
+    def __init__(self):
+        super(StoredSprite, self).__init__()
+        self.store = None
+        self.slot = -1
+
+    @property
+    def x(self):
+        """Exact x position (rect only holds whole pixels)"""
+        if self.store is not None:
+            return float(self.store.x[self.slot])
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        if self.store is not None:
+            self.store.set_x(self.slot, value)
+        else:
+            self._x = value
+
+    @property
+    def prev_x(self):
+        """Exact x position at the last update"""
+        if self.store is not None:
+            return float(self.store.prev_x[self.slot])
+        return self._prev_x
+
+    @prev_x.setter
+    def prev_x(self, value):
+        if self.store is not None:
+            self.store.prev_x[self.slot] = value
+        else:
+            self._prev_x = value
+
+    @property
+    def speed(self):
+        """How far the sprite moves left each frame (the scroll speed in a scrolling group)"""
+        if self.store is not None:
+            return self.store.get_speed(self.slot)
+        return self._speed
+
+    @speed.setter
+    def speed(self, value):
+        if self.store is not None:
+            self.store.speed[self.slot] = value
+        else:
+            self._speed = value
+
+
+class EntityGroup(pygame.sprite.Group):
+    """
+    A sprite group that keeps its sprites' movement numbers in an EntityStore.
+
+    Use it like a normal pygame group. Sprites are added to the store when
+    they join the group and taken out when they leave it (for example when
+    kill() is called). Sprites must be StoredSprites.
+    """
+
+    def __init__(self, *sprites, capacity=64, scroll=None):
+        """
+        Create a group
+
+        - capacity: How many sprites to make room for at first
+        - scroll: WorldScroll that moves the sprites (None means each moves at its own speed)
+        """
+        self.store = EntityStore(capacity, scroll)
+        super(EntityGroup, self).__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super(EntityGroup, self).add_internal(sprite)
+        self.store.add(sprite)
+
+    def remove_internal(self, sprite):
+        self.store.remove(sprite)
+        super(EntityGroup, self).remove_internal(sprite)
+
+    def copy(self):
+        """Copy the group (as a plain group, since a sprite can only be in one store)"""
+        return pygame.sprite.Group(self.sprites())
+
+    def move(self, step=1):
+        """Move every sprite left by its speed (step = how many frames' worth)"""
+        self.store.move(step)
+
+    def get_off_screen(self):
+        """Get every sprite that has moved off the left side of the screen"""
+        return self.store.get_off_screen()
+
+    def set_speed(self, speed):
+        """Give every sprite the same speed"""
+        self.store.set_speed(speed)
+
+    def draw_interpolated(self, screen, alpha=1.0, doreturn=True):
+        """
+        Draw every sprite with one Surface.blits() call
+        alpha: how far between the last update and this one to draw them (0 to 1)
+        doreturn: return the areas that were drawn (skip it if nobody needs them)
+        """
+        store = self.store
+        if alpha >= 1.0:
+            # Rects are moved in place, so the (surface, rect) list is always up to date
+            items = store.blit_items
+        else:
+            positions = store.get_draw_positions(alpha)
+            items = [(surface, (x, rect.y))
+                     for (surface, rect), x in zip(store.blit_items, positions)]
+        return screen.blits(items, doreturn) or []
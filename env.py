@@ -0,0 +1,248 @@
+"""
+The game as an environment for training and testing bots.
+
+Works like an OpenAI Gym environment:
+
+    env = GameEnv()
+    observation = env.reset(seed=1)
+    done = False
+    while not done:
+        observation, reward, done, info = env.step(action)
+    env.close()
+
+Each step runs one fixed game step (SIMULATION_STEP_MS) with nothing drawn
+and no window events read, so a step costs only the game logic.
+
+Actions are numbers from 0 to len(ACTIONS) - 1. Each one is a set of held
+keys, the same keys Player._handle_input() reads. Jumping happens when the
+jump key goes down, so to jump twice an action without JUMP has to be
+taken in between.
+
+An observation is a flat list of numbers (a NumPy float32 array if NumPy is
+installed), all roughly between -1 and 1. See GameEnv.observe() for what
+each number means.
+"""
+import random
+
+import pygame
+import game_log
+from game_clock import GameTimebase, SimulatedClock
+from replay import KEY_BITS, ReplayKeys
+from settings import *
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional - observations are plain lists instead
+    numpy = None
+
+# The keys each part of an action holds down
+ACTION_KEYS = {
+    "LEFT": pygame.K_a,
+    "RIGHT": pygame.K_d,
+    "JUMP": pygame.K_w,
+    "DOWN": pygame.K_s,  # Only does something while flying
+    "SHOOT": pygame.K_k,
+}
+
+# Every action the environment understands (its number is its place in the list)
+ACTIONS = [
+    (),
+    ("LEFT",), ("RIGHT",), ("JUMP",), ("DOWN",),
+    ("LEFT", "JUMP"), ("RIGHT", "JUMP"),
+    ("SHOOT",),
+    ("LEFT", "SHOOT"), ("RIGHT", "SHOOT"), ("JUMP", "SHOOT"), ("DOWN", "SHOOT"),
+    ("LEFT", "JUMP", "SHOOT"), ("RIGHT", "JUMP", "SHOOT"),
+]
+
+# Held-key bitmask for every action (the same masks recordings use)
+ACTION_MASKS = [sum(KEY_BITS[ACTION_KEYS[part]] for part in action) for action in ACTIONS]
+
+# Rewards: points for every pixel the world scrolls by while alive,
+# and penalties for losing a life and for the game ending
+REWARD_PER_PIXEL = 0.01
+LIFE_LOST_PENALTY = 1.0
+GAME_OVER_PENALTY = 10.0
+
+NO_EVENTS = []
+
+
+def _get_distance(pair):
+    """Sort key for (distance, enemy) pairs"""
+    return pair[0]
+
+
+class GameEnv:
+    """
+    A headless game that is played one step at a time by a bot.
+
+    reset(seed) starts a new game and step(action) plays one game step.
+    The same seed and the same actions always give the same game.
+    """
+
+    def __init__(self, max_steps=None, enemies_seen=3, platforms_seen=3, quiet=True):
+        """
+        Create an environment (call reset() before the first step)
+
+        - max_steps: End every game after this many steps (None = play until game over)
+        - enemies_seen: How many of the nearest enemies are in each observation
+        - platforms_seen: How many of the next platforms are in each observation
+        - quiet: Hide the game's messages (until close())
+        """
+        self.max_steps = max_steps
+        self.enemies_seen = enemies_seen
+        self.platforms_seen = platforms_seen
+        self.log_level = None
+        if quiet:
+            self.log_level = game_log.get_level()
+            game_log.set_level("OFF")
+        self.game = None
+        self.keys = ReplayKeys()
+        self.steps = 0
+
+        # Length of every observation (see observe())
+        self.observation_size = 9 + 3 * platforms_seen + 3 * enemies_seen + 2
+        self.action_count = len(ACTIONS)
+
+    def reset(self, seed=None):
+        """Start a new game and return the first observation"""
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        if self.game is None:
+            # Imported here because the game imports a lot of modules
+            from tester import Game
+            self.game = Game(headless=True, seed=seed, clock=SimulatedClock(), threaded_level=False)
+        else:
+            # Reuse the window and fonts - only the game objects are made again
+            self.game.seed = seed
+            self.game.rng = random.Random(seed)
+            self.game.clock = GameTimebase(SimulatedClock())
+            self.game.reset_game()
+        self.game.get_keys_pressed = lambda: self.keys
+        self.keys.mask = 0
+        self.steps = 0
+        return self.observe()
+
+    def step(self, action):
+        """
+        Play one game step holding the keys of ACTIONS[action]
+        Returns (observation, reward, done, info).
+        """
+        game = self.game
+        player = game.player
+        scroll = game.platform_manager.scroll
+        lives = player.lives
+        offset = scroll.offset
+
+        self.keys.mask = ACTION_MASKS[action]
+        game.clock.tick(FPS)
+        game.frame_count += 1
+        game.update_playing(NO_EVENTS)
+        self.steps += 1
+
+        game_over = game.game_state != "playing"
+        reward = (scroll.offset - offset) * REWARD_PER_PIXEL
+        if player.lives < lives:
+            reward -= (lives - player.lives) * LIFE_LOST_PENALTY
+        if game_over:
+            reward -= GAME_OVER_PENALTY
+
+        out_of_steps = self.max_steps is not None and self.steps >= self.max_steps
+        info = {
+            "steps": self.steps,
+            "seed": game.seed,
+            "lives": player.lives,
+            "distance": player.distance_traveled,
+            "game_over_reason": game.game_over_reason,
+            "truncated": out_of_steps and not game_over,
+        }
+        return self.observe(), reward, game_over or out_of_steps, info
+
+    def observe(self):
+        """
+        Describe the game as a list of numbers:
+        - player: x, y, up/down speed, on ground, lives, flying, invincible
+        - the world: scroll speed, game time
+        - the next platforms: left edge, right edge (both from the player) and top
+        - the nearest enemies ahead: distance and height (both from the player) and speed
+        - the nearest power-up: distance and height (both from the player)
+        Missing platforms and enemies are reported as far away.
+        """
+        # (Called every step, so it reads attributes directly instead of
+        # calling getters, and skips the empty groups)
+        game = self.game
+        player = game.player
+        rect = player.rect
+        x = rect.x
+        left = rect.left
+        width = SCREEN_WIDTH
+        height = SCREEN_HEIGHT
+        platform_manager = game.platform_manager
+
+        values = [
+            x / width, rect.y / height, player.vel_y / 20.0,
+            1.0 if player.on_ground else 0.0, player.lives / 10.0,
+            1.0 if player.is_flying else 0.0, 1.0 if player.is_invincible else 0.0,
+            platform_manager.scroll.speed / 10.0, platform_manager.get_time_elapsed() / 60.0,
+        ]
+
+        # Next platforms (the stream is in left-to-right order)
+        seen = 0
+        platforms_seen = self.platforms_seen
+        for platform in platform_manager.platform_stream:
+            platform_rect = platform.rect
+            if platform_rect.right <= left or not platform.can_collide:
+                continue
+            values += ((platform_rect.left - x) / width,
+                       (platform_rect.right - x) / width,
+                       platform_rect.top / height)
+            seen += 1
+            if seen == platforms_seen:
+                break
+        values += (1.0, 1.0, 1.0) * (platforms_seen - seen)
+
+        # Nearest enemies that haven't gone past the player yet
+        enemies_seen = self.enemies_seen
+        seen = 0
+        enemy_group = game.enemy_manager.enemies
+        if enemy_group:
+            enemies = [(enemy.rect.right - left, enemy) for enemy in enemy_group.sprites()
+                       if enemy.rect.right > left]
+            enemies.sort(key=_get_distance)
+            centery = rect.centery
+            for distance, enemy in enemies[:enemies_seen]:
+                values += (distance / width, (enemy.rect.centery - centery) / height,
+                           enemy.speed / 20.0)
+            seen = min(len(enemies), enemies_seen)
+        values += (1.0, 0.0, 0.0) * (enemies_seen - seen)
+
+        # Nearest power-up
+        nearest = None
+        powerup_group = game.powerup_manager.powerups
+        if powerup_group:
+            centerx = rect.centerx
+            for powerup in powerup_group.sprites():
+                distance = powerup.rect.centerx - centerx
+                if nearest is None or abs(distance) < abs(nearest[0]):
+                    nearest = (distance, powerup.rect.centery - rect.centery)
+        if nearest is None:
+            values += (1.0, 0.0)
+        else:
+            values += (nearest[0] / width, nearest[1] / height)
+
+        if numpy is not None:
+            return numpy.array(values, dtype=numpy.float32)
+        return values
+
+    def sample_action(self, rng=random):
+        """Pick a random action"""
+        return rng.randrange(self.action_count)
+
+    def close(self):
+        """Stop the game's background work and show messages again (call when done)"""
+        if self.game is not None:
+            self.game.close()
+            self.game = None
+        if self.log_level is not None:
+            game_log.set_level(self.log_level)
+            self.log_level = None
+
@@ -1,4 +1,7 @@
 import pygame
+from game_log import get_logger
+
+log = get_logger("input")
 
 def handle_events(platform_manager, running):
     """
@@ -40,26 +43,26 @@ def handle_game_events(platform_manager, events):
                 current_difficulty = platform_manager.difficulty
                 if current_difficulty == "normal":
                     platform_manager.set_difficulty("hard")
-                    print("Difficulty changed to: HARD")
+                    log.info("Difficulty changed to: HARD")
                 else:
                     platform_manager.set_difficulty("normal")
-                    print("Difficulty changed to: NORMAL")
+                    log.info("Difficulty changed to: NORMAL")
             
             # Change platform speed with number keys
             elif event.key == pygame.K_1:
                 platform_manager.set_platform_speed(1)
-                print("Platform speed: 1 (Very Slow)")
+                log.info("Platform speed: 1 (Very Slow)")
             elif event.key == pygame.K_2:
                 platform_manager.set_platform_speed(2)
-                print("Platform speed: 2 (Slow)")
+                log.info("Platform speed: 2 (Slow)")
             elif event.key == pygame.K_3:
                 platform_manager.set_platform_speed(3)
-                print("Platform speed: 3 (Normal)")
+                log.info("Platform speed: 3 (Normal)")
             elif event.key == pygame.K_4:
                 platform_manager.set_platform_speed(4)
-                print("Platform speed: 4 (Fast)")
+                log.info("Platform speed: 4 (Fast)")
             elif event.key == pygame.K_5:
                 platform_manager.set_platform_speed(5)
-                print("Platform speed: 5 (Very Fast)")
+                log.info("Platform speed: 5 (Very Fast)")
     
     return True
\ No newline at end of file
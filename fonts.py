@@ -0,0 +1,27 @@
+import pygame
+
+# Every font the game has made, by (file name, size)
+_fonts = {}
+
+def get_font(size, name=None):
+    """
+    Get a font of the given size.
+    Fonts are made once and shared, so asking again is free.
+
+    - size: Font size in points
+    - name: Font file to use (None means pygame's default font)
+    """
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()  # The game only starts the font module once text is needed
+        if not _fonts:
+            # Old fonts can't be used after pygame.quit(), so forget them then
+            pygame.register_quit(clear_fonts)
+        font = _fonts[key] = pygame.font.Font(name, size)
+    return font
+
+def clear_fonts():
+    """Forget all fonts"""
+    _fonts.clear()
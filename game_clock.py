@@ -0,0 +1,112 @@
+import time
+
+import pygame
+
+# When the program started (RealClock counts from here)
+PROGRAM_START = time.perf_counter()
+
+
+class RealClock:
+    """
+    The normal game clock - uses real time.
+    This is what the game uses when you play it in a window.
+    It reads the computer's own timer instead of pygame.time.get_ticks(),
+    which stays at 0 until pygame's timer has been started.
+    """
+
+    def __init__(self):
+        """Create a real-time clock"""
+        self.clock = pygame.time.Clock()
+
+    def get_ticks(self):
+        """Get milliseconds since the program started"""
+        return int((time.perf_counter() - PROGRAM_START) * 1000)
+
+    def tick(self, fps):
+        """Wait for the next frame and return milliseconds since the last one"""
+        return self.clock.tick(fps)
+
+
+class SimulatedClock:
+    """
+    A pretend clock for headless simulations.
+    Every tick moves time forward by exactly one frame and never waits,
+    so a simulation gives the same result no matter how fast the computer is.
+    """
+
+    def __init__(self, start_ticks=0):
+        """Create a simulated clock starting at start_ticks milliseconds"""
+        self.ticks = float(start_ticks)
+
+    def get_ticks(self):
+        """Get simulated milliseconds since the simulation started"""
+        return int(self.ticks)
+
+    def tick(self, fps):
+        """Advance time by one frame and return the frame length in milliseconds"""
+        frame_ms = 1000.0 / fps
+        self.ticks += frame_ms
+        return frame_ms
+
+
+class GameTimebase:
+    """
+    The time everything in the game runs on.
+
+    The game moves forward in fixed steps, and game time moves forward by
+    one step's worth at the start of every step (advance()). Every timer in
+    the game (spawning, power-ups, blinking, difficulty) reads the same
+    number for the whole step, and no one asks the computer for the time.
+
+    Game time can run slower or faster than real time (set_scale(), used by
+    slow motion) and can be paused, which freezes every timer at once.
+    """
+
+    def __init__(self, clock):
+        """
+        Create a timebase
+
+        - clock: Real or simulated clock that paces the frames (game time starts at its time)
+        """
+        self.clock = clock
+        self.ticks = float(clock.get_ticks())
+        self.scale = 1.0
+        self.paused = False
+
+    def advance(self, step_ms):
+        """Move game time forward by one step of step_ms milliseconds (not while paused)"""
+        if not self.paused:
+            self.ticks += step_ms * self.scale
+        return self.get_ticks()
+
+    def get_ticks(self):
+        """Get the game time in milliseconds"""
+        return int(self.ticks)
+
+    def set_ticks(self, ticks):
+        """Move game time to ticks milliseconds"""
+        self.ticks = float(ticks)
+
+    def tick(self, fps):
+        """Wait for the next frame (uses the wrapped clock, so it's real time)"""
+        return self.clock.tick(fps)
+
+    def set_scale(self, scale):
+        """Change how fast game time runs (0.5 = half speed)"""
+        self.scale = scale
+
+    def get_scale(self):
+        """Get how fast game time runs"""
+        return self.scale
+
+    def pause(self):
+        """Stop game time"""
+        self.paused = True
+
+    def resume(self):
+        """Start game time again"""
+        self.paused = False
+
+    def is_paused(self):
+        """Check if game time is stopped"""
+        return self.paused
@@ -0,0 +1,151 @@
+"""
+The game's messages ("Life lost!", "Power-up activated: FLY", ...).
+
+Printing in the middle of a frame makes the frame wait until the terminal
+(or wherever the output goes) has taken the text, which can cause a visible
+hitch. Game messages go through Python's logging instead: a message is put
+in a queue in memory, and a background thread writes it out.
+
+Every message belongs to a category, and every category can be turned up
+or down on its own. A message whose category is turned down is dropped
+before it is even put together, so it costs almost nothing.
+
+Students can use it like this:
+
+    from game_log import get_logger
+    log = get_logger("player")
+    log.info("Lives left: %d", lives)   # Use %d/%s instead of an f-string,
+                                        # so a hidden message is never built
+
+and change what is shown in settings.py (LOG_LEVEL, LOG_CATEGORY_LEVELS)
+or with set_level("collisions", "WARNING").
+"""
+import os
+import sys
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from settings import *
+
+# What messages are about (each one is a logger called "game.<category>")
+CATEGORIES = ("player", "powerups", "input", "collisions", "state", "replay", "assets", "profiler")
+
+# Level that hides everything (logging has no "off" level of its own)
+OFF = logging.CRITICAL + 10
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """
+    Writes messages to sys.stdout.
+    It looks sys.stdout up every time, so code that sends stdout somewhere
+    else (like the --simulate JSON output) still works.
+    """
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Puts [Warning] or [Error] in front of warnings and errors"""
+
+    def format(self, record):
+        message = super(ConsoleFormatter, self).format(record)
+        if record.levelno >= logging.ERROR:
+            return "[Error] " + message
+        if record.levelno >= logging.WARNING:
+            return "[Warning] " + message
+        return message
+
+
+# Every game logger sends its messages to one queue (and not to Python's root logger)
+game_logger = logging.getLogger("game")
+game_logger.propagate = False
+message_queue = queue.Queue()
+queue_handler = QueueHandler(message_queue)
+game_logger.addHandler(queue_handler)
+
+console_handler = ConsoleHandler()
+console_handler.setFormatter(ConsoleFormatter(LOG_FORMAT))
+
+listener = None  # The background thread's QueueListener (made by start())
+
+
+def get_logger(category):
+    """Get the logger for a category (see CATEGORIES)"""
+    return logging.getLogger("game." + category)
+
+
+def _to_level(level):
+    """Turn a level name like "INFO" or "off" into a logging level"""
+    if isinstance(level, str):
+        if level.upper() == "OFF":
+            return OFF
+        return logging.getLevelName(level.upper())
+    return level
+
+
+def set_level(category, level=None):
+    """
+    Show messages of level and above for one category, for example
+    set_level("collisions", "WARNING"). Without a level, sets every category:
+    set_level("DEBUG"). Levels: DEBUG, INFO, WARNING, ERROR, CRITICAL, OFF.
+    """
+    if level is None:
+        game_logger.setLevel(_to_level(category))
+    else:
+        get_logger(category).setLevel(_to_level(level))
+
+
+def get_level():
+    """Get the level every category starts from"""
+    return game_logger.level
+
+
+def configure(level=LOG_LEVEL, category_levels=LOG_CATEGORY_LEVELS):
+    """Set the levels for every category and for the categories in category_levels"""
+    set_level(level)
+    for category, category_level in category_levels.items():
+        set_level(category, category_level)
+
+
+def start():
+    """Start the background thread that writes messages (safe to call again)"""
+    global listener
+    if listener is None:
+        listener = QueueListener(message_queue, console_handler)
+        listener.start()
+
+
+def flush():
+    """Wait until every queued message has been written"""
+    if listener is not None:
+        message_queue.join()
+
+
+def stop():
+    """Write every queued message and stop the background thread"""
+    global listener
+    if listener is not None:
+        listener.stop()
+        listener = None
+
+
+def _restart_after_fork():
+    """A forked process (like a sweep worker) doesn't get the thread - start a new one"""
+    global listener, message_queue
+    listener = None
+    message_queue = queue.Queue()
+    queue_handler.queue = message_queue
+    start()
+
+
+configure()
+start()
+atexit.register(stop)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
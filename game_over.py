@@ -1,4 +1,5 @@
 import pygame
+from fonts import get_font
 from settings import *
 
 class GameOverScreen:
@@ -12,10 +13,13 @@ class GameOverScreen:
         self.screen_width = screen_width
         self.screen_height = screen_height
         
-        # Create fonts
-        self.title_font = pygame.font.Font(None, 72)
-        self.text_font = pygame.font.Font(None, 36)
-        self.button_font = pygame.font.Font(None, 48)
+        # Fonts and button pictures are only made when they are first needed
+        # (see load()), so they don't slow down starting the game
+        self.title_font = None
+        self.text_font = None
+        self.button_font = None
+        self.yes_images = None
+        self.no_images = None
         
         # Button dimensions
         self.button_width = 150
@@ -45,6 +49,62 @@ class GameOverScreen:
         # Track mouse hover
         self.yes_hovered = False
         self.no_hovered = False
+        
+        # Frozen picture of the final game frame with all the text on it
+        self.background = None
+        self.needs_full_redraw = True
+        self.drawn_yes_hovered = None
+        self.drawn_no_hovered = None
+    
+    def load(self):
+        """Make the fonts and button pictures (safe to call again)"""
+        if self.yes_images is not None:
+            return
+        
+        # Get fonts (shared through the font registry)
+        self.title_font = get_font(72)
+        self.text_font = get_font(36)
+        self.button_font = get_font(48)
+        
+        # Buttons look the same every time, so draw each state once
+        self.yes_images = {
+            False: self._create_button_image("YES", (0, 150, 0)),
+            True: self._create_button_image("YES", GREEN),
+        }
+        self.no_images = {
+            False: self._create_button_image("NO", (150, 0, 0)),
+            True: self._create_button_image("NO", RED),
+        }
+    
+    def _create_button_image(self, label, color):
+        """Draw a button (colored box, white border, label) on its own surface"""
+        image = pygame.Surface((self.button_width, self.button_height))
+        area = image.get_rect()
+        pygame.draw.rect(image, color, area)
+        pygame.draw.rect(image, WHITE, area, 3)
+        text = self.button_font.render(label, True, WHITE)
+        image.blit(text, text.get_rect(center=area.center))
+        return image
+    
+    def reset(self):
+        """Forget the frozen background (call this when a new game starts)"""
+        self.background = None
+        self.needs_full_redraw = True
+    
+    def is_frozen(self):
+        """Check if the final game frame has already been captured"""
+        return self.background is not None
+    
+    def freeze(self, screen, final_stats=None):
+        """
+        Capture the final game frame (already drawn on screen) once.
+        The dark overlay and all the text that never changes are drawn
+        onto the copy, so each frame only the buttons need drawing.
+        """
+        self.load()
+        self.background = screen.copy()
+        self._draw_static(self.background, final_stats)
+        self.needs_full_redraw = True
     
     def handle_events(self, events):
         """
@@ -58,6 +118,10 @@ class GameOverScreen:
         self.no_hovered = self.no_button.collidepoint(mouse_pos)
         
         for event in events:
+            # Repaint everything if the window was covered up and shown again
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.needs_full_redraw = True
+            
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left click
                     if self.yes_button.collidepoint(mouse_pos):
@@ -75,7 +139,33 @@ class GameOverScreen:
         return None
     
     def draw(self, screen, final_stats=None):
-        """Draw the game over screen"""
+        """
+        Draw the game over screen.
+        Returns the areas of the screen that changed (empty if nothing did).
+        """
+        if self.background is None:
+            self.freeze(screen, final_stats)
+        
+        changed = []
+        if self.needs_full_redraw:
+            screen.blit(self.background, (0, 0))
+            changed.append(screen.get_rect())
+            self.needs_full_redraw = False
+            self.drawn_yes_hovered = None
+            self.drawn_no_hovered = None
+        
+        # Only repaint a button when its hover state changed
+        if self.yes_hovered != self.drawn_yes_hovered:
+            changed.append(screen.blit(self.yes_images[self.yes_hovered], self.yes_button))
+            self.drawn_yes_hovered = self.yes_hovered
+        if self.no_hovered != self.drawn_no_hovered:
+            changed.append(screen.blit(self.no_images[self.no_hovered], self.no_button))
+            self.drawn_no_hovered = self.no_hovered
+        
+        return changed
+    
+    def _draw_static(self, screen, final_stats):
+        """Draw the overlay and every piece of text that never changes"""
         # Semi-transparent dark overlay
         overlay = pygame.Surface((self.screen_width, self.screen_height))
         overlay.fill(BLACK)
@@ -101,23 +191,7 @@ class GameOverScreen:
         question_rect = question_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 + 10))
         screen.blit(question_text, question_rect)
         
-        # Yes button
-        yes_color = GREEN if self.yes_hovered else (0, 150, 0)
-        pygame.draw.rect(screen, yes_color, self.yes_button)
-        pygame.draw.rect(screen, WHITE, self.yes_button, 3)
-        yes_text = self.button_font.render("YES", True, WHITE)
-        yes_text_rect = yes_text.get_rect(center=self.yes_button.center)
-        screen.blit(yes_text, yes_text_rect)
-        
-        # No button
-        no_color = RED if self.no_hovered else (150, 0, 0)
-        pygame.draw.rect(screen, no_color, self.no_button)
-        pygame.draw.rect(screen, WHITE, self.no_button, 3)
-        no_text = self.button_font.render("NO", True, WHITE)
-        no_text_rect = no_text.get_rect(center=self.no_button.center)
-        screen.blit(no_text, no_text_rect)
-        
         # Instructions
         instruction_text = self.text_font.render("Click buttons or press Y/N", True, WHITE)
         instruction_rect = instruction_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 + 140))
-        screen.blit(instruction_text, instruction_rect)
\ No newline at end of file
+        screen.blit(instruction_text, instruction_rect)
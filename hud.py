@@ -0,0 +1,174 @@
+import pygame
+from fonts import get_font
+from settings import *
+
+# Control instructions shown at the bottom of the screen
+CONTROLS = [
+    "WASD/Arrows: Move & Jump",
+    "K: Shoot",
+    "TAB: Toggle Difficulty",
+    "1-5: Change Speed",
+    "P: Pause",
+    "ESC: Quit"
+]
+
+
+class GlyphAtlas:
+    """
+    Pre-rendered characters for drawing numbers quickly.
+
+    Each character is rendered once. Numbers like "12.5" are then built by
+    copying character pictures side by side instead of asking the font to
+    render the whole string again.
+    """
+
+    def __init__(self, font, color, characters="0123456789.-+xs"):
+        """
+        Render every character once
+
+        - font: Font to render with
+        - color: Text color
+        - characters: Which characters to prepare up front
+        """
+        self.font = font
+        self.color = color
+        self.height = font.get_height()
+        self.glyphs = {}
+        for character in characters:
+            self._add_glyph(character)
+
+    def _add_glyph(self, character):
+        """Render one more character (used for anything not prepared up front)"""
+        glyph = self.font.render(character, True, self.color)
+        self.glyphs[character] = glyph
+        return glyph
+
+    def render(self, text):
+        """Build a see-through surface showing text"""
+        glyphs = [self.glyphs.get(character) or self._add_glyph(character)
+                  for character in text]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        surface = pygame.Surface((max(width, 1), self.height), pygame.SRCALPHA)
+
+        # MAX blending copies each glyph's pixels exactly onto the empty surface
+        x = 0
+        for glyph in glyphs:
+            surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += glyph.get_width()
+        return surface
+
+
+class CachedText:
+    """A piece of text that is only rendered again when its value changes"""
+
+    def __init__(self, render):
+        """
+        - render: Function that turns a value into a surface
+        """
+        self.render = render
+        self.value = None
+        self.surface = None
+
+    def get(self, value):
+        """Get the surface for value (rendering it only if it changed)"""
+        if self.surface is None or value != self.value:
+            self.value = value
+            self.surface = self.render(value)
+        return self.surface
+
+
+class HUD:
+    """
+    Draws the game information box and the control instructions.
+
+    Labels like "Time: " and the control list never change, so they are
+    rendered once. Numbers are built from a glyph atlas and only rebuilt
+    when the number on screen changes.
+    """
+
+    def __init__(self, screen_height):
+        """Prepare everything the HUD draws"""
+        self.font = get_font(24)
+        self.controls_y = screen_height - 20 * len(CONTROLS) - 20
+
+        # Semi-transparent background for the info box (tall enough for
+        # every line, including the slow motion and paused lines at the bottom)
+        self.background = pygame.Surface((320, 190))
+        self.background.fill(BLACK)
+        self.background.set_alpha(128)
+
+        # Labels that never change
+        render = self.font.render
+        self.labels = {
+            "time": render("Time: ", True, WHITE),
+            "distance": render("Distance: ", True, WHITE),
+            "speed": render("Speed: ", True, WHITE),
+            "difficulty": render("Difficulty: ", True, WHITE),
+            "lives": render("Lives: ", True, WHITE),
+            "lives_low": render("Lives: ", True, RED),
+        }
+        self.slow_motion_text = render("SLOW MOTION", True, CYAN)
+        self.paused_text = render("PAUSED (P to continue)", True, YELLOW)
+        self.control_texts = [render(control, True, WHITE) for control in CONTROLS]
+
+        # Digit atlases for numbers
+        white_digits = GlyphAtlas(self.font, WHITE)
+        red_digits = GlyphAtlas(self.font, RED)
+
+        # Values that are re-rendered only when they change
+        self.values = {
+            "time": CachedText(white_digits.render),
+            "distance": CachedText(white_digits.render),
+            "speed": CachedText(white_digits.render),
+            "difficulty": CachedText(white_digits.render),
+            "lives": CachedText(white_digits.render),
+            "lives_low": CachedText(red_digits.render),
+            "mode": CachedText(self._render_mode),
+            "powers": CachedText(self._render_powers),
+        }
+
+    def _render_mode(self, mode):
+        """Render the difficulty mode (red for hard, green otherwise)"""
+        color = (255, 100, 100) if mode == "HARD" else (100, 255, 100)
+        return self.font.render(f"Mode: {mode}", True, color)
+
+    def _render_powers(self, powers):
+        """Render the list of active power-ups"""
+        return self.font.render(f"Powers: {', '.join(powers)}", True, YELLOW)
+
+    def _draw_field(self, screen, name, text, position):
+        """Draw a label followed by its value, returning the drawn areas"""
+        label_surface = self.labels[name]
+        value_surface = self.values[name].get(text)
+        x, y = position
+        return [screen.blit(label_surface, position),
+                screen.blit(value_surface, (x + label_surface.get_width(), y))]
+
+    def draw_info(self, screen, time_elapsed, distance, speed, difficulty_level,
+                  lives, mode, active_powerups, slow_motion, paused=False):
+        """Draw the game information box (returns the areas that were drawn)"""
+        drawn = [screen.blit(self.background, (10, 10))]
+
+        drawn += self._draw_field(screen, "time", f"{time_elapsed:.1f}s", (15, 15))
+        drawn += self._draw_field(screen, "distance", f"{distance:.0f}", (15, 35))
+        drawn += self._draw_field(screen, "speed", f"{speed:.1f}x", (15, 55))
+        drawn += self._draw_field(screen, "difficulty", f"{difficulty_level:.1f}x", (15, 75))
+        lives_field = "lives_low" if lives <= 1 else "lives"
+        drawn += self._draw_field(screen, lives_field, str(lives), (15, 95))
+
+        drawn.append(screen.blit(self.values["mode"].get(mode), (15, 115)))
+
+        if active_powerups:
+            powers = self.values["powers"].get(tuple(active_powerups))
+            drawn.append(screen.blit(powers, (15, 135)))
+
+        if slow_motion:
+            drawn.append(screen.blit(self.slow_motion_text, (15, 155)))
+        if paused:
+            drawn.append(screen.blit(self.paused_text, (15, 175)))
+        return drawn
+
+    def draw_controls(self, screen):
+        """Draw the control instructions (returns the areas that were drawn)"""
+        return [screen.blit(text, (10, self.controls_y + i * 20))
+                for i, text in enumerate(self.control_texts)]
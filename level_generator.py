@@ -0,0 +1,248 @@
+import queue
+import random
+import threading
+from settings import *
+
+
+class PlatformSpec:
+    """Everything needed to place one platform (x is measured from the chunk start)"""
+    __slots__ = ("x", "y", "width", "height", "color", "platform_type")
+
+    def __init__(self, x, y, width, height, color, platform_type):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.color = color
+        self.platform_type = platform_type
+
+
+class LevelChunk:
+    """A stretch of level: a few platforms and how wide the stretch is"""
+
+    def __init__(self, index, platforms, length, generation=0):
+        """
+        - index: Which chunk of the level this is (0 is the first)
+        - platforms: List of PlatformSpecs, left to right
+        - length: Width of the chunk including every gap
+        - generation: Which restart of the generator made it (older ones are thrown away)
+        """
+        self.index = index
+        self.platforms = platforms
+        self.length = length
+        self.generation = generation
+
+
+class FailedChunk:
+    """Stands in for a chunk the worker thread couldn't make (next_chunk() raises its error)"""
+
+    def __init__(self, index, error, generation):
+        self.index = index
+        self.error = error
+        self.generation = generation
+
+
+def check_gaps(min_gap, max_gap):
+    """Raise a ValueError if no gap can be between min_gap and max_gap"""
+    if min_gap > max_gap:
+        raise ValueError(f"min_gap ({min_gap}) can't be bigger than max_gap ({max_gap})")
+
+
+class LevelGenerator:
+    """
+    Makes the level in chunks of a few platforms each.
+
+    Every chunk gets its own random numbers, made from (seed, index), so any
+    chunk can be made again at any time with generate_chunk(index) and comes
+    out exactly the same. A worker thread makes the next few chunks ahead of
+    time and keeps them in a small queue, so the game only has to pick up a
+    finished chunk when it needs more level.
+    """
+
+    def __init__(self, seed, screen_height, min_gap, max_gap, difficulty="normal",
+                 ground_height=80, chunk_platforms=LEVEL_CHUNK_PLATFORMS,
+                 prefetch_chunks=LEVEL_PREFETCH_CHUNKS, threaded=True):
+        """
+        Create a level generator!
+
+        Parameters students can change:
+        - seed: Which level to make (the same seed always makes the same level)
+        - min_gap, max_gap: Smallest and largest gap before a platform
+        - difficulty: "easy", "normal", or "hard"
+        - chunk_platforms: How many platforms are in each chunk
+        - prefetch_chunks: How many chunks the worker makes ahead of time
+        - threaded: Make chunks on a worker thread (False makes them when asked)
+        """
+        check_gaps(min_gap, max_gap)
+        self.seed = seed
+        self.min_gap = min_gap
+        self.max_gap = max_gap
+        self.difficulty = difficulty
+        self.chunk_platforms = chunk_platforms
+
+        # Ground settings
+        self.ground_height = ground_height
+        self.ground_y = screen_height - ground_height
+
+        # Platform size ranges
+        self.min_ground_length = 100
+        self.max_ground_length = 300
+        self.min_elevated_length = 80
+        self.max_elevated_length = 200
+
+        # Elevated platform heights
+        self.elevated_heights = [
+            screen_height - 200,  # Low
+            screen_height - 300,  # Medium
+            screen_height - 400,  # High
+        ]
+
+        # Colors
+        self.ground_colors = [(139, 69, 19), (101, 67, 33), (160, 82, 45)]
+        self.elevated_colors = [(70, 130, 180), (100, 149, 237), (135, 206, 250)]
+
+        # Which chunk the game gets next, and which restart we are on
+        self.next_index = 0
+        self.generation = 0
+
+        # Worker thread state (the lock guards generation, worker_index, difficulty and the gaps)
+        self.lock = threading.Lock()
+        self.ready = queue.Queue(maxsize=prefetch_chunks)
+        self.worker_index = 0
+        self.running = threaded
+        self.worker = None
+        if threaded:
+            self.worker = threading.Thread(target=self._work, name="LevelGenerator", daemon=True)
+            self.worker.start()
+
+    def _get_max_consecutive(self, difficulty):
+        """Get max consecutive elevated platforms based on difficulty"""
+        if difficulty == "easy":
+            return 2
+        elif difficulty == "normal":
+            return 3
+        else:  # hard
+            return 5
+
+    def _get_elevated_chance(self, difficulty):
+        """Get the chance that the next platform is elevated"""
+        if difficulty == "easy":
+            return 0.2  # 20% chance
+        elif difficulty == "normal":
+            return 0.3  # 30% chance
+        else:  # hard
+            return 0.5  # 50% chance
+
+    def generate_chunk(self, index, difficulty=None):
+        """Make chunk number index (always the same for the same seed, index and difficulty)"""
+        if difficulty is None:
+            difficulty = self.difficulty
+        rng = random.Random(f"{self.seed}-{index}")
+        max_consecutive = self._get_max_consecutive(difficulty)
+        elevated_chance = self._get_elevated_chance(difficulty)
+
+        platforms = []
+        consecutive_elevated = 0
+        x = 0
+        for _ in range(self.chunk_platforms):
+            # Gap before the platform
+            x += rng.randint(self.min_gap, self.max_gap)
+
+            should_be_elevated = rng.random() < elevated_chance
+            if should_be_elevated and consecutive_elevated < max_consecutive:
+                # Elevated platform
+                spec = PlatformSpec(
+                    x=x,
+                    width=rng.randint(self.min_elevated_length, self.max_elevated_length),
+                    height=30,
+                    y=rng.choice(self.elevated_heights),
+                    color=rng.choice(self.elevated_colors),
+                    platform_type="elevated"
+                )
+                consecutive_elevated += 1
+            else:
+                # Ground platform
+                spec = PlatformSpec(
+                    x=x,
+                    width=rng.randint(self.min_ground_length, self.max_ground_length),
+                    height=self.ground_height,
+                    y=self.ground_y,
+                    color=rng.choice(self.ground_colors),
+                    platform_type="ground"
+                )
+                consecutive_elevated = 0
+
+            platforms.append(spec)
+            x += spec.width
+
+        return LevelChunk(index, platforms, x)
+
+    def _work(self):
+        """Worker thread: keep the queue topped up with the next chunks"""
+        while self.running:
+            with self.lock:
+                generation = self.generation
+                index = self.worker_index
+                difficulty = self.difficulty
+
+            # (If the gaps change while this runs, the chunk is thrown away)
+            try:
+                chunk = self.generate_chunk(index, difficulty)
+                chunk.generation = generation
+            except Exception as error:
+                # Hand the error to the game (next_chunk() raises it) instead of dying quietly
+                chunk = FailedChunk(index, error, generation)
+
+            # Wait for room in the queue (giving up if the generator restarted or stopped)
+            while self.running:
+                try:
+                    self.ready.put(chunk, timeout=0.1)
+                    break
+                except queue.Full:
+                    if generation != self.generation:
+                        break
+
+            with self.lock:
+                # A failed chunk is tried again (it may work once the settings change)
+                if generation == self.generation and not isinstance(chunk, FailedChunk):
+                    self.worker_index = index + 1
+
+    def next_chunk(self):
+        """Get the next chunk of the level"""
+        if self.worker is None:
+            chunk = self.generate_chunk(self.next_index)
+            self.next_index += 1
+            return chunk
+
+        while True:
+            chunk = self.ready.get()
+            if chunk.generation == self.generation:
+                if isinstance(chunk, FailedChunk):
+                    raise chunk.error
+                self.next_index = chunk.index + 1
+                return chunk
+            # Made before a restart - throw it away
+
+    def _restart(self):
+        """Throw away chunks made ahead of time (call with the lock held)"""
+        self.generation += 1
+        self.worker_index = self.next_index
+    
+    def set_difficulty(self, difficulty):
+        """Change the difficulty (chunks made ahead of time are made again)"""
+        with self.lock:
+            self.difficulty = difficulty
+            self._restart()
+    
+    def set_gaps(self, min_gap, max_gap):
+        """Change the smallest and largest gap (chunks made ahead of time are made again)"""
+        check_gaps(min_gap, max_gap)
+        with self.lock:
+            self.min_gap = min_gap
+            self.max_gap = max_gap
+            self._restart()
+
+    def stop(self):
+        """Stop the worker thread (it finishes on its own a moment later)"""
+        self.running = False
+        self.worker = None
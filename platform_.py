@@ -1,6 +1,7 @@
-import pygame
+from assets import asset_cache
+from entity_store import StoredSprite
 
-class Platform(pygame.sprite.Sprite):
+class Platform(StoredSprite):
     """
     A simple platform class for the game.
     Students can easily understand what each platform does.
@@ -20,23 +21,31 @@ class Platform(pygame.sprite.Sprite):
         - can_collide: Whether the player can land on this platform
         """
         super(Platform, self).__init__()
-        
+        self.reset(x, y, width, height, color, platform_type, speed, can_collide)
+    
+    def reset(self, x, y, width, height, color=(139, 69, 19), 
+              platform_type="ground", speed=3, can_collide=True):
+        """Set the platform up again so it can be reused (see SpritePool)"""
         # Store student-friendly settings
         self.platform_type = platform_type
         self.speed = speed
         self.can_collide = can_collide
         self.original_speed = speed  # Remember original speed for difficulty scaling
         
-        # Create platform appearance
-        self.surf = pygame.Surface((width, height))
-        self.surf.fill(color)
+        # Create platform appearance (platforms of the same size and color share a surface)
+        self.surf = asset_cache.get_rect((width, height), color)
         self.rect = self.surf.get_rect()
         self.rect.x = x
         self.rect.y = y
+        
+        # Exact position (rect only holds whole pixels) and where it was last update
+        self.x = x
+        self.prev_x = x
     
-    def move_left(self):
-        """Move the platform to the left"""
-        self.rect.x -= self.speed
+    def move_left(self, step=1):
+        """Move the platform to the left (step = how many frames' worth)"""
+        self.x -= self.speed * step
+        self.rect.x = round(self.x)
     
     def set_speed(self, new_speed):
         """Change the platform's movement speed"""
@@ -62,10 +71,17 @@ class Platform(pygame.sprite.Sprite):
         """Get platform size (width, height)"""
         return (self.rect.width, self.rect.height)
     
-    def update(self):
+    def update(self, step=1):
         """Update the platform (move it left)"""
-        self.move_left()
+        self.prev_x = self.x
+        self.move_left(step)
     
-    def draw(self, screen):
-        """Draw the platform on screen"""
-        screen.blit(self.surf, self.rect)
\ No newline at end of file
+    def draw(self, screen, alpha=1.0):
+        """
+        Draw the platform on screen (returns the area that was drawn)
+        alpha: how far between the last update and this one to draw it (0 to 1)
+        """
+        if alpha >= 1.0:
+            return screen.blit(self.surf, self.rect)
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        return screen.blit(self.surf, (round(x), self.rect.y))
\ No newline at end of file
@@ -1,6 +1,12 @@
-import pygame
 import random
+from collections import deque
 from platform_ import Platform
+from game_clock import RealClock
+from pool import SpritePool
+from entity_store import EntityGroup
+from level_generator import LevelGenerator
+from world_scroll import WorldScroll
+from timer_wheel import TimerWheel, first_due_time
 from settings import *
 
 class PlatformManager:
@@ -11,7 +17,8 @@ class PlatformManager:
     
     def __init__(self, screen_width, screen_height, player, 
                  platform_speed=3, difficulty="normal", 
-                 difficulty_increase_rate=1.5, difficulty_increase_time=10):
+                 difficulty_increase_rate=1.5, difficulty_increase_time=10,
+                 clock=None, rng=None, level_seed=None, scheduler=None, threaded_level=True):
         """
         Create a platform manager!
         
@@ -20,173 +27,249 @@ class PlatformManager:
         - difficulty: "easy", "normal", or "hard"
         - difficulty_increase_rate: How much harder it gets (1.5 = 50% harder)
         - difficulty_increase_time: Seconds before difficulty increases
+        - clock: Where the manager gets the time from (optional)
+        - rng: Random number generator to use (optional, for repeatable games)
+        - level_seed: Which level to play (optional, picked with rng if not given)
+        - scheduler: TimerWheel the game runs every step (optional - the manager runs its own)
+        - threaded_level: Make the level ahead of time on a worker thread (False makes it when needed)
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.player = player
         
+        # Time source and random numbers (can be swapped for simulations)
+        self.clock = clock if clock else RealClock()
+        self.rng = rng if rng else random
+        
         # Student-friendly settings
         self.base_platform_speed = platform_speed
         self.current_platform_speed = platform_speed
         self.difficulty = difficulty
-        self.difficulty_increase_rate = difficulty_increase_rate
-        self.difficulty_increase_time = difficulty_increase_time
+        self._difficulty_increase_rate = difficulty_increase_rate  # See the properties below
+        self._difficulty_increase_time = difficulty_increase_time
+        
+        # The world scrolls left under the player. Platforms stay put in the
+        # world, so changing the speed only changes the scroll.
+        self.scroll = WorldScroll(platform_speed)
+        
+        # Platform group (positions live in arrays, so placing every platform
+        # is one step; off-screen platforms go back to the pool)
+        self.platforms = EntityGroup(capacity=PLATFORM_POOL_SIZE, scroll=self.scroll)
         
-        # Platform group
-        self.platforms = pygame.sprite.Group()
+        # The same platforms in left-to-right order. Platforms are made left to
+        # right and all move at the same speed, so the order never changes:
+        # the leftmost platform is always first and the rightmost always last.
+        self.platform_stream = deque()
+        self.platforms_by_type = {"ground": deque(), "elevated": deque()}
+        self.platform_pool = SpritePool(Platform, PLATFORM_POOL_SIZE)
         
         # Ground settings
         self.ground_height = 80
         self.ground_y = screen_height - self.ground_height
         
-        # Platform size ranges
-        self.min_ground_length = 100
-        self.max_ground_length = 300
-        self.min_elevated_length = 80
-        self.max_elevated_length = 200
-        
         # Gap settings (based on player jump ability)
         max_jump_distance = player.get_max_jump_distance()
         self.min_gap = int(max_jump_distance * 0.3)
         self.max_gap = int(max_jump_distance * 0.9)
         
-        # Elevated platform heights
-        self.elevated_heights = [
-            screen_height - 200,  # Low
-            screen_height - 300,  # Medium  
-            screen_height - 400,  # High
-        ]
-        
-        # Difficulty tracking
-        self.consecutive_elevated = 0
-        self.max_consecutive_elevated = self._get_max_consecutive()
+        # The level is made in chunks ahead of time (the same seed makes the same level)
+        self.level_seed = level_seed if level_seed is not None else self.rng.getrandbits(32)
+        self.level_generator = LevelGenerator(
+            seed=self.level_seed,
+            screen_height=screen_height,
+            min_gap=self.min_gap,
+            max_gap=self.max_gap,
+            difficulty=difficulty,
+            ground_height=self.ground_height,
+            threaded=threaded_level
+        )
         
-        # Time tracking for difficulty progression
-        self.start_time = pygame.time.get_ticks()
+        # Time tracking for difficulty progression (a timer goes off at every increase)
+        self.start_time = self.clock.get_ticks()
         self.last_difficulty_increase = self.start_time
         self.difficulty_level = 1.0
-        
-        # Colors
-        self.ground_colors = [(139, 69, 19), (101, 67, 33), (160, 82, 45)]
-        self.elevated_colors = [(70, 130, 180), (100, 149, 237), (135, 206, 250)]
+        self.difficulty_increases = 0
+        self.runs_scheduler = scheduler is None
+        self.scheduler = scheduler if scheduler else TimerWheel(self.start_time)
+        self.difficulty_timer = None
+        self._schedule_difficulty_increase()
         
         # Generate initial platforms
         self._generate_initial_platforms()
     
-    def _get_max_consecutive(self):
-        """Get max consecutive elevated platforms based on difficulty"""
-        if self.difficulty == "easy":
-            return 2
-        elif self.difficulty == "normal":
-            return 3
-        else:  # hard
-            return 5
-    
     def _generate_initial_platforms(self):
         """Generate starting platforms with baseline platform"""
         current_x = -100
         
         # Create baseline starting platform (2 screen widths)
-        baseline_platform = Platform(
+        baseline_platform = self.platform_pool.acquire(
             x=current_x,
             y=self.ground_y,
             width=BASELINE_PLATFORM_LENGTH,
             height=self.ground_height,
-            color=self.ground_colors[0],
+            color=self.level_generator.ground_colors[0],
             platform_type="ground",
             speed=self.current_platform_speed
         )
-        self.platforms.add(baseline_platform)
-        current_x += BASELINE_PLATFORM_LENGTH
+        self._add_platform(baseline_platform)
         
         # Generate additional platforms to fill screen
-        while current_x < self.screen_width + 600:
-            platform_type, width, height, y, color = self._get_next_platform_properties()
-            
-            # Add gap before platform
-            gap = random.randint(self.min_gap, self.max_gap)
-            current_x += gap
-            
-            # Create platform
-            platform = Platform(current_x, y, width, height, color, 
-                               platform_type, self.current_platform_speed)
-            self.platforms.add(platform)
-            
-            current_x += width
-    
-    def _get_next_platform_properties(self):
-        """Determine properties for next platform"""
-        should_be_elevated = self._should_generate_elevated()
-        
-        if should_be_elevated and self.consecutive_elevated < self.max_consecutive_elevated:
-            # Generate elevated platform
-            platform_type = "elevated"
-            width = random.randint(self.min_elevated_length, self.max_elevated_length)
-            height = 30
-            y = random.choice(self.elevated_heights)
-            color = random.choice(self.elevated_colors)
-            self.consecutive_elevated += 1
-        else:
-            # Generate ground platform
-            platform_type = "ground"
-            width = random.randint(self.min_ground_length, self.max_ground_length)
-            height = self.ground_height
-            y = self.ground_y
-            color = random.choice(self.ground_colors)
-            self.consecutive_elevated = 0
-        
-        return platform_type, width, height, y, color
-    
-    def _should_generate_elevated(self):
-        """Determine if next platform should be elevated"""
-        if self.difficulty == "easy":
-            return random.random() < 0.2  # 20% chance
-        elif self.difficulty == "normal":
-            return random.random() < 0.3  # 30% chance
-        else:  # hard
-            return random.random() < 0.5  # 50% chance
+        self._generate_new_platforms()
     
-    def _update_difficulty(self):
-        """Increase difficulty over time"""
-        current_time = pygame.time.get_ticks()
+    def _add_platform(self, platform):
+        """Add a platform to the right end of the level"""
+        self.platforms.add(platform)
+        self.platform_stream.append(platform)
+        self.platforms_by_type.setdefault(platform.platform_type, deque()).append(platform)
+    
+    def _recycle_off_screen_platforms(self):
+        """Recycle platforms that moved off the left side (they are always at the front)"""
+        stream = self.platform_stream
+        while stream and stream[0].rect.right < 0:
+            platform = stream.popleft()
+            self.platforms_by_type[platform.platform_type].popleft()
+            self.platform_pool.release(platform)
+    
+    def remove_platforms_after(self, x):
+        """Remove every platform whose right edge is past x (new level replaces them)"""
+        stream = self.platform_stream
+        while stream and stream[-1].rect.right > x:
+            platform = stream.pop()
+            self.platforms_by_type[platform.platform_type].pop()
+            self.platform_pool.release(platform)
+    
+    def _get_expected_increases(self, current_time):
+        """How many times difficulty should have increased by game time current_time"""
         time_since_start = (current_time - self.start_time) / 1000.0  # Convert to seconds
+        return int(time_since_start / self.difficulty_increase_time)
+    
+    def _schedule_difficulty_increase(self):
+        """Set the difficulty timer for the next increase"""
+        increases = self.difficulty_increases + 1
+        estimate = self.start_time + increases * self.difficulty_increase_time * 1000
+        due_time = first_due_time(lambda time: self._get_expected_increases(time) >= increases,
+                                  estimate)
+        if self.difficulty_timer is not None:
+            self.difficulty_timer.cancel()
+        self.difficulty_timer = self.scheduler.schedule(due_time, self._update_difficulty)
+    
+    def _update_difficulty(self):
+        """Increase difficulty (the difficulty timer calls this when it is time)"""
+        current_time = self.clock.get_ticks()
+        self.difficulty_increases = self._get_expected_increases(current_time)
+        self.last_difficulty_increase = current_time
+        self._set_difficulty_level()
+        self._schedule_difficulty_increase()
+    
+    def _set_difficulty_level(self):
+        """Work out the difficulty level and platform speed from the increases so far"""
+        self.difficulty_level = 1.0 + (self.difficulty_increases * (self.difficulty_increase_rate - 1.0))
+        self.current_platform_speed = self.base_platform_speed * self.difficulty_level
         
-        # Check if it's time to increase difficulty
-        expected_increases = int(time_since_start / self.difficulty_increase_time)
-        
-        if expected_increases > (self.difficulty_level - 1):
-            self.difficulty_level = 1.0 + (expected_increases * (self.difficulty_increase_rate - 1.0))
-            self.current_platform_speed = self.base_platform_speed * self.difficulty_level
-            
-            # Update speed for all existing platforms
-            for platform in self.platforms:
-                platform.set_speed(self.current_platform_speed)
+        # Scroll the world faster
+        self.scroll.set_speed(self.current_platform_speed)
     
     def set_difficulty(self, difficulty):
         """Change the difficulty setting"""
         self.difficulty = difficulty
-        self.max_consecutive_elevated = self._get_max_consecutive()
+        self.level_generator.set_difficulty(difficulty)
+    
+    def set_difficulty_increase(self, rate=None, increase_time=None):
+        """
+        Change how much harder the game gets and how often
+        - rate: How much harder each increase makes it (1.5 = 50% harder)
+        - increase_time: Seconds between increases (counted from the start of the game)
+        """
+        if rate is not None:
+            self.difficulty_increase_rate = rate
+        if increase_time is not None:
+            self.difficulty_increase_time = increase_time
+    
+    @property
+    def difficulty_increase_rate(self):
+        """How much harder each increase makes the game (changing it applies straight away)"""
+        return self._difficulty_increase_rate
+    
+    @difficulty_increase_rate.setter
+    def difficulty_increase_rate(self, rate):
+        self._difficulty_increase_rate = rate
+        self._set_difficulty_level()
+    
+    @property
+    def difficulty_increase_time(self):
+        """Seconds between difficulty increases (changing it moves the difficulty timer)"""
+        return self._difficulty_increase_time
+    
+    @difficulty_increase_time.setter
+    def difficulty_increase_time(self, increase_time):
+        self._difficulty_increase_time = increase_time
+        self._schedule_difficulty_increase()
+    
+    def set_gaps(self, min_gap, max_gap):
+        """Change the smallest and largest gap between platforms"""
+        self.level_generator.set_gaps(min_gap, max_gap)  # Checks the gaps first
+        self.min_gap = min_gap
+        self.max_gap = max_gap
+        
+        # Platforms that aren't on screen yet were made with the old gaps - make them again
+        stream = self.platform_stream
+        while stream and stream[-1].rect.x >= self.screen_width:
+            platform = stream.pop()
+            self.platforms_by_type[platform.platform_type].pop()
+            self.platform_pool.release(platform)
+        self._generate_new_platforms()
     
     def set_platform_speed(self, speed):
         """Change the base platform speed"""
         self.base_platform_speed = speed
         self.current_platform_speed = speed * self.difficulty_level
         
-        # Update all existing platforms
-        for platform in self.platforms:
-            platform.set_speed(self.current_platform_speed)
+        # Scroll the world at the new speed
+        self.scroll.set_speed(self.current_platform_speed)
     
     def get_platforms(self):
         """Get all platforms for collision detection"""
         return self.platforms
     
+    def get_ground_platforms(self, min_x, max_x):
+        """Get ground platforms whose left edge is between min_x and max_x (not included)"""
+        found = []
+        for platform in self.platforms_by_type["ground"]:
+            if platform.rect.x >= max_x:
+                break  # Every platform after this one is further right
+            if platform.rect.x > min_x:
+                found.append(platform)
+        return found
+    
     def get_collisionable_platforms(self):
         """Get only platforms that can collide with player"""
         return [platform for platform in self.platforms if platform.can_player_collide()]
     
+    def collide(self, rect):
+        """
+        Get collidable platforms that overlap rect.
+        The platforms are already in left-to-right order, so this stops at the
+        first one that starts past rect (no collision grid needed).
+        """
+        found = []
+        for platform in self.platform_stream:
+            if platform.rect.left >= rect.right:
+                break  # Every platform after this one is further right
+            if platform.can_player_collide() and rect.colliderect(platform.rect):
+                found.append(platform)
+        return found
+    
     def get_time_elapsed(self):
         """Get time elapsed since game start (in seconds)"""
-        return (pygame.time.get_ticks() - self.start_time) / 1000.0
+        return (self.clock.get_ticks() - self.start_time) / 1000.0
+    
+    def set_time_elapsed(self, seconds):
+        """
+        Pretend the game started seconds ago (the difficulty catches up straight away)
+        Moving start_time by hand doesn't move the difficulty timer, so use this instead.
+        """
+        self.start_time = self.clock.get_ticks() - int(seconds * 1000)
+        self._update_difficulty()
     
     def get_current_speed(self):
         """Get current platform speed"""
@@ -196,47 +279,48 @@ class PlatformManager:
         """Get current difficulty multiplier"""
         return self.difficulty_level
     
-    def update(self):
-        """Update all platforms and generate new ones"""
-        # Update difficulty progression
-        self._update_difficulty()
+    def update(self, step=1):
+        """
+        Update all platforms and generate new ones
+        step: how many frames' worth of movement to do (1 = one normal frame)
+        """
+        # Increase difficulty if the difficulty timer went off
+        if self.runs_scheduler:
+            self.scheduler.run(self.clock.get_ticks())
         
-        # Update all platforms
-        self.platforms.update()
+        # Scroll the world, then put every platform where the scroll says
+        self.scroll.advance(step)
+        self.platforms.move(step)
         
-        # Remove off-screen platforms
-        for platform in self.platforms.copy():
-            if platform.is_off_screen():
-                self.platforms.remove(platform)
+        # Recycle off-screen platforms
+        self._recycle_off_screen_platforms()
         
         # Generate new platforms
         self._generate_new_platforms()
     
     def _generate_new_platforms(self):
         """Generate new platforms on the right side"""
-        # Find rightmost platform
+        # Find rightmost platform (always the last one in the stream)
         rightmost_x = self.screen_width
-        for platform in self.platforms:
-            if platform.rect.right > rightmost_x:
-                rightmost_x = platform.rect.right
+        if self.platform_stream:
+            rightmost_x = max(rightmost_x, self.platform_stream[-1].rect.right)
         
-        # Generate platforms until screen is filled
+        # Add chunks of level until screen is filled
         while rightmost_x < self.screen_width + 600:
-            platform_type, width, height, y, color = self._get_next_platform_properties()
-            
-            # Add gap before new platform
-            gap = random.randint(self.min_gap, self.max_gap)
-            x = rightmost_x + gap
-            
-            # Create platform
-            platform = Platform(x, y, width, height, color, 
-                               platform_type, self.current_platform_speed)
-            self.platforms.add(platform)
+            chunk = self.level_generator.next_chunk()
+            for spec in chunk.platforms:
+                platform = self.platform_pool.acquire(rightmost_x + spec.x, spec.y, 
+                                   spec.width, spec.height, spec.color, 
+                                   spec.platform_type, self.current_platform_speed)
+                self._add_platform(platform)
             
             # Update rightmost position
-            rightmost_x = x + width
+            rightmost_x += chunk.length
+    
+    def stop(self):
+        """Stop making level in the background (call before throwing the manager away)"""
+        self.level_generator.stop()
     
-    def draw(self, screen):
-        """Draw all platforms"""
-        for platform in self.platforms:
-            platform.draw(screen)
\ No newline at end of file
+    def draw(self, screen, alpha=1.0, doreturn=True):
+        """Draw all platforms in one batch (returns the areas drawn if doreturn is True)"""
+        return self.platforms.draw_interpolated(screen, alpha, doreturn)
\ No newline at end of file
@@ -1,8 +1,17 @@
 import pygame
-import os
 from bullet import Bullet
+from assets import asset_cache
+from pool import SpritePool
+from game_clock import RealClock
+from powerup_effects import EffectTimers, STACK_EXTEND, STACK_INSTANT, get_effect
+from timer_wheel import TimerWheel
+from game_log import get_logger
 from settings import *
 
+log = get_logger("player")
+powerup_log = get_logger("powerups")
+asset_log = get_logger("assets")
+
 class Player(pygame.sprite.Sprite):
     """
     A simple player class for young coders!
@@ -11,7 +20,7 @@ class Player(pygame.sprite.Sprite):
     
     def __init__(self, width=30, height=30, color=(255, 0, 0), 
                  movement_speed=6, jump_strength=18, gravity_strength=0.8, 
-                 lives=DEFAULT_PLAYER_LIVES, image_path=None):
+                 lives=DEFAULT_PLAYER_LIVES, image_path=None, clock=None, scheduler=None):
         """
         Create a player character!
         
@@ -23,9 +32,18 @@ class Player(pygame.sprite.Sprite):
         - gravity_strength: How fast the player falls
         - lives: Number of lives the player starts with
         - image_path: Path to an image file (optional)
+        - clock: Where the player gets the time from (optional)
+        - scheduler: TimerWheel the game runs every step (optional - the player runs its own)
         """
         super(Player, self).__init__()
         
+        # Time source (real time unless the game gives us a simulated clock)
+        self.clock = clock if clock else RealClock()
+        
+        # Power-up timers wait here (a game shares one wheel between everything)
+        self.runs_scheduler = scheduler is None
+        self.scheduler = scheduler if scheduler else TimerWheel(self.clock.get_ticks())
+        
         # Store student-friendly settings
         self.movement_speed = movement_speed
         self.original_movement_speed = movement_speed
@@ -49,6 +67,7 @@ class Player(pygame.sprite.Sprite):
         self.original_width = width
         self.original_height = height
         self.original_color = color
+        self.image_path = image_path
         self._create_appearance(width, height, color, image_path)
         
         # Screen boundaries
@@ -58,16 +77,21 @@ class Player(pygame.sprite.Sprite):
         # Stats tracking
         self.distance_traveled = 0
         
+        # Position before the last update (for smooth drawing)
+        self.prev_x = self.rect.x
+        self.prev_y = self.rect.y
+        
         # Shooting system
         self.bullets = pygame.sprite.Group()
+        self.bullet_pool = SpritePool(Bullet, BULLET_POOL_SIZE)
         self.last_shot_time = 0
         self.shot_cooldown = 300  # milliseconds
         self.bullet_speed = DEFAULT_BULLET_SPEED
         self.bullet_range = DEFAULT_BULLET_RANGE
         
-        # Power-up effects
+        # Power-up effects (what each one does lives in powerup_effects.py)
         self.active_powerups = {}
-        self.powerup_end_times = {}
+        self.powerup_timers = EffectTimers(self.scheduler)
         self.is_invincible = False
         self.is_flying = False
         self.has_shield = False
@@ -79,24 +103,17 @@ class Player(pygame.sprite.Sprite):
         self.space_key_was_pressed = False
     
     def _create_appearance(self, width, height, color, image_path):
-        """Create the player's visual appearance"""
+        """Create the player's visual appearance (shared through the asset cache)"""
         if image_path:
             try:
-                if not os.path.isfile(image_path):
-                    raise FileNotFoundError(f"File not found: {image_path}")
-                self.surf = pygame.image.load(image_path).convert_alpha()
-                self.surf = pygame.transform.scale(self.surf, (width, height))
-                self.rect = self.surf.get_rect()
+                self.surf = asset_cache.get_image(image_path, (width, height))
             except Exception as e:
-                print(f"[Warning] Could not load image: {e}")
-                print("Using colored rectangle instead.")
-                self.surf = pygame.Surface((width, height))
-                self.surf.fill(color)
-                self.rect = self.surf.get_rect()
+                asset_log.warning("Could not load image: %s", e)
+                asset_log.info("Using colored rectangle instead.")
+                self.surf = asset_cache.get_rect((width, height), color)
         else:
-            self.surf = pygame.Surface((width, height))
-            self.surf.fill(color)
-            self.rect = self.surf.get_rect()
+            self.surf = asset_cache.get_rect((width, height), color)
+        self.rect = self.surf.get_rect()
     
     # Simple methods students can understand and use
     def jump(self):
@@ -130,7 +147,7 @@ class Player(pygame.sprite.Sprite):
     
     def shoot(self):
         """Make the player shoot a bullet"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         
         # Check shooting cooldown
         cooldown = self.shot_cooldown
@@ -138,7 +155,7 @@ class Player(pygame.sprite.Sprite):
             cooldown = self.shot_cooldown // 2
         
         if current_time - self.last_shot_time >= cooldown:
-            bullet = Bullet(
+            bullet = self.bullet_pool.acquire(
                 x=self.rect.right,
                 y=self.rect.centery - 2,
                 speed=self.bullet_speed,
@@ -151,6 +168,10 @@ class Player(pygame.sprite.Sprite):
         """Get all player bullets for collision detection"""
         return self.bullets
     
+    def remove_bullets(self, bullets):
+        """Remove bullets (for example ones that hit an enemy)"""
+        self.bullet_pool.release_all(bullets)
+    
     def is_on_ground(self):
         """Check if player is touching the ground"""
         return self.on_ground
@@ -159,6 +180,11 @@ class Player(pygame.sprite.Sprite):
         """Get player's current position (x, y)"""
         return (self.rect.x, self.rect.y)
     
+    def set_position(self, x, y):
+        """Move the player straight to (x, y)"""
+        self.rect.x = self.prev_x = x
+        self.rect.y = self.prev_y = y
+    
     def get_distance_traveled(self):
         """Get how far the player has traveled"""
         return self.distance_traveled
@@ -178,14 +204,14 @@ class Player(pygame.sprite.Sprite):
             # Shield protects from damage
             self.has_shield = False
             self._remove_powerup("shield")
-            print("Shield protected you!")
+            log.info("Shield protected you!")
             return False
         elif not self.is_invincible:
             self.lives -= 1
-            print(f"Life lost! Lives remaining: {self.lives}")
+            log.info("Life lost! Lives remaining: %d", self.lives)
             return True
         else:
-            print("Invincible - no damage!")
+            log.info("Invincible - no damage!")
             return False
     
     def is_dead(self):
@@ -197,32 +223,24 @@ class Player(pygame.sprite.Sprite):
         return self.rect.top > self.screen_height
     
     def apply_powerup(self, powerup_type, duration):
-        """Apply a power-up effect to the player"""
-        current_time = pygame.time.get_ticks()
-        end_time = current_time + (duration * 1000)
+        """Apply a power-up effect to the player (see powerup_effects.py)"""
+        effect = get_effect(powerup_type)
+        powerup_log.info("Power-up activated: %s", powerup_type.upper())
+        
+        if effect.stacking == STACK_INSTANT:
+            effect.apply(self)
+            return
+        
+        end_time = self.powerup_timers.get_end_time(powerup_type)
+        if effect.stacking == STACK_EXTEND and end_time is not None:
+            # Already active: just make it last longer
+            end_time += effect.get_duration_ms(duration, self)
+        else:
+            end_time = self.clock.get_ticks() + effect.get_duration_ms(duration, self)
+            effect.apply(self)
         
         self.active_powerups[powerup_type] = True
-        self.powerup_end_times[powerup_type] = end_time
-        
-        # Apply power-up effects
-        if powerup_type == "speed":
-            self.movement_speed = self.original_movement_speed * 2
-        elif powerup_type == "jump":
-            self.jump_strength = self.original_jump_strength * 1.5
-        elif powerup_type == "fly":
-            self.is_flying = True
-        elif powerup_type == "invincible":
-            self.is_invincible = True
-        elif powerup_type == "shrink":
-            self._shrink_player()
-        elif powerup_type == "shield":
-            self.has_shield = True
-        elif powerup_type == "extra_life":
-            self.add_life()
-        elif powerup_type == "long_range":
-            self.bullet_range = DEFAULT_BULLET_RANGE * 2
-        
-        print(f"Power-up activated: {powerup_type.upper()}")
+        self.powerup_timers.start(powerup_type, end_time)
     
     def get_active_powerups(self):
         """Get list of currently active power-ups"""
@@ -236,11 +254,12 @@ class Player(pygame.sprite.Sprite):
         self.vel_y = 0
         self.on_ground = False
         self.jump_count = 0
-        self.bullets.empty()
+        self.bullet_pool.release_all(self.bullets)
         
         # Clear all power-ups
-        self.active_powerups.clear()
-        self.powerup_end_times.clear()
+        for powerup_type in list(self.active_powerups):
+            self._remove_powerup(powerup_type)
+        self.powerup_timers.clear()
         self.is_invincible = False
         self.is_flying = False
         self.has_shield = False
@@ -268,6 +287,15 @@ class Player(pygame.sprite.Sprite):
         self.screen_width = width
         self.screen_height = height
     
+    def set_image(self, image_path):
+        """Change the player's picture (None = colored rectangle)"""
+        self.image_path = image_path
+        if not self.is_shrunk:  # A shrunk player gets the new picture when it grows back
+            old_center = self.rect.center  # Keep the player where it is
+            self._create_appearance(self.original_width, self.original_height,
+                                    self.original_color, image_path)
+            self.rect.center = old_center
+    
     def get_max_jump_distance(self):
         """Calculate maximum jump distance for platform generation"""
         time_to_peak = self.jump_strength / self.gravity_strength
@@ -292,9 +320,8 @@ class Player(pygame.sprite.Sprite):
         """Restore player to normal size"""
         if self.is_shrunk:
             old_center = self.rect.center
-            self.surf = pygame.Surface((self.original_width, self.original_height))
-            self.surf.fill(self.original_color)
-            self.rect = self.surf.get_rect()
+            self._create_appearance(self.original_width, self.original_height,
+                                    self.original_color, self.image_path)
             self.rect.center = old_center
             self.is_shrunk = False
     
@@ -302,34 +329,14 @@ class Player(pygame.sprite.Sprite):
         """Remove a power-up effect"""
         if powerup_type in self.active_powerups:
             del self.active_powerups[powerup_type]
-            del self.powerup_end_times[powerup_type]
-            
-            # Remove effects
-            if powerup_type == "speed":
-                self.movement_speed = self.original_movement_speed
-            elif powerup_type == "jump":
-                self.jump_strength = self.original_jump_strength
-            elif powerup_type == "fly":
-                self.is_flying = False
-            elif powerup_type == "invincible":
-                self.is_invincible = False
-            elif powerup_type == "shrink":
-                self._restore_normal_size()
-            elif powerup_type == "shield":
-                self.has_shield = False
-            elif powerup_type == "long_range":
-                self.bullet_range = DEFAULT_BULLET_RANGE
+            self.powerup_timers.stop(powerup_type)
+            get_effect(powerup_type).revert(self)
     
     def _update_powerups(self):
-        """Update active power-ups and remove expired ones"""
-        current_time = pygame.time.get_ticks()
-        expired_powerups = []
-        
-        for powerup_type, end_time in self.powerup_end_times.items():
-            if current_time >= end_time:
-                expired_powerups.append(powerup_type)
-        
-        for powerup_type in expired_powerups:
+        """Remove power-ups whose timer went off"""
+        if self.runs_scheduler:
+            self.scheduler.run(self.clock.get_ticks())
+        for powerup_type in self.powerup_timers.pop_expired():
             self._remove_powerup(powerup_type)
     
     def _apply_physics(self, dt):
@@ -398,34 +405,56 @@ class Player(pygame.sprite.Sprite):
             if not self.is_flying:
                 self.vel_y = 0
     
-    def update(self, keys_pressed, dt=1):
-        """Main update method called each frame"""
+    def update(self, keys_pressed, dt=1, step=1):
+        """
+        Main update method called each frame
+        - dt: time step for the player's physics (1 = 10 milliseconds)
+        - step: how many frames' worth of movement bullets do (1 = one normal frame)
+        """
+        # Remember where we were (for smooth drawing between updates)
+        self.prev_x = self.rect.x
+        self.prev_y = self.rect.y
+        
         self._handle_input(keys_pressed)
         self._apply_physics(dt)
         self._constrain_to_screen()
         self._update_powerups()
         
-        # Update bullets
-        self.bullets.update()
-        
-        # Remove off-screen bullets
-        for bullet in self.bullets.copy():
+        # Update bullets, recycling the ones that went off screen
+        for bullet in self.bullets.sprites():
+            bullet.update(step)
             if bullet.is_off_screen():
-                self.bullets.remove(bullet)
+                self.bullet_pool.release(bullet)
         
         # Reset on_ground flag (collision detection will set it)
         if not self.is_flying:
             self.on_ground = False
     
-    def draw(self, screen):
-        """Draw the player and bullets on screen"""
+    def draw(self, screen, alpha=1.0, doreturn=True):
+        """
+        Draw the player and bullets in one batch (returns the areas drawn if doreturn is True)
+        alpha: how far between the last update and this one to draw them (0 to 1)
+        """
+        items = []
+        
+        # Smooth position between the last two updates
+        position = self.rect
+        if alpha < 1.0:
+            position = (round(self.prev_x + (self.rect.x - self.prev_x) * alpha),
+                        round(self.prev_y + (self.rect.y - self.prev_y) * alpha))
+        
         # Draw player with invincibility flash effect
         if self.is_invincible:
-            if (pygame.time.get_ticks() // 100) % 2:  # Flash every 100ms
-                screen.blit(self.surf, self.rect)
+            if (self.clock.get_ticks() // 100) % 2:  # Flash every 100ms
+                items.append((self.surf, position))
         else:
-            screen.blit(self.surf, self.rect)
+            items.append((self.surf, position))
         
-        # Draw bullets
-        for bullet in self.bullets:
-            bullet.draw(screen)
\ No newline at end of file
+        # Draw bullets (they all share one surface)
+        if alpha >= 1.0:
+            items += [(bullet.surf, bullet.rect) for bullet in self.bullets]
+        else:
+            items += [(bullet.surf, (round(bullet.prev_x + (bullet.x - bullet.prev_x) * alpha),
+                                     bullet.rect.y))
+                      for bullet in self.bullets]
+        return screen.blits(items, doreturn) or []
\ No newline at end of file
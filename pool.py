@@ -0,0 +1,64 @@
+class SpritePool:
+    """
+    Recycles sprites instead of making new ones all the time.
+
+    When a sprite leaves the screen it goes back to the pool. The next time
+    one is needed, an old sprite is set up again with its reset() method
+    instead of building a brand new one. The sprite class must have a
+    reset() method that takes the same arguments as __init__().
+    """
+
+    def __init__(self, sprite_class, max_size=64):
+        """
+        Create an empty pool
+
+        - sprite_class: The kind of sprite this pool makes (Bullet, Enemy, ...)
+        - max_size: Most spare sprites to keep (extras are thrown away)
+        """
+        self.sprite_class = sprite_class
+        self.max_size = max_size
+        self.free = []
+
+        # Numbers for tuning max_size
+        self.created = 0      # Sprites built from scratch
+        self.reused = 0       # Sprites taken back out of the pool
+        self.in_use = 0       # Sprites handed out and not returned yet
+        self.high_water = 0   # Most sprites that were in use at the same time
+
+    def acquire(self, *args, **kwargs):
+        """Get a sprite set up with these arguments (reused if possible)"""
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            sprite = self.sprite_class(*args, **kwargs)
+            self.created += 1
+
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return sprite
+
+    def release(self, sprite):
+        """Give a sprite back to the pool (it is removed from all its groups)"""
+        sprite.kill()
+        self.in_use -= 1
+        if len(self.free) < self.max_size:
+            self.free.append(sprite)
+
+    def release_all(self, sprites):
+        """Give many sprites back to the pool"""
+        for sprite in list(sprites):
+            self.release(sprite)
+
+    def get_stats(self):
+        """Get pool numbers (for tuning max_size)"""
+        return {
+            "free": len(self.free),
+            "max_size": self.max_size,
+            "in_use": self.in_use,
+            "high_water": self.high_water,
+            "created": self.created,
+            "reused": self.reused,
+        }
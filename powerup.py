@@ -1,9 +1,13 @@
-import pygame
-import os
 import math
+from assets import asset_cache
+from entity_store import StoredSprite
+from game_clock import RealClock
+from game_log import get_logger
 from settings import *
 
-class PowerUp(pygame.sprite.Sprite):
+log = get_logger("assets")
+
+class PowerUp(StoredSprite):
     """
     A power-up class that gives players special abilities!
     Students can customize power-up types, colors, and effects.
@@ -11,7 +15,7 @@ class PowerUp(pygame.sprite.Sprite):
     
     def __init__(self, x, y, powerup_type="speed", 
                  duration=DEFAULT_POWERUP_DURATION, 
-                 size=30, color=None, image_path=None, speed=3):
+                 size=30, color=None, image_path=None, speed=3, clock=None):
         """
         Create a power-up!
         
@@ -24,14 +28,12 @@ class PowerUp(pygame.sprite.Sprite):
         - color: Color of the power-up (if no image)
         - image_path: Path to power-up image
         - speed: How fast power-up moves left
+        - clock: Where the power-up gets the time from (optional)
         """
         super(PowerUp, self).__init__()
         
-        # Store power-up properties
-        self.powerup_type = powerup_type
-        self.duration = duration
-        self.speed = speed
-        self.size = size
+        # Time source (real time unless the game gives us a simulated clock)
+        self.clock = clock if clock else RealClock()
         
         # Default colors for different power-up types
         self.default_colors = {
@@ -47,6 +49,22 @@ class PowerUp(pygame.sprite.Sprite):
             "long_range": (0, 255, 128)
         }
         
+        self.reset(x, y, powerup_type, duration, size, color, image_path, speed, clock)
+    
+    def reset(self, x, y, powerup_type="speed", 
+              duration=DEFAULT_POWERUP_DURATION, 
+              size=30, color=None, image_path=None, speed=3, clock=None):
+        """Set the power-up up again so it can be reused (see SpritePool)"""
+        # Time source (real time unless the game gives us a simulated clock)
+        if clock:
+            self.clock = clock
+        
+        # Store power-up properties
+        self.powerup_type = powerup_type
+        self.duration = duration
+        self.speed = speed
+        self.size = size
+        
         # Set color
         if color is None:
             color = self.default_colors.get(powerup_type, GREEN)
@@ -54,44 +72,41 @@ class PowerUp(pygame.sprite.Sprite):
         # Create appearance
         self._create_appearance(size, color, image_path)
         
-        # Position
+        # Position (x is exact, rect only holds whole pixels)
         self.rect.x = x
         self.rect.y = y
+        self.x = x
+        self.prev_x = x
         
         # Animation properties
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = self.clock.get_ticks()
         self.animation_offset = 0
         self.blink_start_time = None
         self.is_blinking = False
         self.visible = True
     
     def _create_appearance(self, size, color, image_path):
-        """Create the power-up's visual appearance"""
+        """Create the power-up's visual appearance (shared through the asset cache)"""
         if image_path:
             try:
-                if not os.path.isfile(image_path):
-                    raise FileNotFoundError(f"File not found: {image_path}")
-                self.surf = pygame.image.load(image_path).convert_alpha()
-                self.surf = pygame.transform.scale(self.surf, (size, size))
+                self.surf = asset_cache.get_image(image_path, (size, size))
                 self.rect = self.surf.get_rect()
             except Exception as e:
-                print(f"[Warning] Could not load power-up image: {e}")
-                print("Using colored circle instead.")
+                log.warning("Could not load power-up image: %s", e)
+                log.info("Using colored circle instead.")
                 self._create_default_appearance(size, color)
         else:
             self._create_default_appearance(size, color)
     
     def _create_default_appearance(self, size, color):
-        """Create default circular power-up appearance"""
-        self.surf = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(self.surf, color, (size//2, size//2), size//2)
-        # Add white border
-        pygame.draw.circle(self.surf, WHITE, (size//2, size//2), size//2, 2)
+        """Create default circular power-up appearance (with a white border)"""
+        self.surf = asset_cache.get_circle(size, color, border_color=WHITE)
         self.rect = self.surf.get_rect()
     
-    def move_left(self):
-        """Move the power-up to the left"""
-        self.rect.x -= self.speed
+    def move_left(self, step=1):
+        """Move the power-up to the left (step = how many frames' worth)"""
+        self.x -= self.speed * step
+        self.rect.x = round(self.x)
     
     def is_off_screen(self):
         """Check if power-up has moved off screen"""
@@ -99,7 +114,7 @@ class PowerUp(pygame.sprite.Sprite):
     
     def should_start_blinking(self):
         """Check if power-up should start blinking (about to disappear)"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         time_on_screen = (current_time - self.spawn_time) / 1000.0
         disappear_time = 15  # Power-ups disappear after 15 seconds if not collected
         
@@ -107,7 +122,7 @@ class PowerUp(pygame.sprite.Sprite):
     
     def should_disappear(self):
         """Check if power-up should disappear"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         time_on_screen = (current_time - self.spawn_time) / 1000.0
         return time_on_screen >= 15  # Disappear after 15 seconds
     
@@ -115,12 +130,12 @@ class PowerUp(pygame.sprite.Sprite):
         """Start the blinking animation"""
         if not self.is_blinking:
             self.is_blinking = True
-            self.blink_start_time = pygame.time.get_ticks()
+            self.blink_start_time = self.clock.get_ticks()
     
     def update_animation(self):
         """Update power-up animation (floating and blinking)"""
         # Floating animation
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         self.animation_offset = math.sin((current_time - self.spawn_time) * 0.005) * 3
         
         # Check if should start blinking
@@ -148,15 +163,29 @@ class PowerUp(pygame.sprite.Sprite):
         """Change power-up movement speed"""
         self.speed = speed
     
-    def update(self):
+    def update(self, step=1):
         """Update the power-up"""
-        self.move_left()
+        self.prev_x = self.x
+        self.move_left(step)
         self.update_animation()
     
-    def draw(self, screen):
-        """Draw the power-up on screen"""
+    def get_blit_item(self, alpha=1.0):
+        """
+        Get (surface, position) for drawing the power-up with Surface.blits()
+        alpha: how far between the last update and this one to draw it (0 to 1)
+        """
+        # Draw with floating animation offset
+        draw_rect = self.rect.copy()
+        draw_rect.y += int(self.animation_offset)
+        if alpha < 1.0:
+            draw_rect.x = round(self.prev_x + (self.x - self.prev_x) * alpha)
+        return (self.surf, draw_rect)
+    
+    def draw(self, screen, alpha=1.0):
+        """
+        Draw the power-up on screen (returns the area drawn, or None)
+        alpha: how far between the last update and this one to draw it (0 to 1)
+        """
         if self.visible:  # Only draw if not blinking (invisible phase)
-            # Draw with floating animation offset
-            draw_rect = self.rect.copy()
-            draw_rect.y += int(self.animation_offset)
-            screen.blit(self.surf, draw_rect)
\ No newline at end of file
+            return screen.blit(*self.get_blit_item(alpha))
+        return None
\ No newline at end of file
@@ -0,0 +1,219 @@
+"""
+What every power-up does, kept in one registry.
+
+Each power-up type has an effect object with two hooks: apply() runs when
+the power-up is collected and revert() runs when it runs out. The player
+looks the effect up by name, so a new power-up type only needs a new
+effect registered here - Player doesn't change.
+
+Students can add a power-up like this:
+
+    register_effect(SetAttribute("heavy", "gravity_strength",
+                                 lambda player: player.original_gravity_strength * 2,
+                                 lambda player: player.original_gravity_strength))
+"""
+from settings import *
+
+# What happens when a power-up is collected while it is already active
+STACK_REFRESH = "refresh"  # Apply it again and start its timer over (the default)
+STACK_EXTEND = "extend"    # Keep it and add the new duration to the time left
+STACK_INSTANT = "instant"  # Happens once when collected and never runs out (no timer)
+
+
+class PowerUpEffect:
+    """
+    What a power-up does to the player.
+
+    The base class does nothing, which is right for power-ups that other
+    code just checks for (like "double_shot").
+    """
+
+    def __init__(self, name, stacking=STACK_REFRESH):
+        """
+        Create an effect
+
+        - name: The power-up type it belongs to
+        - stacking: STACK_REFRESH, STACK_EXTEND or STACK_INSTANT
+        """
+        self.name = name
+        self.stacking = stacking
+
+    def apply(self, player):
+        """Start the effect"""
+
+    def revert(self, player):
+        """Undo the effect"""
+
+    def get_duration_ms(self, duration, player=None):
+        """Turn a power-up's duration (seconds) into game milliseconds"""
+        return duration * 1000
+
+
+class SetAttribute(PowerUpEffect):
+    """
+    Sets one player attribute while the power-up lasts.
+    value and normal can be plain values or functions of the player.
+    """
+
+    def __init__(self, name, attribute, value, normal, stacking=STACK_REFRESH):
+        """
+        - attribute: Name of the player attribute to change
+        - value: What it is set to while the power-up lasts
+        - normal: What it goes back to afterwards
+        """
+        super(SetAttribute, self).__init__(name, stacking)
+        self.attribute = attribute
+        self.value = value
+        self.normal = normal
+
+    def apply(self, player):
+        setattr(player, self.attribute, _resolve(self.value, player))
+
+    def revert(self, player):
+        setattr(player, self.attribute, _resolve(self.normal, player))
+
+
+class CallEffect(PowerUpEffect):
+    """Calls a function on the player when applied (and another when reverted)"""
+
+    def __init__(self, name, on_apply, on_revert=None, stacking=STACK_REFRESH):
+        """
+        - on_apply: Function called with the player when the power-up is collected
+        - on_revert: Function called with the player when it runs out (optional)
+        """
+        super(CallEffect, self).__init__(name, stacking)
+        self.on_apply = on_apply
+        self.on_revert = on_revert
+
+    def apply(self, player):
+        self.on_apply(player)
+
+    def revert(self, player):
+        if self.on_revert is not None:
+            self.on_revert(player)
+
+
+class SlowMotionEffect(PowerUpEffect):
+    """
+    Slows game time down, so everything moves and counts down slower.
+    Only a clock that can change speed (GameTimebase) can be slowed - with
+    any other clock (a Player made outside the game) nothing slows down.
+    """
+
+    def apply(self, player):
+        if _can_scale(player.clock):
+            player.clock.set_scale(SLOW_MOTION_SCALE)
+
+    def revert(self, player):
+        if _can_scale(player.clock):
+            player.clock.set_scale(1.0)
+
+    def get_duration_ms(self, duration, player=None):
+        if player is not None and not _can_scale(player.clock):
+            return duration * 1000  # Time isn't slowed, so it's just duration seconds
+        # Game time runs slower, so this is still duration seconds of real time
+        return duration * 1000 * SLOW_MOTION_SCALE
+
+
+def _can_scale(clock):
+    """Check if a clock can run slower or faster (see GameTimebase.set_scale())"""
+    return hasattr(clock, "set_scale")
+
+
+def _resolve(value, player):
+    """Get a value that may be a function of the player"""
+    return value(player) if callable(value) else value
+
+
+# Every power-up effect, by power-up type
+POWERUP_EFFECTS = {}
+
+
+def register_effect(effect):
+    """Add (or replace) the effect for a power-up type"""
+    POWERUP_EFFECTS[effect.name] = effect
+    return effect
+
+
+def get_effect(powerup_type):
+    """Get the effect for a power-up type (unknown types get one that does nothing)"""
+    effect = POWERUP_EFFECTS.get(powerup_type)
+    if effect is None:
+        effect = register_effect(PowerUpEffect(powerup_type))
+    return effect
+
+
+register_effect(SetAttribute("speed", "movement_speed",
+                             lambda player: player.original_movement_speed * 2,
+                             lambda player: player.original_movement_speed))
+register_effect(SetAttribute("jump", "jump_strength",
+                             lambda player: player.original_jump_strength * 1.5,
+                             lambda player: player.original_jump_strength))
+register_effect(SetAttribute("fly", "is_flying", True, False))
+register_effect(SetAttribute("invincible", "is_invincible", True, False))
+register_effect(CallEffect("shrink", lambda player: player._shrink_player(),
+                           lambda player: player._restore_normal_size()))
+register_effect(SetAttribute("shield", "has_shield", True, False))
+register_effect(CallEffect("extra_life", lambda player: player.add_life()))
+register_effect(SetAttribute("long_range", "bullet_range",
+                             DEFAULT_BULLET_RANGE * 2, DEFAULT_BULLET_RANGE))
+register_effect(PowerUpEffect("double_shot"))  # Player.shoot() checks for it
+register_effect(SlowMotionEffect("slow_motion"))
+
+
+class EffectTimers:
+    """
+    When every active power-up runs out.
+
+    Each timed power-up has a timer in a TimerWheel. When a timer goes off
+    the power-up is only remembered as expired; the player takes it off the
+    next time it asks (pop_expired()), at the same point in its update as
+    always.
+    """
+
+    def __init__(self, scheduler):
+        """
+        - scheduler: TimerWheel the timers wait in
+        """
+        self.scheduler = scheduler
+        self.timers = {}    # power-up type -> its timer
+        self.expired = []   # Power-up types whose timer went off, in the order they ran out
+
+    def start(self, powerup_type, end_time):
+        """Set (or move) when a power-up runs out"""
+        self.stop(powerup_type)
+        self.timers[powerup_type] = self.scheduler.schedule(end_time, self._expire, powerup_type)
+
+    def _expire(self, powerup_type):
+        """A power-up's timer went off"""
+        self.expired.append(powerup_type)
+
+    def stop(self, powerup_type):
+        """Forget a power-up's end time"""
+        timer = self.timers.pop(powerup_type, None)
+        if timer is not None:
+            timer.cancel()
+        if powerup_type in self.expired:
+            self.expired.remove(powerup_type)
+
+    def get_end_time(self, powerup_type):
+        """Get when a power-up runs out (None if it isn't timed)"""
+        timer = self.timers.get(powerup_type)
+        return timer.time if timer is not None else None
+
+    def pop_expired(self):
+        """Get (and forget) every power-up whose timer has gone off, soonest first"""
+        if not self.expired:
+            return self.expired
+        expired = self.expired
+        self.expired = []
+        for powerup_type in expired:
+            del self.timers[powerup_type]
+        return expired
+
+    def clear(self):
+        """Forget every end time"""
+        for timer in self.timers.values():
+            timer.cancel()
+        self.timers.clear()
+        self.expired.clear()
@@ -1,6 +1,9 @@
-import pygame
 import random
 from powerup import PowerUp
+from game_clock import RealClock
+from pool import SpritePool
+from entity_store import EntityGroup
+from timer_wheel import TimerWheel, first_due_time
 from settings import *
 
 class PowerUpManager:
@@ -11,7 +14,8 @@ class PowerUpManager:
     
     def __init__(self, screen_width, screen_height, 
                  spawn_rate=DEFAULT_POWERUP_SPAWN_RATE,
-                 enabled_powerups=None, powerup_images=None):
+                 enabled_powerups=None, powerup_images=None,
+                 clock=None, rng=None, scroll=None, scheduler=None):
         """
         Create a power-up manager!
         
@@ -19,17 +23,33 @@ class PowerUpManager:
         - spawn_rate: Seconds between power-up spawns
         - enabled_powerups: List of power-up types to enable
         - powerup_images: Dictionary of power-up type -> image path
+        - clock: Where the manager gets the time from (optional)
+        - rng: Random number generator to use (optional, for repeatable games)
+        - scroll: The platforms' WorldScroll, so power-ups stay on their platform (optional)
+        - scheduler: TimerWheel the game runs every step (optional - the manager runs its own)
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.spawn_rate = spawn_rate
+        
+        # Time source and random numbers (can be swapped for simulations)
+        self.clock = clock if clock else RealClock()
+        self.rng = rng if rng else random
+        
+        self._spawn_rate = spawn_rate  # seconds (see the spawn_rate property)
         
         # Power-up group (only one active at a time)
-        self.powerups = pygame.sprite.Group()
+        self.powerups = EntityGroup(capacity=POWERUP_POOL_SIZE, scroll=scroll)
+        self.powerup_pool = SpritePool(PowerUp, POWERUP_POOL_SIZE)
         self.active_powerup = None
         
-        # Spawning control
-        self.last_spawn_time = pygame.time.get_ticks()
+        # Spawning control: a timer goes off when the next power-up is due,
+        # and it is made during the first update() with no power-up around
+        self.last_spawn_time = self.clock.get_ticks()
+        self.runs_scheduler = scheduler is None
+        self.scheduler = scheduler if scheduler else TimerWheel(self.last_spawn_time)
+        self.spawn_timer = None
+        self.spawn_due = False
+        self._schedule_next_spawn()
         
         # Available power-up types
         self.all_powerup_types = [
@@ -71,6 +91,17 @@ class PowerUpManager:
         if powerup_type in self.enabled_powerups:
             self.enabled_powerups.remove(powerup_type)
     
+    @property
+    def spawn_rate(self):
+        """Seconds between power-up spawns (changing it moves the spawn timer)"""
+        return self._spawn_rate
+    
+    @spawn_rate.setter
+    def spawn_rate(self, spawn_rate):
+        self._spawn_rate = spawn_rate
+        self.spawn_due = False
+        self._schedule_next_spawn()
+    
     def set_spawn_rate(self, spawn_rate):
         """Change how often power-ups spawn"""
         self.spawn_rate = spawn_rate
@@ -85,49 +116,61 @@ class PowerUpManager:
         if len(self.powerups) > 0:
             return False
         
-        current_time = pygame.time.get_ticks()
+        return self._spawn_time_passed(self.clock.get_ticks())
+    
+    def _spawn_time_passed(self, current_time):
+        """Check if spawn_rate seconds have passed since the last spawn at game time current_time"""
         time_since_last_spawn = (current_time - self.last_spawn_time) / 1000.0
-        
         return time_since_last_spawn >= self.spawn_rate
     
+    def _schedule_next_spawn(self):
+        """Set the spawn timer for spawn_rate seconds after the last spawn"""
+        estimate = self.last_spawn_time + self.spawn_rate * 1000
+        due_time = first_due_time(self._spawn_time_passed, estimate)
+        if self.spawn_timer is not None:
+            self.spawn_timer.cancel()
+        self.spawn_timer = self.scheduler.schedule(due_time, self._spawn_is_due)
+    
+    def _spawn_is_due(self):
+        """Spawn timer went off"""
+        self.spawn_due = True
+    
     def spawn_powerup(self, platform_manager):
         """Spawn a new power-up on a ground platform"""
         if not self.enabled_powerups:
             return  # No power-ups enabled
         
         # Find ground platforms to spawn on
-        ground_platforms = []
-        for platform in platform_manager.get_platforms():
-            if (platform.platform_type == "ground" and 
-                platform.rect.x > 0 and 
-                platform.rect.x < self.screen_width + 200):
-                ground_platforms.append(platform)
+        ground_platforms = platform_manager.get_ground_platforms(0, self.screen_width + 200)
         
         if not ground_platforms:
             return  # No suitable platforms
         
         # Choose random platform and power-up type
-        platform = random.choice(ground_platforms)
-        powerup_type = random.choice(self.enabled_powerups)
+        platform = self.rng.choice(ground_platforms)
+        powerup_type = self.rng.choice(self.enabled_powerups)
         
         # Spawn position (on top of platform)
-        spawn_x = platform.rect.x + random.randint(20, platform.rect.width - 50)
+        spawn_x = platform.rect.x + self.rng.randint(20, platform.rect.width - 50)
         spawn_y = platform.rect.top - 35  # Just above platform
         
         # Get image path if available
         image_path = self.powerup_images.get(powerup_type, None)
         
         # Create power-up
-        powerup = PowerUp(
+        powerup = self.powerup_pool.acquire(
             x=spawn_x,
             y=spawn_y,
             powerup_type=powerup_type,
             image_path=image_path,
-            speed=platform_manager.current_platform_speed  # Match platform speed
+            speed=platform_manager.current_platform_speed,  # Match platform speed
+            clock=self.clock
         )
         
         self.powerups.add(powerup)
-        self.last_spawn_time = pygame.time.get_ticks()
+        self.last_spawn_time = self.clock.get_ticks()
+        self.spawn_due = False
+        self._schedule_next_spawn()
     
     def get_powerups(self):
         """Get all power-ups for collision detection"""
@@ -136,31 +179,39 @@ class PowerUpManager:
     def remove_powerup(self, powerup):
         """Remove a specific power-up (when collected)"""
         if powerup in self.powerups:
-            self.powerups.remove(powerup)
+            self.powerup_pool.release(powerup)
     
     def clear_all_powerups(self):
         """Remove all power-ups (for game reset)"""
-        self.powerups.empty()
+        self.powerup_pool.release_all(self.powerups)
     
     def get_powerup_count(self):
         """Get number of active power-ups"""
         return len(self.powerups)
     
-    def update(self, platform_manager):
-        """Update all power-ups and spawn new ones"""
-        # Update all power-ups
-        self.powerups.update()
+    def update(self, platform_manager, step=1):
+        """
+        Update all power-ups and spawn new ones
+        step: how many frames' worth of movement to do (1 = one normal frame)
+        """
+        # Move all power-ups (with the world, if they have a scroll), then animate them
+        self.powerups.move(step)
+        for powerup in self.powerups:
+            powerup.update_animation()
         
         # Remove off-screen or expired power-ups
-        for powerup in self.powerups.copy():
-            if powerup.is_off_screen() or powerup.should_disappear():
-                self.powerups.remove(powerup)
-        
-        # Spawn new power-ups
-        if self.should_spawn_powerup():
+        self.powerup_pool.release_all(self.powerups.get_off_screen())
+        for powerup in self.powerups.sprites():
+            if powerup.should_disappear():
+                self.powerup_pool.release(powerup)
+        
+        # Spawn a new power-up once the spawn timer went off and the last one is gone
+        if self.runs_scheduler:
+            self.scheduler.run(self.clock.get_ticks())
+        if self.spawn_due and len(self.powerups) == 0:
             self.spawn_powerup(platform_manager)
     
-    def draw(self, screen):
-        """Draw all power-ups"""
-        for powerup in self.powerups:
-            powerup.draw(screen)
\ No newline at end of file
+    def draw(self, screen, alpha=1.0, doreturn=True):
+        """Draw all power-ups in one batch (returns the areas drawn if doreturn is True)"""
+        items = [powerup.get_blit_item(alpha) for powerup in self.powerups if powerup.visible]
+        return screen.blits(items, doreturn) or []
\ No newline at end of file
@@ -0,0 +1,215 @@
+import json
+import time
+from collections import deque
+import pygame
+from fonts import get_font
+from settings import *
+
+
+class _Section:
+    """Times one phase of a frame (used with a 'with' block)"""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class _NoSection:
+    """Does nothing - used when the profiler is turned off"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_SECTION = _NoSection()
+
+
+class StartupTimer:
+    """
+    Measures how long the game takes to start, one phase after another.
+
+    Call mark("name") at the end of each phase (importing, starting pygame,
+    loading assets, showing the first frame...). Each phase's time is the
+    time since the previous mark.
+    """
+
+    def __init__(self, start=None):
+        """
+        Start timing
+
+        - start: time.perf_counter() value when the program started (default: now)
+        """
+        self.start = start if start is not None else time.perf_counter()
+        self.last = self.start
+        self.phases = []  # (phase name, milliseconds) in the order they happened
+
+    def mark(self, name):
+        """End the phase called name"""
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last) * 1000.0))
+        self.last = now
+
+    def get_stats(self):
+        """Get milliseconds for every phase (and the total so far)"""
+        stats = {name: round(ms, 3) for name, ms in self.phases}
+        stats["total"] = round((self.last - self.start) * 1000.0, 3)
+        return stats
+
+    def get_report(self):
+        """Get the phases as lines of text, ready to print"""
+        total = (self.last - self.start) * 1000.0
+        lines = ["Startup time:"]
+        for name, ms in self.phases:
+            share = ms / total * 100 if total else 0.0
+            lines.append(f"  {name:20} {ms:8.1f} ms  {share:5.1f}%")
+        lines.append(f"  {'total':20} {total:8.1f} ms")
+        return lines
+
+
+class FrameProfiler:
+    """
+    Measures how long each phase of a frame takes.
+
+    Wrap a phase in 'with profiler.measure("enemies"):' and the profiler
+    keeps the last few hundred times for it, so it can show min/avg/p99
+    numbers on screen or save a Chrome trace file (open it in
+    chrome://tracing or https://ui.perfetto.dev).
+    """
+
+    def __init__(self, enabled=False, window=300, max_trace_events=200000):
+        """
+        Create a frame profiler
+
+        - enabled: Start measuring straight away
+        - window: How many recent frames the statistics cover
+        - max_trace_events: Most events kept for the trace file (oldest are dropped)
+        """
+        self.enabled = enabled
+        self.window = window
+        self.overlay_visible = False
+
+        self.times = {}  # phase name -> recent durations in milliseconds
+        self.trace_events = deque(maxlen=max_trace_events)
+        self.sections = {}
+        self.start_time = time.perf_counter()
+
+        # The overlay text is only rebuilt every few frames
+        self.overlay_refresh_frames = 15
+        self.frames_since_refresh = self.overlay_refresh_frames
+        self.overlay_surface = None
+        self.overlay_font = None
+
+    def set_enabled(self, enabled):
+        """Turn measuring on or off"""
+        self.enabled = enabled
+
+    def toggle_overlay(self):
+        """Show or hide the on-screen numbers (showing them turns measuring on)"""
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.enabled = True
+            self.frames_since_refresh = self.overlay_refresh_frames
+
+    def measure(self, name):
+        """Get a 'with' block that times the phase called name"""
+        if not self.enabled:
+            return _NO_SECTION
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = _Section(self, name)
+        return section
+
+    def record(self, name, start, end):
+        """Store one measurement (times from time.perf_counter())"""
+        durations = self.times.get(name)
+        if durations is None:
+            durations = self.times[name] = deque(maxlen=self.window)
+        durations.append((end - start) * 1000.0)
+
+        # Chrome trace events use microseconds
+        self.trace_events.append({
+            "name": name,
+            "ph": "X",
+            "ts": round((start - self.start_time) * 1000000.0, 3),
+            "dur": round((end - start) * 1000000.0, 3),
+            "pid": 0,
+            "tid": 0,
+        })
+
+    def get_stats(self):
+        """Get min/avg/p99 milliseconds for every phase"""
+        stats = {}
+        for name, durations in self.times.items():
+            ordered = sorted(durations)
+            p99_index = min(len(ordered) - 1, int(len(ordered) * 0.99))
+            stats[name] = {
+                "min": round(ordered[0], 4),
+                "avg": round(sum(ordered) / len(ordered), 4),
+                "p99": round(ordered[p99_index], 4),
+            }
+        return stats
+
+    def export_trace(self, path):
+        """Save everything measured so far as a Chrome trace-event JSON file"""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": list(self.trace_events),
+                       "displayTimeUnit": "ms"}, f)
+        return path
+
+    def clear(self):
+        """Forget all measurements"""
+        self.times.clear()
+        self.trace_events.clear()
+
+    def draw_overlay(self, screen):
+        """Draw the statistics in the top right corner (returns the area drawn)"""
+        if not self.overlay_visible:
+            return []
+
+        self.frames_since_refresh += 1
+        if self.overlay_surface is None or self.frames_since_refresh >= self.overlay_refresh_frames:
+            self.overlay_surface = self._render_overlay()
+            self.frames_since_refresh = 0
+
+        x = screen.get_width() - self.overlay_surface.get_width() - 10
+        return [screen.blit(self.overlay_surface, (x, 10))]
+
+    def _render_overlay(self):
+        """Render the statistics table onto its own surface"""
+        if self.overlay_font is None:
+            self.overlay_font = get_font(18)
+        font = self.overlay_font
+        budget = 1000.0 / FPS
+        rows = [(("phase", "min", "avg", "p99 ms"), WHITE)]
+        for name, numbers in self.get_stats().items():
+            color = RED if numbers["p99"] > budget else WHITE
+            rows.append(((name, f"{numbers['min']:.3f}", f"{numbers['avg']:.3f}",
+                          f"{numbers['p99']:.3f}"), color))
+
+        # Each column is as wide as its widest cell, so the numbers line up
+        columns = list(zip(*(cells for cells, _ in rows)))
+        widths = [max(font.size(cell)[0] for cell in column) + 10 for column in columns]
+        line_height = font.get_linesize()
+        surface = pygame.Surface((sum(widths) + 10, line_height * len(rows) + 10))
+        surface.fill(BLACK)
+        surface.set_alpha(200)
+        for i, (cells, color) in enumerate(rows):
+            x = 5
+            for cell, width in zip(cells, widths):
+                surface.blit(font.render(cell, True, color), (x, 5 + i * line_height))
+                x += width
+        return surface
@@ -0,0 +1,305 @@
+"""
+Input recording and playback.
+
+A recording holds everything needed to play a run again exactly: the random
+seed, a few settings, and for every game step the keys that were held, the
+key presses that happened and the game time (used to check that playback
+stays in step with the recording). Playing it back feeds the same
+input into the game without a window and as fast as the computer can go, so
+a bug or a slow frame a player saw can be seen again on any computer.
+
+File layout (all numbers little-endian):
+    header:  b"PGRP", version (u16), seed (u64), start ticks (u32),
+             settings length (u32), settings (JSON)
+    steps:   held keys (u16 bitmask), clock ticks (u32), key press count (u8),
+             then one i32 key code per key press (-1 means the window closed)
+    index:   file offset of every step (u32 each)
+    footer:  b"PGIX", index offset (u32), step count (u32)
+
+The index lets a step be found without reading everything before it. If a
+game crashed before the index was written, the steps are scanned instead.
+"""
+import json
+import struct
+from array import array
+import pygame
+from game_log import get_logger
+from settings import *
+
+log = get_logger("replay")
+
+REPLAY_MAGIC = b"PGRP"
+INDEX_MAGIC = b"PGIX"
+REPLAY_VERSION = 2  # Version 1 stored real time, which the game no longer runs on
+
+HEADER = struct.Struct("<4sHQII")
+STEP = struct.Struct("<HIB")
+KEY_CODE = struct.Struct("<i")
+FOOTER = struct.Struct("<4sII")
+
+QUIT_CODE = -1  # Stored instead of a key code when the window was closed
+
+# The keys the player reads, one bit each (order matters - don't reorder!)
+REPLAY_KEYS = [
+    pygame.K_a, pygame.K_LEFT, pygame.K_d, pygame.K_RIGHT,
+    pygame.K_w, pygame.K_UP, pygame.K_SPACE,
+    pygame.K_s, pygame.K_DOWN, pygame.K_k,
+]
+KEY_BITS = {key: 1 << bit for bit, key in enumerate(REPLAY_KEYS)}
+
+
+def get_replay_settings():
+    """Settings that change how a recording plays (checked when playing it back)"""
+    return {
+        "step_ms": SIMULATION_STEP_MS,
+        "screen": [SCREEN_WIDTH, SCREEN_HEIGHT],
+        "level_chunk_platforms": LEVEL_CHUNK_PLATFORMS,
+    }
+
+
+def get_key_mask(keys_pressed):
+    """Turn the held keys into a bitmask"""
+    mask = 0
+    for key, bit in KEY_BITS.items():
+        if keys_pressed[key]:
+            mask |= bit
+    return mask
+
+
+def get_key_codes(events):
+    """Get the key presses (and window closes) from a list of events"""
+    codes = []
+    for event in events:
+        if event.type == pygame.QUIT:
+            codes.append(QUIT_CODE)
+        elif event.type == pygame.KEYDOWN:
+            codes.append(event.key)
+    return codes
+
+
+def make_events(codes):
+    """Turn stored key codes back into pygame events"""
+    return [pygame.event.Event(pygame.QUIT) if code == QUIT_CODE
+            else pygame.event.Event(pygame.KEYDOWN, key=code)
+            for code in codes]
+
+
+# Held/not held for every replay key, made once for each bitmask (see ReplayKeys)
+_KEY_STATES = {}
+
+
+class ReplayKeys(dict):
+    """
+    Held keys read back from a bitmask (works like pygame.key.get_pressed()).
+    It is a dict of key -> held, so reading a key costs no Python call -
+    bots read the keys every step, millions of times.
+    """
+
+    def __init__(self, mask=0):
+        super(ReplayKeys, self).__init__()
+        self._mask = None
+        self.mask = mask
+
+    @property
+    def mask(self):
+        """Held keys as a bitmask (see KEY_BITS)"""
+        return self._mask
+
+    @mask.setter
+    def mask(self, mask):
+        if mask != self._mask:
+            states = _KEY_STATES.get(mask)
+            if states is None:
+                states = _KEY_STATES[mask] = {key: bool(mask & bit) for key, bit in KEY_BITS.items()}
+            self.update(states)
+            self._mask = mask
+
+    def __missing__(self, key):
+        return False  # Keys that aren't recorded are never held
+
+
+class ReplayRecorder:
+    """Writes a recording one game step at a time"""
+
+    def __init__(self, path, seed, start_ticks, settings=None):
+        """
+        Start a recording
+
+        - path: File to write
+        - seed: Random seed of the run (random.Random ignores the sign, so it is stored without it)
+        - start_ticks: Game time when the game objects were made
+        - settings: Settings to store (defaults to get_replay_settings())
+        """
+        self.path = path
+        self.file = open(path, "wb")
+        self.offsets = array("I")
+        self.position = 0
+
+        settings_json = json.dumps(settings or get_replay_settings()).encode("utf-8")
+        self._write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, abs(seed), int(start_ticks),
+                                len(settings_json)))
+        self._write(settings_json)
+
+    def _write(self, data):
+        """Write bytes and keep track of where we are in the file"""
+        self.file.write(data)
+        self.position += len(data)
+
+    def record_step(self, keys_pressed, events, ticks):
+        """Store one game step's input"""
+        codes = get_key_codes(events)[:255]  # The count is stored in one byte
+        self.offsets.append(self.position)
+        data = STEP.pack(get_key_mask(keys_pressed), int(ticks), len(codes))
+        if codes:
+            data += b"".join(KEY_CODE.pack(code) for code in codes)
+        self._write(data)
+
+    def get_step_count(self):
+        """Get how many steps have been recorded"""
+        return len(self.offsets)
+
+    def close(self):
+        """Write the step index and close the file (safe to call twice)"""
+        if self.file is None:
+            return
+        index_offset = self.position
+        self._write(self.offsets.tobytes())
+        self._write(FOOTER.pack(INDEX_MAGIC, index_offset, len(self.offsets)))
+        self.file.close()
+        self.file = None
+
+
+class Replay:
+    """A recording loaded from a file"""
+
+    def __init__(self, path):
+        """Load a recording"""
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = f.read()
+
+        magic, version, self.seed, self.start_ticks, settings_length = \
+            HEADER.unpack_from(self.data, 0)
+        if magic != REPLAY_MAGIC:
+            raise ValueError(f"{path} is not a recording")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"{path} is recording version {version}, "
+                             f"this game reads version {REPLAY_VERSION}")
+        settings_start = HEADER.size
+        self.steps_start = settings_start + settings_length
+        self.settings = json.loads(self.data[settings_start:self.steps_start].decode("utf-8"))
+        self.offsets = self._read_index()
+
+    def _read_index(self):
+        """Read the step index (or rebuild it if the recording was cut short)"""
+        end = len(self.data)
+        if end >= self.steps_start + FOOTER.size:
+            magic, index_offset, count = FOOTER.unpack_from(self.data, end - FOOTER.size)
+            if magic == INDEX_MAGIC:
+                offsets = array("I")
+                offsets.frombytes(self.data[index_offset:index_offset + count * offsets.itemsize])
+                return offsets
+
+        # No index - walk the steps one after another
+        offsets = array("I")
+        position = self.steps_start
+        while position + STEP.size <= end:
+            _, _, count = STEP.unpack_from(self.data, position)
+            size = STEP.size + count * KEY_CODE.size
+            if position + size > end:
+                break  # Half-written last step
+            offsets.append(position)
+            position += size
+        return offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def get_step(self, index):
+        """Get (held key mask, clock ticks, key codes) for step number index"""
+        position = self.offsets[index]
+        mask, ticks, count = STEP.unpack_from(self.data, position)
+        position += STEP.size
+        codes = [KEY_CODE.unpack_from(self.data, position + i * KEY_CODE.size)[0]
+                 for i in range(count)]
+        return mask, ticks, codes
+
+    def get_mismatched_settings(self):
+        """Get the names of settings that differ from this game's settings"""
+        current = get_replay_settings()
+        return [name for name, value in self.settings.items() if current.get(name) != value]
+
+
+class ReplayPlayer:
+    """
+    Plays a recording through a headless game as fast as possible.
+
+    seek(step) jumps to any step. Going forward just plays the steps in
+    between; going backward starts the game again from the beginning.
+    """
+
+    def __init__(self, replay, profile=False, headless=True):
+        """
+        Get ready to play a recording
+
+        - replay: A Replay
+        - profile: Measure every phase of every step (see FrameProfiler)
+        - headless: Play without a window (False opens one so the game can be drawn)
+        """
+        self.replay = replay
+        self.profile = profile
+        self.headless = headless
+        for name in replay.get_mismatched_settings():
+            log.warning("Recording was made with a different %s setting - "
+                        "it may not play back exactly.", name)
+        self.game = None
+        self.position = 0
+        self.out_of_step = None  # First step whose game time differed from the recording
+        self.restart()
+
+    def restart(self):
+        """Start the game again from the first step"""
+        # Imported here because the game itself imports this module
+        from tester import Game
+        from game_clock import SimulatedClock
+
+        if self.game is not None:
+            self.game.close()
+        self.clock = SimulatedClock(self.replay.start_ticks)
+        self.game = Game(headless=self.headless, seed=self.replay.seed, clock=self.clock,
+                         profile=self.profile)
+        self.keys = ReplayKeys()
+        self.game.get_keys_pressed = lambda: self.keys
+        self.position = 0
+
+    def is_finished(self):
+        """Check if every step has been played (or the run ended)"""
+        return (self.position >= len(self.replay) or
+                self.game.game_state != "playing" or not self.game.running)
+
+    def step(self):
+        """Play the next recorded step"""
+        mask, ticks, codes = self.replay.get_step(self.position)
+        self.keys.mask = mask
+        self.game.frame_count += 1
+        with self.game.profiler.measure("update"):
+            self.game.update_playing(make_events(codes))
+        
+        # Game time only depends on the steps, so it should match the recording
+        if self.game.clock.get_ticks() != ticks and self.out_of_step is None:
+            self.out_of_step = self.position
+            log.warning("Playback time differs from the recording at step %d - "
+                        "it may not play back exactly.", self.position)
+        self.position += 1
+
+    def seek(self, step):
+        """Play up to (but not including) step number step"""
+        if step < self.position:
+            self.restart()
+        while self.position < step and not self.is_finished():
+            self.step()
+
+    def play(self):
+        """Play every remaining step and return the game's stats"""
+        self.seek(len(self.replay))
+        return self.game.get_stats()
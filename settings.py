@@ -6,6 +6,12 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 
+# Game Loop Settings
+SIMULATION_STEP_MS = 1000 / FPS  # Game logic always moves forward in steps this long
+MAX_STEPS_PER_FRAME = 5  # Most catch-up steps per drawn frame (after that the game slows down)
+RENDER_FPS = FPS  # How often to draw (can be higher than FPS on fast screens)
+SLOW_MOTION_SCALE = 0.5  # How fast game time runs during slow motion (0.5 = half speed)
+
 # Colors (RGB values)
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -25,6 +31,8 @@ DEFAULT_PLATFORM_SPEED = 3
 DEFAULT_DIFFICULTY_MULTIPLIER = 1.5  # How much harder it gets over time
 DIFFICULTY_INCREASE_TIME = 10  # Seconds before difficulty increases
 BASELINE_PLATFORM_LENGTH = SCREEN_WIDTH * 2  # Starting platform length
+LEVEL_CHUNK_PLATFORMS = 8  # Platforms in each chunk of generated level
+LEVEL_PREFETCH_CHUNKS = 4  # Chunks generated ahead of time on a worker thread
 
 # Enemy Settings
 DEFAULT_ENEMY_SPEED = 4
@@ -41,4 +49,26 @@ POWERUP_BLINK_WARNING = 3  # Seconds before disappearing
 DEFAULT_POWERUP_SPAWN_RATE = 8  # Seconds between power-up spawns
 
 # Player Settings
-DEFAULT_PLAYER_LIVES = 3
\ No newline at end of file
+DEFAULT_PLAYER_LIVES = 3
+
+# Collision Settings
+SPATIAL_HASH_CELL_SIZE = 64  # Size of each collision grid cell in pixels
+
+# Timer Wheel Settings (when spawns, difficulty steps and power-ups are due)
+TIMER_WHEEL_SLOTS = 64  # Slots in each level of the wheel (a power of 2)
+TIMER_WHEEL_LEVELS = 4  # Levels (64 slots x 4 levels reach about 4.6 hours ahead)
+
+# Log Settings (game messages are written by a background thread, see game_log.py)
+LOG_LEVEL = "INFO"  # DEBUG, INFO, WARNING, ERROR, CRITICAL or OFF
+LOG_CATEGORY_LEVELS = {}  # Levels for single categories, like {"collisions": "WARNING"}
+LOG_FORMAT = "%(message)s"  # Try "%(relativeCreated)8d %(name)s %(levelname)s: %(message)s"
+
+# Sprite Pool Settings (most spare sprites kept for reuse)
+BULLET_POOL_SIZE = 64
+ENEMY_POOL_SIZE = 64
+POWERUP_POOL_SIZE = 4
+PLATFORM_POOL_SIZE = 32
+
+# Texture Atlas Settings (sprite pictures are packed into big pages)
+ATLAS_PAGE_SIZE = (2048, 512)  # Size of each atlas page in pixels
+ATLAS_PADDING = 1  # Empty pixels between pictures on a page
@@ -0,0 +1,101 @@
+class SpatialHash:
+    """
+    A grid that remembers which sprites are in which part of the screen.
+
+    Instead of checking the player against every enemy, we only check the
+    enemies in the grid cells the player is touching. Sprites are stored in
+    named layers ("platforms", "enemies", ...) so one grid can serve every
+    collision check.
+    """
+
+    def __init__(self, cell_size=64):
+        """
+        Create an empty spatial hash
+
+        - cell_size: Width and height of each grid cell in pixels
+        """
+        self.cell_size = cell_size
+        self.layers = {}        # layer -> {(cell_x, cell_y): list of sprites}
+        self.sprite_cells = {}  # sprite -> (layer, list of cells it was added to)
+
+    def clear(self):
+        """Remove every sprite from the grid"""
+        self.layers.clear()
+        self.sprite_cells.clear()
+
+    def _cells(self, rect):
+        """Get every (cell_x, cell_y) a rectangle touches"""
+        size = self.cell_size
+        left = rect.left // size
+        right = (rect.right - 1) // size
+        top = rect.top // size
+        bottom = (rect.bottom - 1) // size
+        if left == right and top == bottom:
+            return [(left, top)]
+        return [(cell_x, cell_y)
+                for cell_x in range(left, right + 1)
+                for cell_y in range(top, bottom + 1)]
+
+    def insert(self, sprite, layer):
+        """Add a sprite to a layer of the grid"""
+        grid = self.layers.get(layer)
+        if grid is None:
+            grid = self.layers[layer] = {}
+        cells = self._cells(sprite.rect)
+        for cell in cells:
+            bucket = grid.get(cell)
+            if bucket is None:
+                grid[cell] = [sprite]
+            else:
+                bucket.append(sprite)
+        self.sprite_cells[sprite] = (layer, cells)
+
+    def insert_all(self, sprites, layer):
+        """Add many sprites to a layer of the grid"""
+        for sprite in sprites:
+            self.insert(sprite, layer)
+
+    def remove(self, sprite):
+        """Take a sprite out of the grid (for example when it is destroyed)"""
+        entry = self.sprite_cells.pop(sprite, None)
+        if entry is None:
+            return
+        layer, cells = entry
+        grid = self.layers[layer]
+        for cell in cells:
+            bucket = grid[cell]
+            bucket.remove(sprite)
+            if not bucket:
+                del grid[cell]
+
+    def rebuild(self, layers):
+        """
+        Clear the grid and fill it again
+
+        - layers: Dictionary of layer name -> sprites in that layer
+        """
+        self.clear()
+        for layer, sprites in layers.items():
+            self.insert_all(sprites, layer)
+
+    def query(self, rect, layer):
+        """Get sprites in a layer that are near a rectangle (in the same cells)"""
+        grid = self.layers.get(layer)
+        if not grid:
+            return []
+        cells = self._cells(rect)
+        if len(cells) == 1:
+            return list(grid.get(cells[0], ()))
+
+        found = {}  # A dict keeps the order sprites were added in
+        for cell in cells:
+            bucket = grid.get(cell)
+            if bucket:
+                for sprite in bucket:
+                    found[sprite] = True
+        return list(found)
+
+    def collide(self, rect, layer):
+        """Get sprites in a layer whose rect actually overlaps a rectangle"""
+        return [sprite for sprite in self.query(rect, layer)
+                if rect.colliderect(sprite.rect)]
@@ -0,0 +1,346 @@
+"""
+Parameter sweeps: play many headless games with different settings.
+
+Instead of tuning difficulty by playing the game over and over, a bot plays
+it for you. Every combination of the settings given on the command line is
+played with every seed, spread across all CPU cores, and one row per game is
+written to a CSV file as soon as that game finishes. A short summary of each
+combination (average survival time and distance, deaths by cause) is printed
+at the end.
+
+Bots:
+    runner - stays near the left of the screen, shoots all the time and
+             jumps over gaps and enemies
+    random - holds random keys for a random number of steps
+
+Usage:
+    python sweep.py --enemy-speed 8 10 12 --spawn-rate 5 10 --seeds 20
+    python sweep.py --min-gap 60 90 --max-gap 180 240 --bot random
+    python sweep.py --difficulty-increase-rate 1.2 1.5 2 --workers 4 --output rates.csv
+"""
+import os
+import sys
+import csv
+import time
+import random
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pygame
+import game_log
+from level_generator import check_gaps
+from replay import KEY_BITS, ReplayKeys
+
+RESULTS_FILE = "sweep_results.csv"
+
+# Settings a sweep can change (None means "keep the game's own value")
+SWEEP_SETTINGS = ["difficulty_increase_rate", "spawn_rate", "enemy_speed", "min_gap", "max_gap"]
+
+CSV_COLUMNS = ["bot", "seed"] + SWEEP_SETTINGS + [
+    "outcome", "survival_time", "distance", "frames", "lives_left",
+    "enemy_hits_taken", "enemies_shot", "difficulty_level", "wall_time",
+]
+
+
+class RunnerBot:
+    """
+    A simple bot that plays like a careful beginner.
+
+    It keeps the player near the left of the screen, holds the shoot key,
+    and jumps (running forward) when there is no platform just ahead or an
+    enemy is close, with a second jump if it is falling into a gap.
+    """
+
+    def __init__(self, rng, home_x=200, max_x=450, look_ahead=40, danger_distance=150):
+        """
+        Create a runner bot
+
+        - rng: Random number generator (not used, but every bot gets one)
+        - home_x: Where on the screen the bot tries to keep the player
+        - max_x: The bot never runs past this point (so it can see what is coming)
+        - look_ahead: How far in front of the player to check for a platform
+        - danger_distance: How close an enemy can get before the bot jumps
+        """
+        self.home_x = home_x
+        self.max_x = max_x
+        self.look_ahead = look_ahead
+        self.danger_distance = danger_distance
+        self.jumped = False  # Jumps happen on key press, so the key is let go in between
+
+    def _ground_at(self, game, x):
+        """Check if there is a platform below the player at screen position x"""
+        for platform in game.platform_manager.platform_stream:
+            if platform.rect.left > x:
+                break  # Platforms are in left-to-right order
+            if platform.rect.right >= x and platform.rect.top >= game.player.rect.bottom - 5:
+                return True
+        return False
+
+    def _enemy_ahead(self, game):
+        """Check if an enemy is about to run into the player"""
+        player_rect = game.player.rect
+        for enemy in game.enemy_manager.get_enemies():
+            distance = enemy.rect.left - player_rect.right
+            if (0 <= distance <= self.danger_distance and
+                    enemy.rect.bottom > player_rect.top and enemy.rect.top < player_rect.bottom):
+                return True
+        return False
+
+    def get_keys(self, game):
+        """Choose the keys to hold this step"""
+        mask = KEY_BITS[pygame.K_k]
+        player = game.player
+        player_x = player.rect.x
+        if player.is_on_ground():
+            # Walk back to the home spot, and jump at the edge of a gap or when an enemy is close
+            if player_x < self.home_x:
+                mask |= KEY_BITS[pygame.K_d]
+            elif player_x > self.home_x + 60:
+                mask |= KEY_BITS[pygame.K_a]
+            wants_jump = (not self._ground_at(game, player.rect.right + self.look_ahead) or
+                          self._enemy_ahead(game))
+        else:
+            # Run forward over gaps, and double jump just before dropping into one
+            over_gap = not self._ground_at(game, player.rect.centerx)
+            if over_gap or (player.vel_y < 0 and player_x < self.max_x):
+                mask |= KEY_BITS[pygame.K_d]
+            wants_jump = (over_gap and player.vel_y > 0 and
+                          player.rect.bottom >= game.platform_manager.ground_y - 60)
+        if wants_jump and not self.jumped:
+            mask |= KEY_BITS[pygame.K_w]
+        self.jumped = bool(mask & KEY_BITS[pygame.K_w])
+        return ReplayKeys(mask)
+
+
+class RandomBot:
+    """A bot that mashes random keys (good for finding settings nobody can survive)"""
+
+    def __init__(self, rng, min_hold=5, max_hold=30):
+        """
+        Create a random bot
+
+        - rng: Random number generator (seeded, so the same seed presses the same keys)
+        - min_hold, max_hold: How many steps each choice of keys is held
+        """
+        self.rng = rng
+        self.min_hold = min_hold
+        self.max_hold = max_hold
+        self.keys = ReplayKeys()
+        self.steps_left = 0
+
+    def get_keys(self, game):
+        """Choose the keys to hold this step"""
+        if self.steps_left <= 0:
+            mask = 0
+            for key, bit in KEY_BITS.items():
+                if self.rng.random() < 0.25:
+                    mask |= bit
+            self.keys = ReplayKeys(mask)
+            self.steps_left = self.rng.randint(self.min_hold, self.max_hold)
+        self.steps_left -= 1
+        return self.keys
+
+
+BOTS = {"runner": RunnerBot, "random": RandomBot}
+
+
+def apply_settings(game, settings):
+    """
+    Change a new game's settings (values that are None are left alone)
+    Raises a ValueError (before changing anything) if the gaps can't work.
+    """
+    platforms = game.platform_manager
+    enemies = game.enemy_manager
+    min_gap = settings.get("min_gap")
+    max_gap = settings.get("max_gap")
+    min_gap = platforms.min_gap if min_gap is None else min_gap
+    max_gap = platforms.max_gap if max_gap is None else max_gap
+    check_gaps(min_gap, max_gap)  # Checked against the game's own gaps for the ones not given
+    
+    if settings.get("difficulty_increase_rate") is not None:
+        platforms.set_difficulty_increase(rate=settings["difficulty_increase_rate"])
+    if settings.get("spawn_rate") is not None:
+        enemies.set_spawn_rate(settings["spawn_rate"])
+    if settings.get("enemy_speed") is not None:
+        enemies.set_enemy_speed(settings["enemy_speed"])
+    if settings.get("min_gap") is not None or settings.get("max_gap") is not None:
+        platforms.set_gaps(min_gap, max_gap)
+
+
+def start_worker():
+    """Get a worker process ready (runs once in every worker)"""
+    # Game messages would flood the terminal, so workers stay quiet
+    game_log.set_level("OFF")
+    sys.stdout = open(os.devnull, "w")
+
+
+def run_game(job):
+    """Play one game with a bot and return its CSV row (runs in a worker)"""
+    # Imported here so the main process never starts pygame
+    from tester import Game
+
+    start = time.perf_counter()
+    game = Game(headless=True, seed=job["seed"])
+    try:
+        apply_settings(game, job["settings"])
+    except ValueError as error:
+        game.close()
+        return make_error_row(job, error)
+    bot = BOTS[job["bot"]](random.Random(job["seed"]))
+    game.get_keys_pressed = lambda: bot.get_keys(game)
+
+    stats = game.simulate(job["frames"])
+    game.close()
+
+    row = {"bot": job["bot"], "seed": job["seed"]}
+    row.update(job["settings"])
+    row.update({
+        "outcome": stats["game_over_reason"] or "survived",
+        "survival_time": stats["time_elapsed"],
+        "distance": stats["distance"],
+        "frames": stats["frames"],
+        "lives_left": stats["lives"],
+        "enemy_hits_taken": stats["enemy_hits_taken"],
+        "enemies_shot": stats["enemies_shot"],
+        "difficulty_level": stats["difficulty_level"],
+        "wall_time": round(time.perf_counter() - start, 3),
+    })
+    return row
+
+
+def make_error_row(job, error):
+    """Make the CSV row for a job whose settings can't be played"""
+    row = {"bot": job["bot"], "seed": job["seed"]}
+    row.update(job["settings"])
+    row["outcome"] = f"error: {error}"
+    return row
+
+
+def make_jobs(grid, seeds, bot, frames):
+    """
+    Make one job for every combination of settings and every seed
+    Jobs whose gaps can't work get an "error" and are never played.
+    """
+    names = list(grid)
+    jobs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        settings = dict(zip(names, values))
+        error = None
+        min_gap, max_gap = settings.get("min_gap"), settings.get("max_gap")
+        if min_gap is not None and max_gap is not None:
+            try:
+                check_gaps(min_gap, max_gap)
+            except ValueError as gap_error:
+                error = gap_error
+        for seed in seeds:
+            jobs.append({"settings": settings, "seed": seed, "bot": bot, "frames": frames,
+                         "error": error})
+    return jobs
+
+
+def summarize(rows):
+    """Group the results by settings: runs, averages and deaths by cause"""
+    groups = {}
+    for row in rows:
+        key = tuple(row[name] for name in SWEEP_SETTINGS)
+        group = groups.setdefault(key, {"runs": 0, "survival_time": 0.0, "distance": 0.0,
+                                        "outcomes": {}})
+        if row.get("survival_time") is None:
+            # Never played (error row) - counted in the outcomes only
+            group["outcomes"][row["outcome"]] = group["outcomes"].get(row["outcome"], 0) + 1
+            continue
+        group["runs"] += 1
+        group["survival_time"] += row["survival_time"]
+        group["distance"] += row["distance"]
+        group["outcomes"][row["outcome"]] = group["outcomes"].get(row["outcome"], 0) + 1
+
+    summary = []
+    for key in sorted(groups, key=lambda k: [(v is None, v) for v in k]):
+        group = groups[key]
+        summary.append({
+            "settings": dict(zip(SWEEP_SETTINGS, key)),
+            "runs": group["runs"],
+            "mean_survival_time": round(group["survival_time"] / max(group["runs"], 1), 2),
+            "mean_distance": round(group["distance"] / max(group["runs"], 1), 1),
+            "outcomes": group["outcomes"],
+        })
+    return summary
+
+
+def print_summary(summary):
+    """Print one line per combination of settings"""
+    for entry in summary:
+        settings = " ".join(f"{name}={value}" for name, value in entry["settings"].items()
+                            if value is not None) or "defaults"
+        outcomes = ", ".join(f"{outcome}: {count}"
+                             for outcome, count in sorted(entry["outcomes"].items()))
+        print(f"{settings:50} runs {entry['runs']:4}  "
+              f"survived {entry['mean_survival_time']:7.2f} s  "
+              f"distance {entry['mean_distance']:9.1f}  ({outcomes})")
+
+
+def run_sweep(grid, seeds, bot="runner", frames=3600, workers=None, output=RESULTS_FILE):
+    """
+    Play every job across a pool of worker processes.
+    Rows are written to output as games finish (so their order changes from run to run).
+    Returns every row.
+    """
+    jobs = make_jobs(grid, seeds, bot, frames)
+    rows = []
+    with open(output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        # Jobs that can't be played are written straight away instead of sent to a worker
+        finished = [make_error_row(job, job["error"]) for job in jobs if job["error"]]
+        with ProcessPoolExecutor(max_workers=workers, initializer=start_worker) as executor:
+            futures = [executor.submit(run_game, job) for job in jobs if not job["error"]]
+            results = itertools.chain(finished, (future.result() for future in as_completed(futures)))
+            for done, row in enumerate(results, 1):
+                writer.writerow(row)
+                f.flush()
+                rows.append(row)
+                print(f"\r{done}/{len(jobs)} games", end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many headless games with different settings")
+    parser.add_argument("--difficulty-increase-rate", type=float, nargs="+", default=[None],
+                        help="values for PlatformManager difficulty_increase_rate")
+    parser.add_argument("--spawn-rate", type=float, nargs="+", default=[None],
+                        help="values for EnemyManager spawn_rate (seconds between enemies)")
+    parser.add_argument("--enemy-speed", type=float, nargs="+", default=[None],
+                        help="values for EnemyManager enemy_speed")
+    parser.add_argument("--min-gap", type=int, nargs="+", default=[None],
+                        help="values for the smallest gap between platforms")
+    parser.add_argument("--max-gap", type=int, nargs="+", default=[None],
+                        help="values for the largest gap between platforms")
+    parser.add_argument("--seeds", type=int, default=10,
+                        help="games per combination, with seeds 0, 1, 2, ... (default: 10)")
+    parser.add_argument("--frames", type=int, default=3600,
+                        help="longest game in frames (default: 3600, one minute)")
+    parser.add_argument("--bot", choices=sorted(BOTS), default="runner",
+                        help="who plays (default: runner)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU core)")
+    parser.add_argument("--output", default=RESULTS_FILE,
+                        help=f"CSV file to write (default: {RESULTS_FILE})")
+    args = parser.parse_args()
+
+    grid = {
+        "difficulty_increase_rate": args.difficulty_increase_rate,
+        "spawn_rate": args.spawn_rate,
+        "enemy_speed": args.enemy_speed,
+        "min_gap": args.min_gap,
+        "max_gap": args.max_gap,
+    }
+    rows = run_sweep(grid, range(args.seeds), bot=args.bot, frames=args.frames,
+                     workers=args.workers, output=args.output)
+    print_summary(summarize(rows))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
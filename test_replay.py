@@ -0,0 +1,54 @@
+"""
+Checks that recordings play back exactly.
+
+Run with:  python -m pytest test_replay.py   (or python -m unittest test_replay)
+"""
+import os
+import tempfile
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # No window needed
+
+import game_log
+from game_clock import SimulatedClock
+from replay import Replay, ReplayPlayer
+from tester import Game
+
+# Stats that have to come out the same when a run is played back
+COMPARED_STATS = ("time_elapsed", "distance", "lives", "difficulty_level")
+
+
+class RecordingAcrossResetTest(unittest.TestCase):
+    """A run started with reset_game() gets its own recording, which must play back too"""
+
+    def setUp(self):
+        self.log_level = game_log.get_level()
+        game_log.set_level("OFF")
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        game_log.set_level(self.log_level)
+        self.folder.cleanup()
+
+    def test_second_recording_plays_back(self):
+        path = os.path.join(self.folder.name, "run.pgr")
+        game = Game(headless=True, seed=7, clock=SimulatedClock(), record_path=path)
+        for _ in range(268):  # Ends part way through a millisecond
+            game.update()
+        game.reset_game()
+        for _ in range(300):
+            game.update()
+        recorded = game.get_stats()
+        game.close()
+
+        player = ReplayPlayer(Replay(os.path.join(self.folder.name, "run-2.pgr")))
+        played = player.play()
+        player.game.close()
+
+        self.assertIsNone(player.out_of_step)
+        for name in COMPARED_STATS:
+            self.assertEqual(played[name], recorded[name], name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,49 +1,221 @@
+import time
+PROGRAM_START = time.perf_counter()  # Taken before anything else is imported (for the startup report)
+
+import os
+# pygame prints a banner when it is imported, which would get mixed into
+# the JSON that --simulate writes to stdout
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
 import pygame
 import sys
+import json
+import random
+import argparse
+from contextlib import redirect_stdout
 from player import Player
 from platform_manager import PlatformManager
 from enemy_manager import EnemyManager
 from powerup_manager import PowerUpManager
 from game_over import GameOverScreen
-from event_handler import handle_events, handle_game_events
+from game_clock import GameTimebase, RealClock, SimulatedClock
+from timer_wheel import TimerWheel
+from spatial_hash import SpatialHash
+from assets import asset_cache
+from dirty_renderer import DirtyRectRenderer
+from fonts import get_font
+from hud import HUD
+from profiler import FrameProfiler, StartupTimer
+from replay import Replay, ReplayPlayer, ReplayRecorder
+from event_handler import handle_game_events
+import game_log
 from settings import *
 
+state_log = game_log.get_logger("state")
+collision_log = game_log.get_logger("collisions")
+replay_log = game_log.get_logger("replay")
+profiler_log = game_log.get_logger("profiler")
+
+# How long starting the game takes (python tester.py --startup-report prints it)
+startup_timer = StartupTimer(PROGRAM_START)
+startup_timer.mark("import")
+
 class Game:
     """
     Main game class - Students can easily customize their game here!
     """
     
-    def __init__(self):
-        """Set up the game"""
-        pygame.init()
+    def __init__(self, headless=False, seed=None, clock=None, rng=None,
+                 dirty_rendering=False, render_fps=RENDER_FPS, profile=False,
+                 record_path=None, fast_start=False, startup_timer=None, threaded_level=True):
+        """
+        Set up the game
+        
+        Optional settings (used for simulations and testing):
+        - headless: Run without a real window (uses SDL's dummy video driver)
+        - seed: Random seed so every run plays out the same way
+        - clock: Time source (defaults to a simulated clock when headless)
+        - rng: Random number generator (defaults to one built from seed)
+        - dirty_rendering: Only repaint parts of the screen that changed
+        - render_fps: How often to draw (game logic always runs at FPS)
+        - profile: Measure every phase of every frame (F3 shows the numbers)
+        - record_path: Save every run's input to this file so it can be played back
+        - fast_start: Show the first frame before loading pictures it doesn't need
+        - startup_timer: StartupTimer to mark the startup phases on (optional)
+        - threaded_level: Make the level on a worker thread, so making it never
+          holds up a frame (bots turn it off: they want the most steps per
+          second, and handing work between threads costs more than it saves)
+        """
+        self.headless = headless
+        self.threaded_level = threaded_level
+        if headless:
+            # The dummy drivers must be chosen before pygame starts up
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        
+        # Only start the parts of pygame the game uses (pygame.init() would also
+        # start sound and joysticks). Fonts start the first time one is made.
+        pygame.display.init()
         
         # Create the game window
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Platformer Game - WASD/Arrows: Move | K: Shoot | TAB: Difficulty")
-        
-        # Game clock for smooth animation
-        self.clock = pygame.time.Clock()
-        
-        # Create fonts for displaying text
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.startup_timer = startup_timer
+        self._mark_startup("pygame init")
+        
+        # Optional renderer that only updates changed parts of the screen
+        self.dirty_renderer = DirtyRectRenderer(self.screen, BLACK) if dirty_rendering else None
+        
+        # Game clock for smooth animation (simulated clocks never wait)
+        if clock is None:
+            clock = SimulatedClock() if headless else RealClock()
+        
+        # Recording: the random numbers come from a known seed, so the run
+        # can be played back exactly
+        self.record_path = record_path
+        self.recorder = None
+        self.run_number = 1
+        if record_path:
+            if seed is None:
+                seed = random.randrange(2 ** 32)
+            rng = None
+        
+        # Game time moves forward once per step, so every timer in a step sees
+        # the same time, and pausing or slow motion stops or slows every timer
+        self.clock = GameTimebase(clock)
+        self.render_fps = render_fps
+        
+        # Fixed time step: real time piles up here and is used in equal steps
+        self.accumulator = 0.0
+        self.interpolation = 1.0  # How far between the last two steps to draw
+        self.pending_events = []  # Events from frames where no step ran
+        self.steps_dropped = 0  # Steps skipped because the computer fell behind
+        
+        # Random numbers shared by every manager (seeded for repeatable runs)
+        self.seed = seed
+        if rng is None:
+            rng = random.Random(seed) if seed is not None else random
+        self.rng = rng
+        
+        # Heads-up display (renders its text once and caches it)
+        self.hud = HUD(SCREEN_HEIGHT)
         
         # Game state
         self.game_state = "playing"  # "playing", "game_over"
+        self.game_over_reason = None  # "enemy" or "fell"
         self.running = True
+        self.frame_count = 0
+        
+        # Hit counters (for instrumentation): this frame and whole run
+        self.frame_hits = {"player_enemy": 0, "bullet_enemy": 0}
+        self.total_hits = {"player_enemy": 0, "bullet_enemy": 0}
+        
+        # Per-phase timing (F3: show numbers, F4: save a Chrome trace)
+        self.profiler = FrameProfiler(enabled=profile)
+        self.trace_path = None  # Where run() saves the trace on exit
+        
+        # Everything one game step does, in order (see update_playing())
+        self.step_phases = [
+            ("timers", self.run_timers),
+            ("input", self.read_input),
+            ("player", self.update_player),
+            ("platforms", self.update_platforms),
+            ("enemies", self.update_enemies),
+            ("powerups", self.update_powerups),
+            ("collide.grid", self.update_spatial_hash),
+            ("collide.platforms", self.check_platform_collisions),
+            ("collide.enemies", self.check_enemy_collisions),
+            ("collide.bullets", self.check_bullet_enemy_collisions),
+            ("collide.powerups", self.check_powerup_collisions),
+            ("collide.fall", self.check_player_fall),
+        ]
+        self.step_events = []  # This step's events, keys, and how far things move
+        self.keys_pressed = None
+        self.step_scale = 1.0
+        self.step_dt = 1.0
+        
+        # Collision grid, refilled once per frame before collisions are checked
+        self.spatial_hash = SpatialHash(SPATIAL_HASH_CELL_SIZE)
+        
+        # Fast start: pictures the first frame doesn't need are loaded
+        # afterwards, one per frame (see continue_startup())
+        self.deferred_loads = [self._load_player_image, self._load_game_over_screen] if fast_start else []
+        self.first_frame_shown = False
         
         # Create game objects
+        if record_path:
+            self._start_recording()
         self._create_game_objects()
         
-        # Create game over screen
+        # Create game over screen (its fonts and buttons are made when it is first shown)
         self.game_over_screen = GameOverScreen(SCREEN_WIDTH, SCREEN_HEIGHT)
-        
-        # Slow motion effect
-        self.slow_motion_active = False
-        self.time_multiplier = 1.0
+        self._mark_startup("assets and objects")
+    
+    @property
+    def font(self):
+        """Big font for displaying text (made the first time it is used)"""
+        return get_font(36)
+    
+    @property
+    def small_font(self):
+        """Small font for displaying text (made the first time it is used)"""
+        return get_font(24)
+    
+    def _mark_startup(self, phase):
+        """End a startup phase (if startup is being timed)"""
+        if self.startup_timer is not None:
+            self.startup_timer.mark(phase)
+    
+    def _load_player_image(self):
+        """Give the player its picture (fast start shows a colored box until then)"""
+        self.player.set_image(self.player_image)
+    
+    def _load_game_over_screen(self):
+        """Make the game over screen's fonts and buttons before they are needed"""
+        self.game_over_screen.load()
+    
+    def continue_startup(self):
+        """
+        Called after every frame until startup is done: notes when the first
+        frame was shown, then loads one deferred picture per frame.
+        Returns True once everything is loaded.
+        """
+        if not self.first_frame_shown:
+            self.first_frame_shown = True
+            self._mark_startup("first frame")
+        elif self.deferred_loads:
+            self.deferred_loads.pop(0)()
+            if not self.deferred_loads:
+                self._mark_startup("deferred assets")
+        return not self.deferred_loads
     
     def _create_game_objects(self):
         """Create the player and managers"""
+        # Every timer in the game (spawns, difficulty, power-ups) waits in one wheel
+        self.scheduler = TimerWheel(self.clock.get_ticks())
+        
+        # Player picture (with fast start it is loaded after the first frame)
+        self.player_image = "pixil-frame-0.png"
+        
         # Create player - Students can easily modify these values!
         self.player = Player(
             width=30,           # Size of player
@@ -53,13 +225,14 @@ class Game:
             jump_strength=18,   # How high player jumps
             gravity_strength=.9,  # How fast player falls
             lives=3,
-            image_path= "pixil-frame-0.png"           # Starting lives
+            image_path=None if self.deferred_loads else self.player_image,
+            clock=self.clock,
+            scheduler=self.scheduler
         )
         
-        # Set player starting position
+        # Set player starting position (on the left side)
         self.player.set_screen_bounds(SCREEN_WIDTH, SCREEN_HEIGHT)
-        self.player.rect.x = 150  # Keep player on left side
-        self.player.rect.y = SCREEN_HEIGHT - 150
+        self.player.set_position(150, SCREEN_HEIGHT - 150)
         
         # Create platform manager - Students can modify these settings!
         self.platform_manager = PlatformManager(
@@ -69,7 +242,11 @@ class Game:
             platform_speed=3,           # Base platform speed
             difficulty="normal",        # Starting difficulty
             difficulty_increase_rate=1.5,  # How much harder it gets
-            difficulty_increase_time=10     # Seconds before getting harder
+            difficulty_increase_time=10,    # Seconds before getting harder
+            clock=self.clock,
+            rng=self.rng,
+            scheduler=self.scheduler,
+            threaded_level=self.threaded_level
         )
         
         # Create enemy manager - Students can customize enemies!
@@ -79,7 +256,10 @@ class Game:
             enemy_speed=10,              # Enemy movement speed
             spawn_rate=10,               # Seconds between enemy spawns
             spawn_increase_time=15,     # Seconds before spawn rate increases
-            enemy_image_path=None       # Path to enemy image (optional)
+            enemy_image_path=None,      # Path to enemy image (optional)
+            clock=self.clock,
+            rng=self.rng,
+            scheduler=self.scheduler
         )
         
         # Create power-up manager - Students can customize power-ups!
@@ -95,24 +275,48 @@ class Game:
             screen_height=SCREEN_HEIGHT,
             spawn_rate=8,               # Seconds between power-up spawns
             enabled_powerups=enabled_powerups,  # Which power-ups can spawn
-            powerup_images={}           # Custom images for power-ups
+            powerup_images={},          # Custom images for power-ups
+            clock=self.clock,
+            rng=self.rng,
+            scroll=self.platform_manager.scroll,  # Power-ups scroll with the platforms
+            scheduler=self.scheduler
         )
     
     def reset_game(self):
         """Reset the game for a new playthrough"""
-        print("Game Reset! Starting new game...")
+        state_log.info("Game Reset! Starting new game...")
         
         # Change game state first
         self.game_state = "playing"
+        self.game_over_reason = None
+        
+        # Forget the frozen game over picture
+        self.game_over_screen.reset()
         
-        # Clear any pending timers
-        pygame.time.set_timer(pygame.USEREVENT + 1, 0)
+        # Reset hit counters
+        for kind in self.total_hits:
+            self.frame_hits[kind] = 0
+            self.total_hits[kind] = 0
         
         # Reset time effects
-        self.slow_motion_active = False
-        self.time_multiplier = 1.0
+        self.clock.set_scale(1.0)
+        self.clock.resume()
+        
+        # Steps move game time by parts of a millisecond, but a run (and its
+        # recording, which stores whole milliseconds) starts on a whole one
+        self.clock.set_ticks(self.clock.get_ticks())
+        
+        # A new run gets a new recording (and a new seed, so the level is new)
+        if self.recorder is not None:
+            self.stop_recording()
+            self.run_number += 1
+            self.seed = random.randrange(2 ** 32)
+            self.rng = random.Random(self.seed)
+            self._start_recording()
         
         # Clear all game objects
+        if hasattr(self, 'platform_manager'):
+            self.platform_manager.stop()
         if hasattr(self, 'enemy_manager'):
             self.enemy_manager.clear_all_enemies()
         if hasattr(self, 'powerup_manager'):
@@ -121,249 +325,393 @@ class Game:
         # Create fresh game objects
         self._create_game_objects()
         
-        # Reset player position
-        self.player.rect.x = 150
-        self.player.rect.y = SCREEN_HEIGHT - 150
+        # Reset player position and the fixed time step
+        self.player.set_position(150, SCREEN_HEIGHT - 150)
+        self.accumulator = 0.0
+        self.interpolation = 1.0
+        self.pending_events = []
+    
+    def _start_recording(self):
+        """Start saving this run's input (later runs get -2, -3, ... added to the name)"""
+        path = self.record_path
+        if self.run_number > 1:
+            name, extension = os.path.splitext(path)
+            path = f"{name}-{self.run_number}{extension}"
+        self.recorder = ReplayRecorder(path, self.seed, self.clock.get_ticks())
+        replay_log.info("Recording to %s", path)
+    
+    def stop_recording(self):
+        """Finish the recording file (safe to call when not recording)"""
+        if self.recorder is not None:
+            self.recorder.close()
+            replay_log.info("Recorded %d steps to %s", self.recorder.get_step_count(),
+                            self.recorder.path)
+            self.recorder = None
+    
+    def close(self):
+        """Finish any recording and stop background work (call when done with the game)"""
+        self.stop_recording()
+        self.platform_manager.stop()
+        game_log.flush()  # Messages are written in the background - wait for them
+    
+    def update_spatial_hash(self):
+        """
+        Put every collidable sprite into the collision grid for this frame
+        (platforms don't need it - they are kept in left-to-right order)
+        """
+        self.spatial_hash.rebuild({
+            "enemies": self.enemy_manager.get_enemies(),
+            "powerups": self.powerup_manager.get_powerups(),
+        })
     
     def check_platform_collisions(self):
         """Check if player collides with platforms"""
-        collisionable_platforms = self.platform_manager.get_collisionable_platforms()
-        
-        for platform in collisionable_platforms:
-            if self.player.rect.colliderect(platform.rect):
-                # Check if player is landing on top of platform
-                if (self.player.vel_y > 0 and 
-                    self.player.rect.bottom - self.player.vel_y <= platform.rect.top + 10):
-                    self.player.land_on_platform(platform.rect.top)
-                    return True
+        nearby_platforms = self.platform_manager.collide(self.player.rect)
+        
+        for platform in nearby_platforms:
+            # Check if player is landing on top of platform
+            if (self.player.vel_y > 0 and 
+                self.player.rect.bottom - self.player.vel_y <= platform.rect.top + 10):
+                self.player.land_on_platform(platform.rect.top)
+                return True
         return False
     
     def check_enemy_collisions(self):
-        """Check if player collides with enemies"""
-        for enemy in self.enemy_manager.get_enemies():
-            if self.player.rect.colliderect(enemy.rect):
-                # Player hit by enemy
-                if self.player.lose_life():
-                    print(f"Player hit! Lives remaining: {self.player.get_lives()}")
-                
-                # Remove the enemy
-                self.enemy_manager.remove_enemy(enemy)
-                
-                # Check if player is dead
-                if self.player.is_dead():
-                    print("Game Over: Player has no lives left!")
-                    self.game_state = "game_over"
-                
-                return True
-        return False
+        """
+        Check if player collides with enemies.
+        Every enemy touching the player is handled in the same frame.
+        Returns how many enemies hit the player.
+        """
+        hit_enemies = self.spatial_hash.collide(self.player.rect, "enemies")
+        
+        for enemy in hit_enemies:
+            # Player hit by enemy (no more damage once the player is dead)
+            if not self.player.is_dead() and self.player.lose_life():
+                collision_log.info("Player hit! Lives remaining: %d", self.player.get_lives())
+            self.spatial_hash.remove(enemy)
+        
+        # Remove all the enemies at once
+        self.enemy_manager.remove_enemies(hit_enemies)
+        self._record_hits("player_enemy", len(hit_enemies))
+        
+        # Check if player is dead
+        if hit_enemies and self.player.is_dead():
+            state_log.info("Game Over: Player has no lives left!")
+            self.game_state = "game_over"
+            self.game_over_reason = "enemy"
+        
+        return len(hit_enemies)
     
     def check_bullet_enemy_collisions(self):
-        """Check if bullets hit enemies"""
-        for bullet in self.player.get_bullets():
-            for enemy in self.enemy_manager.get_enemies():
-                if bullet.rect.colliderect(enemy.rect):
-                    # Bullet hit enemy
-                    self.player.bullets.remove(bullet)
-                    self.enemy_manager.remove_enemy(enemy)
-                    return True
-        return False
+        """
+        Check if bullets hit enemies.
+        Works like pygame.sprite.groupcollide: every hit this frame is found
+        first, then all used bullets and dead enemies are removed together.
+        Each bullet destroys the first enemy it touches.
+        Returns how many enemies were shot.
+        """
+        used_bullets = []
+        dead_enemies = {}  # A dict keeps the order enemies were hit in
+        
+        # (No enemies means nothing to hit, so the bullets aren't even looked at)
+        if self.enemy_manager.get_enemies():
+            for bullet in self.player.get_bullets():
+                for enemy in self.spatial_hash.collide(bullet.rect, "enemies"):
+                    if enemy not in dead_enemies:
+                        # Bullet hit enemy
+                        used_bullets.append(bullet)
+                        dead_enemies[enemy] = True
+                        break
+        
+        # Remove everything that was hit in one go
+        if used_bullets:
+            self.player.remove_bullets(used_bullets)
+            self.enemy_manager.remove_enemies(dead_enemies)
+            for enemy in dead_enemies:
+                self.spatial_hash.remove(enemy)
+        
+        self._record_hits("bullet_enemy", len(dead_enemies))
+        return len(dead_enemies)
+    
+    def _record_hits(self, kind, count):
+        """Remember hit counts for this frame and for the whole run"""
+        self.frame_hits[kind] = count
+        self.total_hits[kind] += count
     
     def check_powerup_collisions(self):
         """Check if player collides with power-ups"""
-        for powerup in self.powerup_manager.get_powerups():
-            if self.player.rect.colliderect(powerup.rect):
-                # Player collected power-up
-                powerup_type = powerup.get_type()
-                duration = powerup.get_duration()
-                
-                # Apply power-up effect
-                if powerup_type == "slow_motion":
-                    self.slow_motion_active = True
-                    self.time_multiplier = 0.5
-                    # Set timer to end slow motion
-                    pygame.time.set_timer(pygame.USEREVENT + 1, duration * 1000)
-                else:
-                    self.player.apply_powerup(powerup_type, duration)
-                
-                # Remove power-up
-                self.powerup_manager.remove_powerup(powerup)
-                return True
+        for powerup in self.spatial_hash.collide(self.player.rect, "powerups"):
+            # Player collected power-up
+            powerup_type = powerup.get_type()
+            duration = powerup.get_duration()
+            
+            # Apply power-up effect (slow motion too - it slows the game's timebase)
+            self.player.apply_powerup(powerup_type, duration)
+            
+            # Remove power-up
+            self.powerup_manager.remove_powerup(powerup)
+            self.spatial_hash.remove(powerup)
+            return True
         return False
     
     def check_player_fall(self):
         """Check if player has fallen off the screen"""
         if self.player.is_falling_off_screen():
-            print("Game Over: Player fell off screen!")
+            state_log.info("Game Over: Player fell off screen!")
             self.game_state = "game_over"
+            self.game_over_reason = "fell"
             return True
         return False
     
     def draw_game_info(self):
-        """Draw game information on screen"""
-        # Get game stats
-        time_elapsed = self.platform_manager.get_time_elapsed()
-        distance = self.player.get_distance_traveled()
-        current_speed = self.platform_manager.get_current_speed()
-        difficulty_level = self.platform_manager.get_difficulty_level()
-        lives = self.player.get_lives()
-        
-        # Draw background for text
-        info_bg = pygame.Surface((320, 160))
-        info_bg.fill((0, 0, 0))
-        info_bg.set_alpha(128)  # Semi-transparent
-        self.screen.blit(info_bg, (10, 10))
-        
-        # Draw game stats
-        time_text = self.small_font.render(f"Time: {time_elapsed:.1f}s", True, WHITE)
-        distance_text = self.small_font.render(f"Distance: {distance:.0f}", True, WHITE)
-        speed_text = self.small_font.render(f"Speed: {current_speed:.1f}x", True, WHITE)
-        difficulty_text = self.small_font.render(f"Difficulty: {difficulty_level:.1f}x", True, WHITE)
-        lives_text = self.small_font.render(f"Lives: {lives}", True, RED if lives <= 1 else WHITE)
-        
-        self.screen.blit(time_text, (15, 15))
-        self.screen.blit(distance_text, (15, 35))
-        self.screen.blit(speed_text, (15, 55))
-        self.screen.blit(difficulty_text, (15, 75))
-        self.screen.blit(lives_text, (15, 95))
-        
-        # Draw difficulty mode
-        difficulty_mode = self.platform_manager.difficulty.upper()
-        mode_color = (255, 100, 100) if difficulty_mode == "HARD" else (100, 255, 100)
-        mode_text = self.small_font.render(f"Mode: {difficulty_mode}", True, mode_color)
-        self.screen.blit(mode_text, (15, 115))
-        
-        # Draw active power-ups
-        active_powerups = self.player.get_active_powerups()
-        if active_powerups:
-            powerup_text = self.small_font.render(f"Powers: {', '.join(active_powerups)}", True, YELLOW)
-            self.screen.blit(powerup_text, (15, 135))
-        
-        # Draw slow motion indicator
-        if self.slow_motion_active:
-            slow_text = self.small_font.render("SLOW MOTION", True, CYAN)
-            self.screen.blit(slow_text, (15, 155))
+        """Draw game information on screen (returns the areas that were drawn)"""
+        return self.hud.draw_info(
+            self.screen,
+            time_elapsed=self.platform_manager.get_time_elapsed(),
+            distance=self.player.get_distance_traveled(),
+            speed=self.platform_manager.get_current_speed(),
+            difficulty_level=self.platform_manager.get_difficulty_level(),
+            lives=self.player.get_lives(),
+            mode=self.platform_manager.difficulty.upper(),
+            active_powerups=self.player.get_active_powerups(),
+            slow_motion="slow_motion" in self.player.active_powerups,
+            paused=self.clock.is_paused()
+        )
     
     def draw_controls(self):
-        """Draw control instructions"""
-        controls = [
-            "WASD/Arrows: Move & Jump",
-            "K: Shoot",
-            "TAB: Toggle Difficulty",  
-            "1-5: Change Speed",
-            "ESC: Quit"
-        ]
-        
-        y_start = SCREEN_HEIGHT - 120
-        for i, control in enumerate(controls):
-            text = self.small_font.render(control, True, WHITE)
-            self.screen.blit(text, (10, y_start + i * 20))
+        """Draw control instructions (returns the areas that were drawn)"""
+        return self.hud.draw_controls(self.screen)
+    
+    def get_keys_pressed(self):
+        """Get the keys held down this frame (simulations can override this)"""
+        return pygame.key.get_pressed()
     
     def update_playing(self, events):
-        """Update game when in playing state"""
-        # Get time step for smooth animation (affected by slow motion)
-        dt = self.clock.tick(FPS) / 10.0 * self.time_multiplier
-        
+        """Update game by one fixed time step when in playing state"""
+        # Game time moves forward once, and everything in this step sees that time
+        self.clock.advance(SIMULATION_STEP_MS)
+        self.step_events = events
+        
+        # Everything moves by one step (slow motion makes the step smaller)
+        self.step_scale = self.clock.get_scale()
+        self.step_dt = SIMULATION_STEP_MS / 10.0 * self.step_scale  # Player physics uses 10ms units
+        
+        # Run every phase of the step (see step_phases), timing each one if the
+        # profiler is on. Bots run millions of steps, so when it is off the
+        # phases are just called - even an empty 'with' block costs time.
+        if self.profiler.enabled:
+            measure = self.profiler.measure
+            for name, phase in self.step_phases:
+                with measure(name):
+                    phase()
+        else:
+            for name, phase in self.step_phases:
+                phase()
+    
+    def run_timers(self):
+        """Set off every timer that is due (spawns, difficulty, power-ups running out)"""
+        self.scheduler.run(self.clock.get_ticks())
+    
+    def read_input(self):
+        """Handle this step's events and read the held keys"""
         # Handle game events (keyboard input, etc.)
-        self.running = handle_game_events(self.platform_manager, events)
-        
-        # Handle slow motion timer
-        for event in events:
-            if event.type == pygame.USEREVENT + 1:
-                # End slow motion
-                self.slow_motion_active = False
-                self.time_multiplier = 1.0
-                pygame.time.set_timer(pygame.USEREVENT + 1, 0)  # Cancel timer
+        self.running = handle_game_events(self.platform_manager, self.step_events)
         
         # Get currently pressed keys
-        keys_pressed = pygame.key.get_pressed()
-        
-        # Update player
-        self.player.update(keys_pressed, dt)
-        
-        # Update platforms
-        self.platform_manager.update()
-        
-        # Update enemies
-        self.enemy_manager.update()
+        self.keys_pressed = self.get_keys_pressed()
         
-        # Update power-ups
-        self.powerup_manager.update(self.platform_manager)
-        
-        # Check all collisions
-        self.check_platform_collisions()
-        self.check_enemy_collisions()
-        self.check_bullet_enemy_collisions()
-        self.check_powerup_collisions()
-        self.check_player_fall()
+        # Save this step's input
+        if self.recorder is not None:
+            self.recorder.record_step(self.keys_pressed, self.step_events, self.clock.get_ticks())
+    
+    def update_player(self):
+        """Move the player and its bullets"""
+        self.player.update(self.keys_pressed, self.step_dt, self.step_scale)
+    
+    def update_platforms(self):
+        """Scroll the platforms and make new ones"""
+        self.platform_manager.update(self.step_scale)
+    
+    def update_enemies(self):
+        """Move and spawn enemies"""
+        self.enemy_manager.update(self.step_scale)
+    
+    def update_powerups(self):
+        """Move and spawn power-ups"""
+        self.powerup_manager.update(self.platform_manager, self.step_scale)
+    
+    def run_steps(self, events, frame_ms):
+        """
+        Run as many fixed time steps as fit in frame_ms.
+        Slow computers run several steps per drawn frame (skipping frames
+        instead of slowing the game down), fast ones may run none and just
+        draw again in between.
+        """
+        self.accumulator += frame_ms
+        self.pending_events.extend(events)
+        
+        # (The tiny extra stops rounding errors from delaying a step)
+        steps = 0
+        while self.accumulator + 1e-9 >= SIMULATION_STEP_MS and steps < MAX_STEPS_PER_FRAME:
+            # Events are handled by the first step that runs
+            step_events, self.pending_events = self.pending_events, []
+            self.update_playing(step_events)
+            self.accumulator -= SIMULATION_STEP_MS
+            steps += 1
+            if self.game_state != "playing":
+                break
+        
+        # Too far behind to catch up: drop the extra time so the game slows down
+        if self.accumulator >= SIMULATION_STEP_MS:
+            dropped = int(self.accumulator // SIMULATION_STEP_MS)
+            self.steps_dropped += dropped
+            self.accumulator -= dropped * SIMULATION_STEP_MS
+        
+        self.interpolation = max(0.0, self.accumulator / SIMULATION_STEP_MS)
+        return steps
+    
+    def handle_profiler_keys(self, events):
+        """F3 shows/hides the profiler numbers, F4 saves a Chrome trace"""
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+                elif event.key == pygame.K_F4 and self.profiler.enabled:
+                    path = self.profiler.export_trace("frame_trace.json")
+                    profiler_log.info("Profiler trace saved to %s", path)
+    
+    def toggle_pause(self):
+        """Pause or unpause the game (P key)"""
+        if self.clock.is_paused():
+            self.clock.resume()
+            state_log.info("Game resumed")
+        else:
+            self.clock.pause()
+            state_log.info("Game paused")
+    
+    def update_paused(self, events):
+        """While paused nothing moves, but the game can still be closed"""
+        for event in events:
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and
+                                             event.key == pygame.K_ESCAPE):
+                self.running = False
     
     def update_game_over(self, events):
         """Update game when in game over state"""
         choice = self.game_over_screen.handle_events(events)
         
         if choice == "restart":
-            print("Restarting game from game over screen...")
+            state_log.info("Restarting game from game over screen...")
             self.reset_game()
         elif choice == "quit":
-            print("Quitting game from game over screen...")
+            state_log.info("Quitting game from game over screen...")
             self.running = False
         
     def update(self):
         """Update game based on current state"""
         # Collect all events once to avoid conflicts
         events = pygame.event.get()
+        self.frame_count += 1
+        self.handle_profiler_keys(events)
+        
+        # Wait for the next frame and find out how much time passed
+        frame_ms = self.clock.tick(self.render_fps)
         
         if self.game_state == "playing":
-            self.update_playing(events)
+            if any(event.type == pygame.KEYDOWN and event.key == pygame.K_p for event in events):
+                self.toggle_pause()
+            if self.clock.is_paused():
+                self.update_paused(events)
+            else:
+                with self.profiler.measure("update"):
+                    self.run_steps(events, frame_ms)
         elif self.game_state == "game_over":
             self.update_game_over(events)
     
     def draw_playing(self):
         """Draw game when in playing state"""
-        # Clear screen with black
-        self.screen.fill(BLACK)
+        # With dirty rectangles, only last frame's sprites are wiped
+        use_dirty_rects = self.dirty_renderer is not None and self.game_state == "playing"
+        if use_dirty_rects:
+            self.dirty_renderer.begin()
+        else:
+            # Clear screen with black
+            self.screen.fill(BLACK)
+        
+        # Draw moving things part way between the last two steps
+        alpha = self.interpolation
+        measure = self.profiler.measure
+        
+        # Sprites are drawn in batches; the drawn areas are only needed for dirty rectangles
+        keep_rects = use_dirty_rects
         
         # Draw platforms
-        self.platform_manager.draw(self.screen)
+        with measure("draw.platforms"):
+            drawn = self.platform_manager.draw(self.screen, alpha, keep_rects)
         
         # Draw enemies
-        self.enemy_manager.draw(self.screen)
+        with measure("draw.enemies"):
+            drawn += self.enemy_manager.draw(self.screen, alpha, keep_rects)
         
         # Draw power-ups
-        self.powerup_manager.draw(self.screen)
+        with measure("draw.powerups"):
+            drawn += self.powerup_manager.draw(self.screen, alpha, keep_rects)
         
         # Draw player (includes bullets)
-        self.player.draw(self.screen)
+        with measure("draw.player"):
+            drawn += self.player.draw(self.screen, alpha, keep_rects)
+        
+        # Draw game information and controls
+        with measure("draw.hud"):
+            drawn += self.draw_game_info()
+            drawn += self.draw_controls()
         
-        # Draw game information
-        self.draw_game_info()
+        # Draw profiler numbers (when F3 turned them on)
+        drawn += self.profiler.draw_overlay(self.screen)
         
-        # Draw controls
-        self.draw_controls()
+        if use_dirty_rects:
+            self.dirty_renderer.add(drawn)
     
     def draw_game_over(self):
-        """Draw game over screen"""
-        # Draw final game state first
-        self.draw_playing()
-        
-        # Create final stats
-        final_stats = [
-            f"Final Time: {self.platform_manager.get_time_elapsed():.1f} seconds",
-            f"Distance Traveled: {self.player.get_distance_traveled():.0f}",
-            f"Final Speed: {self.platform_manager.get_current_speed():.1f}x"
-        ]
-        
-        # Draw game over screen on top
-        self.game_over_screen.draw(self.screen, final_stats)
+        """
+        Draw game over screen.
+        Returns the areas of the screen that changed.
+        """
+        if not self.game_over_screen.is_frozen():
+            # Draw final game state once and freeze it behind the game over text
+            self.draw_playing()
+            
+            # Create final stats
+            final_stats = [
+                f"Final Time: {self.platform_manager.get_time_elapsed():.1f} seconds",
+                f"Distance Traveled: {self.player.get_distance_traveled():.0f}",
+                f"Final Speed: {self.platform_manager.get_current_speed():.1f}x"
+            ]
+            self.game_over_screen.freeze(self.screen, final_stats)
+        
+        # Draw game over screen on top (only the buttons change after this)
+        return self.game_over_screen.draw(self.screen)
     
     def draw(self):
         """Draw everything based on current state"""
         if self.game_state == "playing":
-            self.draw_playing()
+            with self.profiler.measure("draw"):
+                self.draw_playing()
+            
+            # Update display (just the changed parts when using dirty rectangles)
+            with self.profiler.measure("flip"):
+                if self.dirty_renderer is not None:
+                    self.dirty_renderer.present()
+                else:
+                    pygame.display.flip()
         elif self.game_state == "game_over":
-            self.draw_game_over()
-        
-        # Update display
-        pygame.display.flip()
+            changed = self.draw_game_over()
+            
+            # Update only what changed on the game over screen
+            if changed:
+                pygame.display.update(changed)
+            if self.dirty_renderer is not None:
+                self.dirty_renderer.invalidate()
     
     def run(self):
         """Main game loop"""
@@ -373,6 +721,7 @@ class Game:
         print("- K: Shoot bullets")
         print("- TAB: Toggle difficulty")
         print("- 1-5: Change platform speed")
+        print("- P: Pause")
         print("- ESC: Quit")
         print("\nFeatures:")
         print("- Enemies that fly across screen")
@@ -380,18 +729,170 @@ class Game:
         print("- Lives system")
         print("- Progressive difficulty")
         
+        starting = True
         while self.running:
             self.update()
             self.draw()
+            if starting:
+                starting = not self.continue_startup()
+                if not starting and self.startup_timer is not None:
+                    print("\n".join(self.startup_timer.get_report()))
+        
+        # Save the profiler trace if one was asked for
+        if self.trace_path:
+            print(f"Profiler trace saved to {self.profiler.export_trace(self.trace_path)}")
         
         # Clean up
+        self.close()
         pygame.quit()
         sys.exit()
 
+    def simulate(self, frames, render=False):
+        """
+        Run the game without waiting between frames.
+        Stops early if the player dies. Returns the end-of-run stats.
+        """
+        for _ in range(frames):
+            if self.game_state != "playing" or not self.running:
+                break
+            self.update()
+            if render:
+                self.draw()
+        return self.get_stats()
+    
+    def get_stats(self):
+        """Get a summary of the current run (used by simulations)"""
+        return {
+            "seed": self.seed,
+            "frames": self.frame_count,
+            "time_elapsed": round(self.platform_manager.get_time_elapsed(), 3),
+            "distance": round(self.player.get_distance_traveled(), 1),
+            "lives": self.player.get_lives(),
+            "speed": round(self.platform_manager.get_current_speed(), 3),
+            "difficulty_level": round(self.platform_manager.get_difficulty_level(), 3),
+            "enemies": self.enemy_manager.get_enemy_count(),
+            "powerups": self.powerup_manager.get_powerup_count(),
+            "enemies_shot": self.total_hits["bullet_enemy"],
+            "enemy_hits_taken": self.total_hits["player_enemy"],
+            "game_state": self.game_state,
+            "game_over_reason": self.game_over_reason,
+            "steps_dropped": self.steps_dropped,
+            "profile": self.profiler.get_stats(),
+            "asset_cache": asset_cache.get_stats(),
+            "pools": self.get_pool_stats(),
+        }
+    
+    def get_pool_stats(self):
+        """Get size and high-water numbers for every sprite pool"""
+        return {
+            "bullets": self.player.bullet_pool.get_stats(),
+            "enemies": self.enemy_manager.enemy_pool.get_stats(),
+            "powerups": self.powerup_manager.powerup_pool.get_stats(),
+            "platforms": self.platform_manager.platform_pool.get_stats(),
+        }
+
+def simulate_main(frames, seed, render=False, dirty_rendering=False, trace_path=None,
+                  record_path=None):
+    """Run a headless simulation and print its stats as JSON"""
+    # Game messages go to stderr so stdout only holds the JSON result
+    with redirect_stdout(sys.stderr):
+        game = Game(headless=True, seed=seed, dirty_rendering=dirty_rendering,
+                    profile=trace_path is not None, record_path=record_path)
+        stats = game.simulate(frames, render=render)
+        if trace_path:
+            game.profiler.export_trace(trace_path)
+        game.close()
+        pygame.quit()
+    print(json.dumps(stats))
+    return stats
+
+def replay_main(path, seek=0, watch=False, trace_path=None):
+    """
+    Play a recording back as fast as possible and print the stats as JSON.
+    With watch, jump to step seek and then show the rest in a window at normal speed.
+    """
+    with redirect_stdout(sys.stderr):
+        player = ReplayPlayer(Replay(path), profile=trace_path is not None, headless=not watch)
+        player.seek(seek)
+        if watch:
+            frame_clock = pygame.time.Clock()
+            while not player.is_finished():
+                if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                    break
+                player.step()
+                player.game.draw()
+                frame_clock.tick(FPS)
+        else:
+            player.play()
+        stats = player.game.get_stats()
+        stats["replay_steps"] = player.position
+        if trace_path:
+            player.game.profiler.export_trace(trace_path)
+        player.game.close()
+        pygame.quit()
+    print(json.dumps(stats))
+    return stats
+
 # This is what runs when students start the game
 def main():
     """Start the game!"""
-    game = Game()
+    parser = argparse.ArgumentParser(description="Platformer game")
+    parser.add_argument("--simulate", action="store_true",
+                        help="run headless at full speed and print stats as JSON")
+    parser.add_argument("--frames", type=int, default=3600,
+                        help="number of frames to simulate (default: 3600)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="random seed for the simulation (default: 0)")
+    parser.add_argument("--render", action="store_true",
+                        help="also draw every simulated frame")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only repaint the parts of the screen that changed")
+    parser.add_argument("--profile", action="store_true",
+                        help="measure every frame phase from the start (F3 shows the numbers)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="save a Chrome trace of every frame phase to FILE on exit")
+    parser.add_argument("--record", metavar="FILE",
+                        help="save every run's input to FILE so it can be played back")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="play a recording back headless at full speed and print stats as JSON")
+    parser.add_argument("--seek", type=int, default=0,
+                        help="with --replay --watch: step to start showing from (default: 0)")
+    parser.add_argument("--watch", action="store_true",
+                        help="with --replay: show the recording in a window at normal speed")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print how long each part of starting the game took")
+    parser.add_argument("--no-fast-start", action="store_true",
+                        help="load every picture before showing the first frame")
+    parser.add_argument("--log-level", default=LOG_LEVEL,
+                        help=f"lowest level of game message to show (default: {LOG_LEVEL}, OFF hides all)")
+    parser.add_argument("--log", action="append", default=[], metavar="CATEGORY=LEVEL",
+                        help="level for one kind of message, e.g. collisions=WARNING "
+                             f"(kinds: {', '.join(game_log.CATEGORIES)})")
+    args = parser.parse_args()
+    
+    # Which game messages to show
+    category_levels = dict(LOG_CATEGORY_LEVELS)
+    for setting in args.log:
+        category, _, level = setting.partition("=")
+        category_levels[category] = level
+    game_log.configure(args.log_level, category_levels)
+    
+    if args.replay:
+        replay_main(args.replay, seek=args.seek, watch=args.watch, trace_path=args.trace)
+        return
+    
+    if args.simulate:
+        simulate_main(args.frames, args.seed, render=args.render,
+                      dirty_rendering=args.dirty_rects, trace_path=args.trace,
+                      record_path=args.record)
+        return
+    
+    game = Game(dirty_rendering=args.dirty_rects,
+                profile=args.profile or args.trace is not None,
+                record_path=args.record,
+                fast_start=not args.no_fast_start,
+                startup_timer=startup_timer if args.startup_report else None)
+    game.trace_path = args.trace
     game.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+"""
+One place where every game timer waits for its time to come.
+
+Instead of every part of the game checking the clock each step ("is it
+time to spawn an enemy yet?"), each part tells the timer wheel *when* it
+wants to be called, and the wheel calls it then. Steps where nothing is due
+cost almost nothing.
+
+    wheel = TimerWheel(clock.get_ticks())
+    timer = wheel.schedule(clock.get_ticks() + 3000, spawn_enemy)  # In 3 seconds
+    timer = wheel.reschedule(timer, clock.get_ticks() + 1000)      # Sooner!
+    ...
+    wheel.run(clock.get_ticks())  # Once per step: calls whatever is due
+
+Times are game milliseconds (GameTimebase.get_ticks()).
+"""
+import math
+from settings import *
+
+
+class Timer:
+    """A callback waiting in a TimerWheel (cancel it with cancel())"""
+
+    def __init__(self, time, order, callback, args):
+        self.time = time          # Game millisecond it is due at
+        self.order = order        # Timers due at the same time run in the order they were made
+        self.callback = callback
+        self.args = args
+        self.wheel = None         # The wheel it is waiting in (None once it ran or was cancelled)
+
+    def cancel(self):
+        """Stop the timer from running"""
+        if self.wheel is not None:
+            self.wheel.pending -= 1
+            self.wheel = None
+
+    def is_waiting(self):
+        """Check if the timer still has to run"""
+        return self.wheel is not None
+
+
+class TimerWheel:
+    """
+    A hierarchical timer wheel.
+
+    Level 0 has one slot per millisecond for the next TIMER_WHEEL_SLOTS
+    milliseconds. Every level above it has slots that are TIMER_WHEEL_SLOTS
+    times longer, so a few small levels cover hours. Whenever the lower
+    level goes all the way round, the next slot of the level above is
+    emptied into the levels below. Adding and cancelling a timer never
+    searches or sorts anything.
+
+    Cancelled timers are just marked and skipped when their slot comes up.
+    """
+
+    def __init__(self, start_time=0, slots=TIMER_WHEEL_SLOTS, levels=TIMER_WHEEL_LEVELS):
+        """
+        Create an empty wheel
+
+        - start_time: The game time now (in milliseconds)
+        - slots: Slots in each level (must be a power of 2)
+        - levels: How many levels (the wheel holds timers up to slots ** levels ms ahead)
+        """
+        self.now = int(start_time)  # Every timer up to this time has run
+        self.bits = slots.bit_length() - 1
+        self.mask = slots - 1
+        self.levels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.due = []     # Timers made for a time that has already come (run next)
+        self.pending = 0  # Timers still waiting
+        self.soon = 0     # Timers in level 0 (if none, run() can skip to the next refill)
+        self.made = 0     # Timers made so far (for their order)
+
+    def schedule(self, time, callback, *args):
+        """Call callback(*args) at game time time (or on the next run if that has passed)"""
+        timer = Timer(math.ceil(time), self.made, callback, args)
+        self.made += 1
+        timer.wheel = self
+        self.pending += 1
+        if timer.time <= self.now:
+            self.due.append(timer)
+        else:
+            self._place(timer)
+        return timer
+
+    def reschedule(self, timer, time):
+        """Move a timer to a new time (returns the timer to keep from now on)"""
+        timer.cancel()
+        return self.schedule(time, timer.callback, *timer.args)
+
+    def _place(self, timer):
+        """Put a timer in the slot for its time"""
+        delta = timer.time - self.now
+        bits = self.bits
+        top = len(self.levels) - 1
+        for level in range(top + 1):
+            if delta < 1 << (bits * (level + 1)):
+                break
+        else:
+            # Further ahead than the wheel reaches: park it in the last slot the
+            # top level gets to, and it is placed again when that slot comes up
+            self.levels[top][((self.now >> (bits * top)) - 1) & self.mask].append(timer)
+            return
+        if level == 0:
+            self.soon += 1
+        self.levels[level][(timer.time >> (bits * level)) & self.mask].append(timer)
+
+    def _cascade(self, level):
+        """Move the timers in a level's current slot down into the levels below"""
+        slot = self.levels[level][(self.now >> (self.bits * level)) & self.mask]
+        timers = slot[:]
+        slot.clear()
+        for timer in timers:
+            if timer.wheel is self:
+                self._place(timer)
+
+    def _fire(self, timers):
+        """Run timers (soonest first) that haven't been cancelled"""
+        timers.sort(key=lambda timer: (timer.time, timer.order))
+        for timer in timers:
+            if timer.wheel is self:
+                timer.wheel = None
+                self.pending -= 1
+                timer.callback(*timer.args)
+
+    def run(self, now):
+        """Call every timer due by game time now"""
+        now = int(now)
+        if self.due:
+            due = self.due
+            self.due = []
+            self._fire(due)
+
+        if self.pending == 0:
+            self.now = max(self.now, now)  # Nothing is waiting, so skip straight there
+            return
+
+        mask = self.mask
+        bits = self.bits
+        first_slots = self.levels[0]
+        while self.now < now:
+            if self.soon == 0:
+                # Level 0 is empty, so nothing can happen before it is refilled
+                self.now = min(now, self.now | mask)
+                if self.now == now:
+                    break
+            self.now += 1
+            time = self.now
+
+            # Every time a level goes all the way round, refill it from the level above
+            level = 0
+            while level + 1 < len(self.levels) and (time >> (bits * level)) & mask == 0:
+                level += 1
+            for upper in range(level, 0, -1):
+                self._cascade(upper)
+
+            slot = first_slots[time & mask]
+            if slot:
+                timers = slot[:]
+                slot.clear()
+                self.soon -= len(timers)
+                self._fire(timers)
+
+        # Timers made by callbacks for a time that has already come
+        while self.due:
+            due = self.due
+            self.due = []
+            self._fire(due)
+
+    def clear(self):
+        """Cancel every timer"""
+        for level in self.levels:
+            for slot in level:
+                for timer in slot:
+                    timer.wheel = None
+                slot.clear()
+        for timer in self.due:
+            timer.wheel = None
+        self.due.clear()
+        self.pending = 0
+        self.soon = 0
+
+
+def first_due_time(is_due, estimate):
+    """
+    Find the first whole game millisecond at which is_due(time) is True.
+    is_due must stay True once it becomes True; estimate is a close guess
+    (timers use this so they fire on exactly the step a per-step check would).
+    """
+    time = math.floor(estimate)
+    while is_due(time - 1):
+        time -= 1
+    while not is_due(time):
+        time += 1
+    return time
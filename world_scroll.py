@@ -0,0 +1,40 @@
+class WorldScroll:
+    """
+    How far the world has scrolled, and how fast it is scrolling.
+
+    Things that sit still in the world (platforms, power-ups) remember where
+    they are in the world instead of on the screen. Their screen position is
+    just world position minus the scroll offset, so they never have to be
+    moved one by one, and changing the speed is a single number.
+    """
+
+    def __init__(self, speed=3):
+        """
+        Create a world scroll
+
+        - speed: How many pixels the world scrolls left each frame
+        """
+        self.speed = speed
+        self.offset = 0.0       # How far the world has scrolled so far
+        self.prev_offset = 0.0  # The offset at the last update (for smooth drawing)
+
+    def advance(self, step=1):
+        """Scroll the world (step = how many frames' worth)"""
+        self.prev_offset = self.offset
+        self.offset += self.speed * step
+
+    def set_speed(self, speed):
+        """Change how fast the world scrolls"""
+        self.speed = speed
+
+    def get_speed(self):
+        """Get how fast the world scrolls"""
+        return self.speed
+
+    def to_screen(self, world_x):
+        """Turn a world x position into a screen x position"""
+        return world_x - self.offset
+
+    def to_world(self, screen_x):
+        """Turn a screen x position into a world x position"""
+        return screen_x + self.offset